@@ -1,30 +1,200 @@
-from fastapi import APIRouter, Request
-from backend.services.google_calendar_service import create_event, check_availability
-from backend.services.agent_service import create_agent, AgentState
-from typing import cast
+import json
+import uuid
+from datetime import datetime
+from fastapi import APIRouter, Depends, Header, HTTPException, Request
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+from backend.services.google_calendar_service import create_event, create_events_batch, check_availability
+from backend.services.availability_service import check_availability_batch
+from backend.services.slot_service import find_free_slots, is_valid_hhmm
+from backend.utils.time_utils import DEFAULT_TIMEZONE, is_valid_timezone
+from backend.config import WORKDAY_START, WORKDAY_END
+from backend.services.agent_registry import get_agent
+from backend.services.intent_router import classify
+from backend.services.parsing_service import parsing_service
+from backend.services.tenants import DEFAULT_TENANT, UnknownCalendar, UnknownTenant, current_tenant, resolve_tenant, use_tenant
+from backend.utils.concurrency import chat_limiter, QueueTimeout
+from typing import TYPE_CHECKING, cast
 
-router = APIRouter()
+if TYPE_CHECKING:
+    from backend.services.agent_service import AgentState
+
+def set_tenant(tenant_id: str | None = None, calendar_id: str | None = None):
+    """Make the named tenant (and calendar) current for the rest of the request."""
+    try:
+        use_tenant(resolve_tenant(tenant_id, calendar_id))
+    except UnknownTenant:
+        raise HTTPException(status_code=404, detail=f"Unknown tenant: {tenant_id}")
+    except UnknownCalendar:
+        raise HTTPException(status_code=404, detail=f"Unknown calendar: {calendar_id}")
+
+async def tenant_scope(tenant_id: str | None = None, calendar_id: str | None = None,
+                       x_tenant_id: str | None = Header(None), x_calendar_id: str | None = Header(None)):
+    # Async, so it runs in the request's own context and the endpoint (and
+    # the threads it hands work to) see the tenant it sets.
+    set_tenant(x_tenant_id or tenant_id, x_calendar_id or calendar_id)
+
+router = APIRouter(dependencies=[Depends(tenant_scope)])
 
 @router.post("/book")
 def book_event(start_time: str, end_time: str, summary: str):
     event = create_event(start_time, end_time, summary)
     return {"event_id": event.get("id"), "status": "success"}
 
+class BatchEvent(BaseModel):
+    start_time: str
+    end_time: str
+    summary: str
+    timeZone: str = "UTC"
+    location: str | None = None
+    conference: bool = False
+
+class BatchBookingRequest(BaseModel):
+    events: list[BatchEvent]
+
+@router.post("/book/batch")
+def book_events_batch(body: BatchBookingRequest):
+    """Book many events in batched Calendar calls; one result per event, in request order.
+
+    Resubmitting the same events is safe: already-booked ones come back as "exists".
+    """
+    results = create_events_batch([event.model_dump() for event in body.events])
+    created = sum(result["status"] == "created" for result in results)
+    failed = sum(result["status"] == "error" for result in results)
+    return {"results": results, "created": created, "failed": failed}
+
 @router.get("/availability")
 def get_availability(start_time: str, end_time: str):
     busy_times = check_availability(start_time, end_time)
     return {"busy": busy_times}
 
-@router.post("/chat")
-async def chat(request: Request):
-    data = await request.json()
-    user_message = data.get("message")
-    agent = create_agent()
-    response = agent.invoke(cast(AgentState, {
+class AvailabilityWindow(BaseModel):
+    start_time: str
+    end_time: str
+
+class BatchAvailabilityRequest(BaseModel):
+    windows: list[AvailabilityWindow]
+    calendar_ids: list[str] | None = None
+
+@router.post("/availability/batch")
+def get_availability_batch(body: BatchAvailabilityRequest):
+    """Busy/free matrix: one row per window, one column per calendar (1 busy, 0 free, -1 unknown).
+
+    `calendar_ids` must be calendars the tenant is configured with.
+    """
+    windows = [window.model_dump() for window in body.windows]
+    try:
+        return check_availability_batch(windows, body.calendar_ids)
+    except UnknownCalendar as error:
+        raise HTTPException(status_code=404, detail=f"Unknown calendar: {error}")
+
+@router.get("/availability/slots")
+def get_free_slots(start_time: str | None = None, end_time: str | None = None, duration_minutes: int = 30,
+                   count: int = 5, timezone: str = DEFAULT_TIMEZONE, work_start: str = WORKDAY_START,
+                   work_end: str = WORKDAY_END, buffer_minutes: int = 0, include_weekends: bool = False):
+    if not is_valid_timezone(timezone):
+        raise HTTPException(status_code=400, detail=f"Unknown timezone: {timezone}")
+    for name, value in (("work_start", work_start), ("work_end", work_end)):
+        if not is_valid_hhmm(value):
+            raise HTTPException(status_code=400, detail=f"{name} must be HH:MM, got {value!r}")
+    for name, value in (("start_time", start_time), ("end_time", end_time)):
+        try:
+            if value:
+                datetime.fromisoformat(value)
+        except ValueError:
+            raise HTTPException(status_code=400, detail=f"{name} must be an ISO 8601 datetime, got {value!r}")
+    slots = find_free_slots(start_time, end_time, duration_minutes=duration_minutes, count=count, timezone=timezone,
+                            work_start=work_start, work_end=work_end, buffer_minutes=buffer_minutes,
+                            include_weekends=include_weekends)
+    return {"slots": slots}
+
+class ParseBatchRequest(BaseModel):
+    messages: list[str]
+
+@router.post("/parse/batch")
+async def parse_batch(body: ParseBatchRequest):
+    """Intent and tool arguments the pre-router extracts from each message, in request order; nothing is booked."""
+    results = await parsing_service.amap(classify, [(message, None) for message in body.messages])
+    return {"results": [{"intent": intent, "decision": decision} for intent, decision in results]}
+
+def initial_state(user_message: str, locale: str | None = None) -> "AgentState":
+    # history and pending_event are left out so the session's values carry over.
+    return cast("AgentState", {
         "input": user_message,
         "output": "",
         "tool_name": None,
         "tool_args": None,
-        "tool_result": None
-    }))
-    return {"response": response["output"]}
+        "tool_result": None,
+        "tool_outcome": None,
+        "locale": locale
+    })
+
+def session_config(data: dict):
+    """The request's session ID (a new one if absent) and the graph config for it.
+
+    A tenant or calendar in the body overrides the headers. Sessions are kept
+    per tenant, so one tenant can't resume another's conversation by ID.
+    """
+    if data.get("tenant_id") or data.get("calendar_id"):
+        set_tenant(data.get("tenant_id"), data.get("calendar_id"))
+    session_id = data.get("session_id") or uuid.uuid4().hex
+    tenant = current_tenant()
+    thread_id = session_id if tenant.id == DEFAULT_TENANT.id else f"{tenant.id}/{session_id}"
+    return session_id, {"configurable": {"thread_id": thread_id}}
+
+@router.post("/chat")
+async def chat(request: Request):
+    """One turn of a conversation: {"message", "session_id", "locale", "tenant_id", "calendar_id"}.
+
+    Omit session_id to start a new one.
+    """
+    data = await request.json()
+    user_message = data.get("message")
+    session_id, config = session_config(data)
+    agent = get_agent()
+    try:
+        async with chat_limiter:
+            response = await agent.ainvoke(initial_state(user_message, data.get("locale")), config)
+    except QueueTimeout:
+        raise HTTPException(status_code=503, detail="Server busy, please retry.", headers={"Retry-After": "5"})
+    return {"response": response["output"], "session_id": session_id}
+
+def sse_event(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+@router.post("/chat/stream")
+async def chat_stream(request: Request):
+    """Server-sent events for one turn.
+
+    `token` events carry LLM text as it is generated (a new `step` starts a
+    new LLM pass), `reset` means the current pass is retried and its text so
+    far should be discarded, `progress` events report tool activity, and the final
+    `done` event carries the complete reply and session ID, identical to what
+    /chat returns.
+    """
+    data = await request.json()
+    user_message = data.get("message")
+    session_id, config = session_config(data)
+    agent = get_agent()
+
+    async def events():
+        try:
+            async with chat_limiter:
+                final_state = None
+                async for mode, chunk in agent.astream(initial_state(user_message, data.get("locale")), config, stream_mode=["messages", "custom", "values"]):
+                    if mode == "messages":
+                        message, metadata = chunk
+                        if metadata.get("langgraph_node") == "llm" and isinstance(message.content, str) and message.content:
+                            yield sse_event("token", {"text": message.content, "step": metadata.get("langgraph_step")})
+                    elif mode == "custom":
+                        yield sse_event(chunk.get("event", "progress"), chunk)
+                    else:
+                        final_state = chunk
+                yield sse_event("done", {"response": final_state["output"] if final_state else "", "session_id": session_id})
+        except QueueTimeout:
+            yield sse_event("error", {"message": "Server busy, please retry."})
+        except Exception as e:
+            yield sse_event("error", {"message": f"Error: {e}"})
+
+    return StreamingResponse(events(), media_type="text/event-stream",
+                             headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
@@ -9,4 +9,115 @@ if not OPENROUTER_API_KEY:
     raise ValueError("OPENROUTER_API_KEY not set in .env or environment.")
 
 GOOGLE_CALENDAR_ID = os.getenv("GOOGLE_CALENDAR_ID")
-GOOGLE_CREDENTIALS_FILE = os.getenv("GOOGLE_CREDENTIALS_FILE")
\ No newline at end of file
+GOOGLE_CREDENTIALS_FILE = os.getenv("GOOGLE_CREDENTIALS_FILE")
+
+# Tenants: a JSON file of {tenant ID: {"calendar_id", "credentials_file",
+# "subject"}} that requests select with X-Tenant-ID; without one, the
+# calendar above is the default. Credentials are cached per service account
+# and subject, up to a number of entries and about that many bytes, and
+# tokens are refreshed in the background this many seconds before expiry
+TENANTS_FILE = os.getenv("TENANTS_FILE")
+TENANT_CACHE_SIZE = int(os.getenv("TENANT_CACHE_SIZE", "5000"))
+TENANT_CACHE_MAX_BYTES = int(os.getenv("TENANT_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+TOKEN_REFRESH_AHEAD = float(os.getenv("TOKEN_REFRESH_AHEAD", "600"))
+
+# Concurrency limits for the async /chat pipeline
+CHAT_MAX_CONCURRENCY = int(os.getenv("CHAT_MAX_CONCURRENCY", "16"))
+CHAT_QUEUE_TIMEOUT = float(os.getenv("CHAT_QUEUE_TIMEOUT", "30"))
+CALENDAR_MAX_WORKERS = int(os.getenv("CALENDAR_MAX_WORKERS", "8"))
+
+# Date parsing: LRU size for the dateparser fallback and the width of the
+# relative-base buckets its cache is keyed on
+DATEPARSER_CACHE_SIZE = int(os.getenv("DATEPARSER_CACHE_SIZE", "2048"))
+DATEPARSER_BASE_BUCKET_SECONDS = int(os.getenv("DATEPARSER_BASE_BUCKET_SECONDS", "60"))
+
+# Free-slot search defaults (local working hours in the requested timezone)
+WORKDAY_START = os.getenv("WORKDAY_START", "09:00")
+WORKDAY_END = os.getenv("WORKDAY_END", "18:00")
+SLOT_SEARCH_DAYS = int(os.getenv("SLOT_SEARCH_DAYS", "7"))
+
+# freebusy limits: calendars per query and the longest timeMin..timeMax span
+# batched availability checks will pack into a single query
+FREEBUSY_MAX_CALENDARS = int(os.getenv("FREEBUSY_MAX_CALENDARS", "50"))
+FREEBUSY_MAX_SPAN_DAYS = int(os.getenv("FREEBUSY_MAX_SPAN_DAYS", "60"))
+
+# Calendar API root override (e.g. http://127.0.0.1:8085/) for local stubs;
+# without GOOGLE_CREDENTIALS_FILE the client then sends unauthenticated requests
+GOOGLE_API_ROOT_URL = os.getenv("GOOGLE_API_ROOT_URL")
+if GOOGLE_API_ROOT_URL and not GOOGLE_API_ROOT_URL.endswith("/"):
+    GOOGLE_API_ROOT_URL += "/"
+# Inserts per Calendar batch HTTP request, and how often retryable failures
+# (429/5xx) inside a batch are re-sent
+CALENDAR_BATCH_SIZE = int(os.getenv("CALENDAR_BATCH_SIZE", "50"))
+CALENDAR_BATCH_RETRIES = int(os.getenv("CALENDAR_BATCH_RETRIES", "2"))
+
+# LLM response cache: entries kept in memory, their lifetime in seconds, and
+# an optional SQLite file that keeps them across restarts (size 0 disables)
+LLM_CACHE_SIZE = int(os.getenv("LLM_CACHE_SIZE", "1024"))
+LLM_CACHE_TTL = float(os.getenv("LLM_CACHE_TTL", "3600"))
+LLM_CACHE_PATH = os.getenv("LLM_CACHE_PATH")
+
+# Chat sessions: sessions kept in memory, idle lifetime in seconds, messages of
+# history kept per session, and an optional SQLite file shared by workers
+SESSION_MAX_SESSIONS = int(os.getenv("SESSION_MAX_SESSIONS", "10000"))
+SESSION_TTL = float(os.getenv("SESSION_TTL", "86400"))
+SESSION_MAX_MESSAGES = int(os.getenv("SESSION_MAX_MESSAGES", "20"))
+SESSION_DB_PATH = os.getenv("SESSION_DB_PATH")
+
+# Prompt assembly: token budget per LLM call, and how much of it a summary of
+# older turns that no longer fit may take
+PROMPT_TOKEN_BUDGET = int(os.getenv("PROMPT_TOKEN_BUDGET", "3000"))
+PROMPT_SUMMARY_TOKENS = int(os.getenv("PROMPT_SUMMARY_TOKENS", "300"))
+
+# Tool replies: template language when the request doesn't name one, and
+# whether to send tool results back through the LLM instead of the templates
+RESPONSE_LOCALE = os.getenv("RESPONSE_LOCALE", "en")
+RESPONSE_LLM_PARAPHRASE = os.getenv("RESPONSE_LLM_PARAPHRASE", "false").lower() in ("1", "true", "yes")
+
+# Speculative freebusy: while the LLM answers a message that names a time,
+# prefetch the days it mentions so a resulting availability check needn't
+# wait for Calendar (costs a freebusy call when the reply doesn't check)
+SPECULATIVE_PREFETCH = os.getenv("SPECULATIVE_PREFETCH", "false").lower() in ("1", "true", "yes")
+
+# Logging: level for the backend's loggers, and "json" (one object per line)
+# or "text" output
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+LOG_FORMAT = os.getenv("LOG_FORMAT", "json").lower()
+
+# Local calendar mirror: answer availability for GOOGLE_CALENDAR_ID from a
+# SQLite copy kept current with incremental sync. The mirror covers events
+# ending after now minus the lookback, reads older than the staleness bound
+# (seconds) trigger a sync first, and the poller syncs every interval
+CALENDAR_MIRROR_ENABLED = os.getenv("CALENDAR_MIRROR_ENABLED", "false").lower() in ("1", "true", "yes")
+CALENDAR_MIRROR_PATH = os.getenv("CALENDAR_MIRROR_PATH", ":memory:")
+CALENDAR_MIRROR_MAX_STALENESS = float(os.getenv("CALENDAR_MIRROR_MAX_STALENESS", "60"))
+CALENDAR_MIRROR_POLL_INTERVAL = float(os.getenv("CALENDAR_MIRROR_POLL_INTERVAL", "30"))
+CALENDAR_MIRROR_LOOKBACK_DAYS = int(os.getenv("CALENDAR_MIRROR_LOOKBACK_DAYS", "1"))
+
+# Outbound calls: requests per second and burst for OpenRouter, for the
+# Calendar API as a whole and for each calendar; retries of 429/5xx with
+# jittered exponential backoff (base and cap in seconds), and the longest
+# Retry-After we are willing to wait
+OPENROUTER_RATE = float(os.getenv("OPENROUTER_RATE", "5"))
+OPENROUTER_BURST = int(os.getenv("OPENROUTER_BURST", "10"))
+CALENDAR_RATE = float(os.getenv("CALENDAR_RATE", "10"))
+CALENDAR_BURST = int(os.getenv("CALENDAR_BURST", "20"))
+CALENDAR_PER_CALENDAR_RATE = float(os.getenv("CALENDAR_PER_CALENDAR_RATE", "5"))
+CALENDAR_PER_CALENDAR_BURST = int(os.getenv("CALENDAR_PER_CALENDAR_BURST", "10"))
+OUTBOUND_MAX_RETRIES = int(os.getenv("OUTBOUND_MAX_RETRIES", "4"))
+OUTBOUND_BACKOFF_BASE = float(os.getenv("OUTBOUND_BACKOFF_BASE", "0.5"))
+OUTBOUND_BACKOFF_MAX = float(os.getenv("OUTBOUND_BACKOFF_MAX", "20"))
+OUTBOUND_MAX_RETRY_AFTER = float(os.getenv("OUTBOUND_MAX_RETRY_AFTER", "30"))
+
+# Intent and reply parsing (regexes, timezones, dates): "thread" runs it on a
+# pool of warmed threads off the event loop, "process" on warmed worker
+# processes that run in parallel across cores, "inline" in the request
+# itself; workers per pool (0 = one per CPU)
+PARSER_POOL = os.getenv("PARSER_POOL", "thread").lower()
+PARSER_WORKERS = int(os.getenv("PARSER_WORKERS", "0")) or os.cpu_count() or 1
+
+# Start-up warm-up (imports, agent, dateparser, pytz, Calendar client):
+# "background" runs it after the server starts accepting requests and /readyz
+# reports progress, "blocking" finishes it before serving, "off" leaves it to
+# the first requests
+STARTUP_WARMUP = os.getenv("STARTUP_WARMUP", "background").lower()
@@ -1,10 +1,45 @@
+import asyncio
 import os
 os.environ.pop("SSL_CERT_FILE", None)
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
+from fastapi.responses import JSONResponse, PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
 from backend.api import calendar_routes
+from backend.config import CALENDAR_MIRROR_ENABLED, STARTUP_WARMUP
+from backend.utils.datetime_parser import parser_stats
+from backend.utils.llm_cache import llm_cache
+from backend.services.calendar_clients import calendar_clients
+from backend.services.intent_router import intent_stats
+from backend.services.parsing_service import parsing_service
+from backend.services.speculation import speculation_stats
+from backend.services.warmup import Warmup
+from backend.utils.concurrency import chat_limiter
+from backend.utils.metrics import metrics
+from backend.utils.outbound import outbound_stats
+from backend.utils.tracing import TraceMiddleware, configure_logging
 
-app = FastAPI()
+configure_logging()
+warmup = Warmup()
+calendar_mirror = None
+
+@asynccontextmanager
+async def lifespan(app):
+    global calendar_mirror
+    if CALENDAR_MIRROR_ENABLED:
+        from backend.services.calendar_mirror import start_mirror
+        calendar_mirror = start_mirror()
+    if STARTUP_WARMUP == "blocking":
+        await asyncio.to_thread(warmup.start, STARTUP_WARMUP)
+    else:
+        warmup.start(STARTUP_WARMUP)
+    yield
+    parsing_service.shutdown()
+    if calendar_mirror is not None:
+        calendar_mirror.stop()
+
+app = FastAPI(lifespan=lifespan)
+app.add_middleware(TraceMiddleware)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
@@ -18,4 +53,62 @@ def root():
 @app.get("/healthz")
 def healthz():
     return {"status": "ok"}
+@app.get("/readyz")
+def readyz():
+    # 503 until the start-up warm-up has finished (failed steps are listed but don't block).
+    status = warmup.status()
+    return JSONResponse(status, status_code=200 if status["ready"] else 503)
+@app.get("/stats")
+def stats():
+    from backend.services.prompt_builder import prompt_stats
+    from backend.services.session_store import session_store
+    return {"llm_cache": llm_cache.stats(), "dateparser": parser_stats(), "sessions": session_store.stats(),
+            "prompts": prompt_stats(), "intents": intent_stats(),
+            "calendar_mirror": calendar_mirror.stats() if calendar_mirror else None, "outbound": outbound_stats(),
+            "parser_pool": parsing_service.stats(), "calendar_clients": calendar_clients.stats(),
+            "speculation": speculation_stats(), "warmup": warmup.status()}
+
+def stats_metrics():
+    # The components keep their own counters; expose them on every scrape.
+    from backend.services.session_store import session_store
+    cache, parser, sessions, intents = llm_cache.stats(), parser_stats(), session_store.stats(), intent_stats()
+    outbound, clients, speculations = outbound_stats(), calendar_clients.stats(), speculation_stats()
+    return [
+        ("agent_llm_cache_lookups_total", "counter", "LLM response cache lookups by result.",
+         [({"result": result}, cache[result]) for result in ("hits", "disk_hits", "misses", "bypassed")]),
+        ("agent_llm_cache_saved_seconds_total", "counter", "LLM latency saved by cache hits.", [({}, cache["saved_seconds"])]),
+        ("agent_llm_cache_entries", "gauge", "Entries in the LLM response cache.", [({}, cache["size"])]),
+        ("agent_dateparser_parses_total", "counter", "Date phrases by parser path.",
+         [({"path": path}, parser[path]) for path in ("fast_path", "fallback", "unparsed")]),
+        ("agent_dateparser_cache_lookups_total", "counter", "dateparser fallback cache lookups by result.",
+         [({"result": "hits"}, parser["cache"]["hits"]), ({"result": "misses"}, parser["cache"]["misses"])]),
+        ("agent_sessions", "gauge", "Chat sessions held by the session store.", [({}, sessions["sessions"])]),
+        ("agent_sessions_evicted_total", "counter", "Sessions evicted or expired.", [({}, sessions["evicted"])]),
+        ("agent_turns_total", "counter", "Chat turns by intent.",
+         [({"intent": name}, entry["turns"]) for name, entry in sorted(intents["intents"].items())]),
+        ("agent_outbound_retries_total", "counter", "Upstream calls retried after 429/5xx or connection errors.",
+         [({"upstream": name}, entry["retries"]) for name, entry in outbound.items()]),
+        ("agent_outbound_failures_total", "counter", "Upstream calls that failed after retries.",
+         [({"upstream": name}, entry["failures"]) for name, entry in outbound.items()]),
+        ("agent_outbound_throttled_seconds_total", "counter", "Time spent waiting for rate-limit tokens.",
+         [({"upstream": name}, entry["throttled_seconds"]) for name, entry in outbound.items()]),
+        ("agent_outbound_coalesced_total", "counter", "Calls answered by an identical call already in flight.",
+         [({"upstream": name}, entry["coalesced"]) for name, entry in outbound.items()]),
+        ("agent_calendar_clients", "gauge", "Tenant credentials held by the client cache.", [({}, clients["entries"])]),
+        ("agent_calendar_clients_evicted_total", "counter", "Tenant credentials evicted from the client cache.",
+         [({}, clients["evictions"])]),
+        ("agent_token_refreshes_total", "counter", "Access token refreshes by kind.",
+         [({"kind": kind}, clients[key]) for kind, key in (("blocking", "refreshes"), ("ahead", "refreshes_ahead"),
+                                                           ("failed", "refresh_errors"))]),
+        ("agent_speculative_prefetches_total", "counter", "Speculative freebusy prefetches by outcome.",
+         [({"result": result}, speculations[result]) for result in ("used", "wasted", "cancelled")]),
+        ("agent_chat_active", "gauge", "Chat turns being processed.", [({}, chat_limiter.active)]),
+        ("agent_chat_waiting", "gauge", "Chat turns queued for capacity.", [({}, chat_limiter.waiting)]),
+    ]
+
+metrics.register_collector(stats_metrics)
+
+@app.get("/metrics", response_class=PlainTextResponse)
+def prometheus_metrics():
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
 app.include_router(calendar_routes.router)
@@ -0,0 +1,29 @@
+import threading
+
+# One compiled graph (and one ChatOpenAI client with its connection pool) per
+# worker process. The compiled graph holds no per-conversation data: each
+# conversation's state is checkpointed in the session store under its
+# session ID, so concurrent requests can share the graph safely. It is built
+# by the start-up warm-up (backend/services/warmup.py), or by the first
+# request if warm-up is off; langgraph and langchain are imported only then.
+_agent = None
+_lock = threading.Lock()
+
+def get_agent():
+    global _agent
+    if _agent is None:
+        with _lock:
+            if _agent is None:
+                from backend.services.agent_service import create_agent
+                from backend.services.session_store import session_store
+                _agent = create_agent(checkpointer=session_store)
+    return _agent
+
+def set_agent(agent):
+    """Replace the shared agent (used by benchmarks and local tooling)."""
+    global _agent
+    with _lock:
+        _agent = agent
+
+def reset_agent():
+    set_agent(None)
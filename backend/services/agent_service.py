@@ -1,288 +1,316 @@
-import os
+import time
 from datetime import datetime, timedelta
-from typing import TypedDict, Dict, Any, Literal
-from dotenv import load_dotenv
-from langchain.tools import tool
-from langchain_openai import ChatOpenAI
+from typing import Annotated, TypedDict, Dict, Any, Literal
+from langchain_core.tools import tool
+from langgraph.config import get_stream_writer
 from langgraph.graph import StateGraph, END
-from langchain_core.messages import HumanMessage, ToolMessage
 from pydantic import SecretStr
-from backend.services.google_calendar_service import create_event, check_availability as gcal_check_availability
+from backend.config import (OPENROUTER_API_KEY, SLOT_SEARCH_DAYS, SESSION_MAX_MESSAGES, PROMPT_TOKEN_BUDGET,
+                            RESPONSE_LLM_PARAPHRASE, OPENROUTER_RATE, OPENROUTER_BURST, SPECULATIVE_PREFETCH)
+from backend.services import speculation
+from backend.services.google_calendar_service import (create_event, check_availability as gcal_check_availability,
+                                                      reset_prefetch, use_prefetch)
+from backend.services.availability_service import check_availability_batch as gcal_check_availability_batch
+from backend.services.slot_service import find_free_slots as find_calendar_slots
+from backend.services.prompt_builder import build_prompt, count_tokens
+from backend.services.intent_router import CHAT, classify, record_turn, speculative_range
+from backend.services.parsing_service import parsing_service
+from backend.services.reply_router import route_to_tools
+from backend.services.tenants import UnknownCalendar
+from backend.services.response_renderer import render
+from backend.utils.concurrency import run_blocking
+from backend.utils.llm_cache import cache_key, is_time_relative, llm_cache
+from backend.utils.metrics import TOKEN_BUCKETS, metrics
+from backend.utils.outbound import OutboundScheduler, default_classify
+from backend.utils.time_utils import DEFAULT_TIMEZONE, is_valid_timezone
+from backend.utils.tracing import span
 
-"""
-Required environment variables (set in .env or system):
-- OPENROUTER_API_KEY: Your OpenRouter API key
-- GOOGLE_CLIENT_ID: Google Calendar OAuth client ID
-- GOOGLE_CLIENT_SECRET: Google Calendar OAuth client secret
-- GOOGLE_REFRESH_TOKEN: Google Calendar OAuth refresh token
-"""
-
-load_dotenv()
-
-# Load OpenRouter API key
-OPENROUTER_API_KEY = os.getenv("OPENROUTER_API_KEY")
-if not OPENROUTER_API_KEY:
-    raise ValueError("OPENROUTER_API_KEY environment variable not set")
-
-# Load Google Calendar credentials
-GOOGLE_CLIENT_ID = os.getenv("GOOGLE_CLIENT_ID")
-GOOGLE_CLIENT_SECRET = os.getenv("GOOGLE_CLIENT_SECRET")
-GOOGLE_REFRESH_TOKEN = os.getenv("GOOGLE_REFRESH_TOKEN")
-
-if not (GOOGLE_CLIENT_ID and GOOGLE_CLIENT_SECRET and GOOGLE_REFRESH_TOKEN):
-    raise ValueError("Google Calendar credentials (GOOGLE_CLIENT_ID, GOOGLE_CLIENT_SECRET, GOOGLE_REFRESH_TOKEN) must be set in environment or .env file.")
+def append_history(history, messages):
+    # Sessions keep only the most recent messages.
+    return ((history or []) + (messages or []))[-SESSION_MAX_MESSAGES:]
 
 class AgentState(TypedDict):
     input: str
     output: str
-    tool_name: Literal["book_meeting", "check_availability"] | None
+    tool_name: Literal["book_meeting", "check_availability", "check_availability_batch", "find_free_slots"] | None
     tool_args: Dict[str, Any] | None
     tool_result: str | None
-    history: list | None
+    history: Annotated[list | None, append_history]
     pending_event: Dict[str, Any] | None  # Store last proposed event
+    tool_outcome: Dict[str, Any] | None
+    intent: str | None
+    turn_started: float | None
+    locale: str | None
+    speculation: str | None  # ID of this turn's freebusy prefetch
 
 @tool
-def book_meeting(start_time: str, end_time: str, summary: str, timeZone="Asia/Kolkata", location=None, conference=False) -> str:
+def book_meeting(start_time: str, end_time: str, summary: str, timeZone="Asia/Kolkata", location=None, conference=False) -> dict:
     """Book a meeting in Google Calendar."""
     try:
         # Always enforce Asia/Kolkata unless a valid timezone is specified
-        import pytz
-        if timeZone not in pytz.all_timezones:
-            timeZone = "Asia/Kolkata"
+        if not is_valid_timezone(timeZone):
+            timeZone = DEFAULT_TIMEZONE
         event = create_event(start_time, end_time, summary, timeZone=timeZone, location=location, conference=conference)
-        html_link = event.get('htmlLink')
-        from datetime import datetime
-        dt = datetime.fromisoformat(start_time)
-        local_dt = dt.astimezone(pytz.timezone(timeZone))
-        date_str = local_dt.strftime('%B %d, %Y')
-        time_str = local_dt.strftime('%I:%M %p')
-        msg = f"Booked: {summary} on {date_str} at {time_str} ({timeZone}) for 30 minutes."
-        if html_link:
-            msg += f"\n[View in Google Calendar]({html_link})"
-        return msg
+        minutes = int((datetime.fromisoformat(end_time) - datetime.fromisoformat(start_time)).total_seconds() // 60)
+        return {"kind": "booked", "summary": summary, "start_time": start_time, "minutes": minutes,
+                "timezone": timeZone, "link": event.get('htmlLink'), "event_id": event.get('id')}
     except Exception as e:
-        return f"Error booking meeting: {str(e)}"
+        return {"kind": "error", "action": "book", "message": str(e)}
 
 @tool
-def check_availability(date: str, duration_minutes: int = 30) -> str:
+def check_availability(date: str, duration_minutes: int = 30, timeZone: str = "Asia/Kolkata") -> dict:
     """Check calendar availability."""
     try:
+        if not is_valid_timezone(timeZone):
+            timeZone = DEFAULT_TIMEZONE
         start_time = datetime.fromisoformat(date).isoformat()
         end_time = (datetime.fromisoformat(date) + timedelta(minutes=duration_minutes)).isoformat()
         busy_slots = gcal_check_availability(start_time, end_time)
         if busy_slots:
-            return f"Busy during: {busy_slots}"
-        else:
-            return f"Available from {start_time} to {end_time}"
+            return {"kind": "busy", "start_time": start_time, "end_time": end_time, "busy": busy_slots, "timezone": timeZone}
+        return {"kind": "free", "start_time": start_time, "end_time": end_time, "timezone": timeZone}
     except Exception as e:
-        return f"Error checking availability: {str(e)}"
+        return {"kind": "error", "action": "check", "message": str(e)}
+
+@tool
+def check_availability_batch(windows: list, calendar_ids: list | None = None, timeZone: str = "Asia/Kolkata") -> dict:
+    """Check several candidate time windows (and optionally several calendars) at once."""
+    try:
+        if not is_valid_timezone(timeZone):
+            timeZone = DEFAULT_TIMEZONE
+        result = gcal_check_availability_batch(windows, calendar_ids)
+        options = [{"start_time": window["start_time"], "end_time": window["end_time"],
+                    "status": "busy" if 1 in row else "unknown" if -1 in row else "free"}
+                   for window, row in zip(result["windows"], result["busy"])]
+        return {"kind": "options", "options": options, "timezone": timeZone}
+    except UnknownCalendar as e:
+        return {"kind": "error", "action": "check", "message": f"Unknown calendar: {e}"}
+    except Exception as e:
+        return {"kind": "error", "action": "check", "message": str(e)}
+
+@tool
+def find_free_slots(start_time: str, duration_minutes: int = 30, count: int = 3, timeZone: str = "Asia/Kolkata") -> dict:
+    """Find the earliest free slots in the calendar from start_time onwards."""
+    try:
+        if not is_valid_timezone(timeZone):
+            timeZone = DEFAULT_TIMEZONE
+        slots = find_calendar_slots(start_time, duration_minutes=duration_minutes, count=count, timezone=timeZone)
+        return {"kind": "slots", "slots": [slot["start"] for slot in slots], "minutes": duration_minutes,
+                "days": SLOT_SEARCH_DAYS, "timezone": timeZone}
+    except Exception as e:
+        return {"kind": "error", "action": "slots", "message": str(e)}
+
+def _llm_retry_decision(error):
+    import openai
+    if isinstance(error, openai.APIConnectionError):  # includes timeouts
+        return True, None
+    return default_classify(error)
+
+# OpenRouter rate limit and retries; the ChatOpenAI client's own retries are off.
+llm_scheduler = OutboundScheduler("openrouter", OPENROUTER_RATE, OPENROUTER_BURST, classify=_llm_retry_decision)
+
+LLM_SECONDS = metrics.histogram("agent_llm_seconds", "Latency of LLM calls (cache hits excluded).")
+LLM_PROMPT_TOKENS = metrics.histogram("agent_llm_prompt_tokens", "Prompt tokens per LLM pass.", buckets=TOKEN_BUCKETS)
+LLM_TOKENS = metrics.counter("agent_llm_tokens_total", "Tokens sent to (prompt) and generated by (completion) the LLM.", ("kind",))
+
+async def tool_node(state: AgentState):
+    if not state["tool_name"]:
+        return state
+    # Availability checks inside the turn's prefetched range are answered from it.
+    token = use_prefetch(speculation.get(state.get("speculation")))
+    try:
+        with span("node.tools", tool=state["tool_name"]):
+            return await _run_tool(state)
+    finally:
+        reset_prefetch(token)
+
+async def _run_tool(state: AgentState):
+    args = state["tool_args"] or {}
+    # Progress events reach /chat/stream clients; outside astream() the
+    # writer is a no-op.
+    write_progress = get_stream_writer()
+    # The tools call the blocking Google client, so run them on the
+    # bounded calendar executor to keep the event loop free.
+    if state["tool_name"] == "book_meeting":
+        write_progress({"event": "progress", "message": "Booking your meeting…"})
+        filtered_args = {k: v for k, v in args.items() if k in ["start_time", "end_time", "summary", "timeZone", "location", "conference"]}
+        outcome = await run_blocking(book_meeting.invoke, filtered_args)
+        write_progress({"event": "progress", "message": "Booked" if outcome["kind"] == "booked" else "Booking failed"})
+        return {"tool_result": render(outcome), "tool_outcome": outcome, "pending_event": None}
+    elif state["tool_name"] == "check_availability":
+        write_progress({"event": "progress", "message": "Checking availability…"})
+        outcome = await run_blocking(check_availability.invoke, args)
+        write_progress({"event": "progress", "message": "Availability checked"})
+    elif state["tool_name"] == "check_availability_batch":
+        write_progress({"event": "progress", "message": f"Checking {len(args.get('windows', []))} options…"})
+        outcome = await run_blocking(check_availability_batch.invoke, args)
+        write_progress({"event": "progress", "message": "Availability checked"})
+    elif state["tool_name"] == "find_free_slots":
+        write_progress({"event": "progress", "message": "Looking for free slots…"})
+        outcome = await run_blocking(find_free_slots.invoke, args)
+        write_progress({"event": "progress", "message": "Free slots found"})
+    else:
+        return state
+    # tool_result is the English rendering the LLM sees; tool_outcome keeps
+    # the structured result for the localized reply.
+    return {"tool_result": render(outcome), "tool_outcome": outcome}
 
-def extract_timezone(text: str):
-    import pytz
-    import re
-    # List of words to ignore (common English words)
-    ignore_words = set([
-        "the", "my", "your", "another", "local", "what", "which", "a", "an", "at", "in", "on", "for", "to", "by"
-    ])
-    # 1. Handle 'local time' or 'my time'
-    if re.search(r'\b(local|my) time\b', text, re.IGNORECASE):
-        return "Asia/Kolkata"
-    # 2. Check for common abbreviations
-    tz_abbrs = set(['IST', 'UTC', 'PST', 'EST', 'CST', 'MST', 'EDT', 'PDT', 'BST', 'CET', 'EET', 'JST', 'AEST', 'AEDT', 'GMT'])
-    abbr_map = {
-        'IST': 'Asia/Kolkata',
-        'PST': 'US/Pacific',
-        'EST': 'US/Eastern',
-        'CST': 'US/Central',
-        'MST': 'US/Mountain',
-        'EDT': 'US/Eastern',
-        'PDT': 'US/Pacific',
-        'BST': 'Europe/London',
-        'CET': 'Europe/Paris',
-        'EET': 'Europe/Athens',
-        'JST': 'Asia/Tokyo',
-        'AEST': 'Australia/Sydney',
-        'AEDT': 'Australia/Sydney',
-        'GMT': 'Etc/GMT',
-        'UTC': 'UTC'
-    }
-    for abbr in tz_abbrs:
-        if re.search(rf'\\b{abbr}\\b', text, re.IGNORECASE):
-            return abbr_map.get(abbr.upper(), abbr.upper())
-    # 3. Check for full timezone names in the text
-    for zone in pytz.all_timezones:
-        if zone.replace('_', ' ').lower() in text.lower():
-            return zone
-    # 4. If a word before 'time' or 'timezone' is in ignore_words, skip it
-    match = re.search(r"(\b\w+\b) (?:time|timezone)", text.lower())
-    if match:
-        candidate = match.group(1).strip()
-        if candidate not in ignore_words and candidate in pytz.all_timezones:
-            return candidate
-    # 5. Fallback
-    return "Asia/Kolkata"
+async def intent_node(state: AgentState, speculate: bool = False):
+    # Confident book/check/confirm requests go straight to the tools; the LLM
+    # only sees the user's message first when it is ambiguous. With speculate,
+    # a time named in such a message has its days' freebusy fetched while the
+    # LLM runs.
+    speculation_id = None
+    with span("node.intent") as fields:
+        intent, decision = await parsing_service.run(classify, state["input"], state.get("pending_event"))
+        fields["intent"] = intent
+        if speculate and decision is None:
+            window = await parsing_service.run(speculative_range, state["input"])
+            if window:
+                speculation_id = speculation.start(*window)
+        fields["speculative"] = speculation_id is not None
+    return {"intent": intent, "turn_started": time.time(), "speculation": speculation_id, **(decision or {})}
 
-def create_agent():
+async def route_node(state: AgentState):
+    # Routing runs exactly once per LLM pass and its decision is stored in the
+    # state, so the conditional edge below only reads tool_name. Non-tool
+    # decisions (clarifying messages) leave the LLM reply untouched, and once a
+    # tool has produced a result the turn ends instead of looping back.
+    if state.get("tool_result") is not None:
+        return end_turn(state)
+    with span("route_to_tools"):
+        decision = await parsing_service.run(route_to_tools, {"output": state["output"]})
+    if decision.get("tool_name"):
+        return decision
+    end = end_turn(state)
+    if decision.get("pending_event"):
+        end["pending_event"] = decision["pending_event"]
+    return end
+
+def end_turn(state: AgentState):
+    if state.get("turn_started"):
+        record_turn(state.get("intent") or CHAT, time.time() - state["turn_started"])
+    speculation.discard(state.get("speculation"))
+    history = [{"role": "user", "content": state["input"]}, {"role": "agent", "content": state["output"]}]
+    return {"tool_name": None, "history": history, "speculation": None}
+
+def has_tool_call(state: AgentState) -> bool:
+    return bool(state.get("tool_name"))
+
+def create_llm():
+    # langchain_openai pulls in the whole openai client; only import it when a real model is built.
+    from langchain_openai import ChatOpenAI
     api_key: str = OPENROUTER_API_KEY  # type: ignore
-    
-    llm = ChatOpenAI(
+
+    return ChatOpenAI(
         model="qwen/qwen3-32b",
         base_url="https://openrouter.ai/api/v1",
         api_key=SecretStr(api_key),
+        max_retries=0,
         default_headers={
             "HTTP-Referer": "https://your-frontend-url.com",
             "X-Title": "Calendar Agent"
         }
     )
 
+def respond_node(state: AgentState):
+    # Tool turns are answered from templates; no second LLM pass.
+    outcome = state.get("tool_outcome")
+    return {"output": render(outcome, state.get("locale")) if outcome else state.get("tool_result") or ""}
+
+def create_agent(llm=None, cache=llm_cache, checkpointer=None, prompt_budget=PROMPT_TOKEN_BUDGET,
+                 paraphrase_results=RESPONSE_LLM_PARAPHRASE, speculate=SPECULATIVE_PREFETCH):
+    # Build a new compiled graph. Routes should use agent_registry.get_agent()
+    # so the graph and the LLM client are shared per worker process. With a
+    # checkpointer, history and pending_event carry over between turns of the
+    # same thread_id. paraphrase_results sends tool results back through the
+    # LLM instead of rendering them from templates. speculate prefetches
+    # freebusy for times named in messages that go to the LLM.
+    if llm is None:
+        llm = create_llm()
+
     workflow = StateGraph(AgentState)
 
-    def llm_node(state: AgentState):
+    async def speculative_intent_node(state: AgentState):
+        return await intent_node(state, speculate=True)
+
+    async def llm_node(state: AgentState):
+        with span("node.llm"):
+            return await llm_pass(state)
+
+    async def llm_pass(state: AgentState):
         # Health check: if input is 'ping', return immediately
         if state["input"].strip().lower() == "ping":
             return {"output": "pong"}
-        messages = []
         # Add a system prompt to make the agent conversational and calendar-focused
         system_prompt = (
             "You are a helpful, friendly AI assistant that helps users book and manage appointments on their Google Calendar. "
             "Always reply in a conversational, natural way, confirming actions and asking for clarification if needed. "
             "If a booking or availability result is present, summarize it in a friendly way before showing the details."
         )
-        messages.append({"role": "system", "content": system_prompt})
-        # Add chat history if present
         history = state.get("history")
-        if history:
-            for msg in history:
-                if msg["role"] == "user":
-                    messages.append(HumanMessage(content=msg["content"]))
-                else:
-                    messages.append(ToolMessage(content=msg["content"], tool_call_id="tool_call_1"))
-        # Add the new user input
-        if state["input"]:
-            messages.append(HumanMessage(content=state["input"]))
         tool_result = state.get("tool_result")
-        if tool_result is not None:
-            messages.append(ToolMessage(content=str(tool_result), tool_call_id="tool_call_1"))
-        response = llm.invoke(messages)
+        tool_call = (state["tool_name"], state.get("tool_args")) if tool_result is not None and state.get("tool_name") else None
+        messages, prompt_tokens = build_prompt(system_prompt, history, state["input"], tool_result=tool_result,
+                                   tool_call=tool_call, pending_event=state.get("pending_event"), budget=prompt_budget)
+        # A tool result pins the turn to absolute times, so only passes without
+        # one are skipped when the conversation says "tomorrow" or "next week".
+        key = None
+        if cache is not None and cache.enabled:
+            texts = [state["input"]] + [msg["content"] for msg in history or []]
+            if tool_result is None and any(is_time_relative(text) for text in texts):
+                cache.bypass()
+            else:
+                key = cache_key(system_prompt, history, state["input"], tool_result, state.get("pending_event"))
+        content = cache.get(key) if key else None
+        if content is None:
+            with span("llm.call") as fields:
+                started = time.perf_counter()
+                # A retry regenerates the reply from the start; /chat/stream
+                # clients drop the text already streamed for this pass.
+                write_reset = get_stream_writer()
+                response = await llm_scheduler.acall(lambda: llm.ainvoke(messages),
+                                                     on_retry=lambda: write_reset({"event": "reset"}))
+                seconds = time.perf_counter() - started
+                content = response.content
+                # Provider usage when reported, else the local estimate.
+                usage = getattr(response, "usage_metadata", None) or {}
+                fields["prompt_tokens"] = usage.get("input_tokens") or prompt_tokens
+                fields["completion_tokens"] = usage.get("output_tokens") or count_tokens(str(content))
+            LLM_SECONDS.observe(seconds)
+            LLM_PROMPT_TOKENS.observe(fields["prompt_tokens"])
+            LLM_TOKENS.inc(fields["prompt_tokens"], kind="prompt")
+            LLM_TOKENS.inc(fields["completion_tokens"], kind="completion")
+            if key:
+                cache.put(key, content, seconds)
         # Friendly summary for tool results
-        tool_result = state.get("tool_result")
         if isinstance(tool_result, str) and tool_result:
             friendly_prefix = "Here's what I did for you: " if "Booked:" in tool_result else "Here's what I found: "
-            return {"output": f"{response.content}\n\n{friendly_prefix}{tool_result}"}
-        else:
-            return {"output": response.content}
-
-    def tool_node(state: AgentState):
-        if not state["tool_name"]:
-            return state
-        args = state["tool_args"] or {}
-        if state["tool_name"] == "book_meeting":
-            filtered_args = {k: v for k, v in args.items() if k in ["start_time", "end_time", "summary", "timeZone", "location", "conference"]}
-            result = book_meeting.invoke(filtered_args)
-            return {"tool_result": result, "pending_event": None}
-        elif state["tool_name"] == "check_availability":
-            result = check_availability.invoke(args)
-            return {"tool_result": result}
+            outcome = state.get("tool_outcome")
+            details = render(outcome, state.get("locale")) if outcome else tool_result
+            return {"output": f"{content}\n\n{friendly_prefix}{details}"}
         else:
-            return state
-
-    def route_to_tools(state: AgentState):
-        import dateparser
-        import pytz
-        import re
-        output = state["output"].lower()
-        # Robust confirmation logic
-        affirmative_keywords = ["confirm", "book it", "yes", "ok", "please do", "go ahead", "sure", "do it", "schedule", "add it", "add event"]
-        if any(word in output for word in affirmative_keywords):
-            pending = state.get("pending_event")
-            if pending:
-                timezone = pending.get("timeZone")
-                if timezone not in pytz.all_timezones:
-                    pending["timeZone"] = "Asia/Kolkata"
-                return {"tool_name": "book_meeting", "tool_args": pending, "pending_event": None}
-            else:
-                return {"output": "There is no pending event to confirm. Please specify the meeting details."}
-        # Book meeting extraction
-        if "book" in output:
-            summary_match = re.search(r"book (?:a )?meeting(?: with ([\w\s]+))?", output)
-            summary = summary_match.group(1).strip() if summary_match and summary_match.group(1) else "Meeting"
-            time_match = re.search(r"at ([^.,;\n]+)", output)
-            time_str = time_match.group(1).strip() if time_match else None
-            timezone = extract_timezone(output)
-            if timezone not in pytz.all_timezones:
-                timezone = "Asia/Kolkata"
-            now = datetime.now(pytz.timezone(timezone))
-            if time_str:
-                parsed_time = dateparser.parse(
-                    time_str,
-                    settings={
-                        "TIMEZONE": timezone,
-                        "RETURN_AS_TIMEZONE_AWARE": True,
-                        "PREFER_DATES_FROM": "future",
-                        "RELATIVE_BASE": now
-                    }
-                )
-            else:
-                parsed_time = None
-            if parsed_time and "tomorrow" in output:
-                parsed_time = parsed_time + timedelta(days=1)
-            if not parsed_time or parsed_time < now:
-                return {"output": "Sorry, I couldn't understand the meeting time or it was in the past. Please specify a future date and time (e.g., 'Book a meeting tomorrow at 3pm IST')."}
-            start_time = parsed_time.isoformat()
-            end_time = (parsed_time + timedelta(minutes=30)).isoformat()
-            # Store pending event for confirmation
-            pending_event = {"start_time": start_time, "end_time": end_time, "summary": summary, "timeZone": timezone}
-            confirm_msg = f"I'll check your availability for the 1 PM - 1:30 PM slot on {parsed_time.astimezone(pytz.timezone('Asia/Kolkata')).strftime('%B %d, %Y')} (Asia/Kolkata). Is that correct?\nLet me know if you'd like to adjust or confirm the booking!"
-            return {"output": confirm_msg, "pending_event": pending_event}
-        elif "check" in output or "available" in output:
-            import dateparser
-            import pytz
-            import re
-            # Try to extract date/time phrase
-            date_match = re.search(r"on ([^.,;\n]+)", output)
-            time_match = re.search(r"at ([^.,;\n]+)", output)
-            duration_match = re.search(r"for (\d+) minutes", output)
-            duration = int(duration_match.group(1)) if duration_match else 30
-            timezone = extract_timezone(output)
-            if timezone not in pytz.all_timezones:
-                timezone = "Asia/Kolkata"
-            now = datetime.now(pytz.timezone(timezone))
-            # Build a phrase to parse
-            phrase = ""
-            if date_match:
-                phrase += date_match.group(1).strip() + " "
-            if time_match:
-                phrase += time_match.group(1).strip()
-            phrase = phrase.strip()
-            parsed_time = dateparser.parse(
-                phrase,
-                settings={
-                    "TIMEZONE": timezone,
-                    "RETURN_AS_TIMEZONE_AWARE": True,
-                    "PREFER_DATES_FROM": "future",
-                    "RELATIVE_BASE": now
-                }
-            )
-            if not parsed_time or parsed_time < now:
-                return {"output": "Sorry, I couldn't understand the date/time for availability. Please specify a future date and time (e.g., 'Check availability on July 10th at 3pm IST')."}
-            start_time = parsed_time.isoformat()
-            end_time = (parsed_time + timedelta(minutes=duration)).isoformat()
-            return {"tool_name": "check_availability", "tool_args": {"start_time": start_time, "end_time": end_time}}
-        return {"output": state["output"]}
+            return {"output": content}
 
     workflow.add_node("llm", llm_node)
     workflow.add_node("tools", tool_node)
-    workflow.add_node("route", route_to_tools)
+    workflow.add_node("route", route_node)
+    workflow.add_node("intent", speculative_intent_node if speculate else intent_node)
+    workflow.add_node("respond", respond_node)
 
-    workflow.set_entry_point("llm")
-    workflow.add_edge("tools", "llm")
+    workflow.set_entry_point("intent")
     workflow.add_conditional_edges(
-        "llm",
-        lambda state: bool(route_to_tools(state).get("tool_name")),
-        {True: "route", False: END}
+        "intent",
+        has_tool_call,
+        {True: "tools", False: "llm"}
     )
-    workflow.add_edge("route", "tools")
-
-    return workflow.compile()
+    workflow.add_edge("llm", "route")
+    workflow.add_conditional_edges(
+        "route",
+        has_tool_call,
+        {True: "tools", False: END}
+    )
+    workflow.add_edge("tools", "llm" if paraphrase_results else "respond")
+    workflow.add_edge("respond", "route")
 
-agent = create_agent()
\ No newline at end of file
+    return workflow.compile(checkpointer=checkpointer)
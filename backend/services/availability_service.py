@@ -0,0 +1,71 @@
+from datetime import datetime, timezone
+import numpy as np
+from backend.config import FREEBUSY_MAX_CALENDARS, FREEBUSY_MAX_SPAN_DAYS
+from backend.services.google_calendar_service import query_freebusy
+from backend.services.tenants import UnknownCalendar, current_tenant
+from backend.utils.intervals import busy_to_arrays, merge_intervals, overlaps_any, to_epoch
+
+BUSY, FREE, UNKNOWN = 1, 0, -1
+
+def _iso_utc(epoch: int) -> str:
+    return datetime.fromtimestamp(int(epoch), timezone.utc).isoformat()
+
+def group_windows(starts: np.ndarray, ends: np.ndarray, max_span: int):
+    """Pack windows into the fewest time ranges no longer than `max_span` seconds.
+
+    Greedy over windows sorted by start, which is optimal for a span limit.
+    Yields (window indices, range start, range end).
+    """
+    order = np.argsort(starts, kind="stable")
+    group, group_start, group_end = [], None, None
+    for index in order:
+        start, end = int(starts[index]), int(ends[index])
+        if group and max(group_end, end) - group_start > max_span:
+            yield np.array(group), group_start, group_end
+            group = []
+        if not group:
+            group_start, group_end = start, end
+        group.append(index)
+        group_end = max(group_end, end)
+    if group:
+        yield np.array(group), group_start, group_end
+
+def check_availability_batch(windows, calendar_ids=None):
+    """Busy/free matrix for many windows across many calendars in the fewest freebusy calls.
+
+    `windows` is a list of {"start_time": iso, "end_time": iso}. The matrix has
+    one row per window and one column per calendar: 1 busy, 0 free, -1 unknown
+    (the calendar returned an error, e.g. no access). Every calendar must be
+    one the current tenant is configured with; others raise UnknownCalendar.
+    """
+    tenant = current_tenant()
+    calendar_ids = list(dict.fromkeys(calendar_ids or [tenant.calendar_id]))
+    for calendar_id in calendar_ids:
+        if not tenant.allows(calendar_id):
+            raise UnknownCalendar(calendar_id)
+    starts = np.array([to_epoch(window["start_time"]) for window in windows], dtype=np.int64)
+    ends = np.array([to_epoch(window["end_time"]) for window in windows], dtype=np.int64)
+    matrix = np.full((len(windows), len(calendar_ids)), FREE, dtype=np.int8)
+    errors, queries = {}, 0
+    for indices, range_start, range_end in group_windows(starts, ends, FREEBUSY_MAX_SPAN_DAYS * 86400):
+        for offset in range(0, len(calendar_ids), FREEBUSY_MAX_CALENDARS):
+            chunk = calendar_ids[offset:offset + FREEBUSY_MAX_CALENDARS]
+            calendars = query_freebusy(_iso_utc(range_start), _iso_utc(range_end), chunk)
+            queries += 1
+            for column, calendar_id in enumerate(chunk, start=offset):
+                info = calendars.get(calendar_id, {})
+                if info.get("errors"):
+                    errors[calendar_id] = info["errors"][0].get("reason", "unknown")
+                    matrix[indices, column] = UNKNOWN
+                    continue
+                busy_starts, busy_ends = merge_intervals(*busy_to_arrays(info.get("busy", [])))
+                overlap = overlaps_any(busy_starts, busy_ends, starts[indices], ends[indices])
+                matrix[indices, column] = np.where(overlap, BUSY, FREE)
+    return {
+        "calendars": calendar_ids,
+        "windows": [{"start_time": window["start_time"], "end_time": window["end_time"]} for window in windows],
+        "busy": matrix.tolist(),
+        "free_windows": [int(i) for i in np.flatnonzero((matrix == FREE).all(axis=1))],
+        "queries": queries,
+        "errors": errors,
+    }
@@ -0,0 +1,161 @@
+import logging
+import sys
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime, timedelta
+from google.auth.credentials import AnonymousCredentials
+from backend.config import GOOGLE_API_ROOT_URL, TENANT_CACHE_SIZE, TENANT_CACHE_MAX_BYTES, TOKEN_REFRESH_AHEAD
+
+logger = logging.getLogger(__name__)
+
+SCOPES = ['https://www.googleapis.com/auth/calendar']
+# Refresh the access token this long before it expires, so requests never
+# race the expiry and only one thread performs the refresh. It must exceed
+# google-auth's own threshold (3m45s), or AuthorizedHttp would refresh the
+# token itself, on every thread at once.
+TOKEN_REFRESH_MARGIN = timedelta(minutes=5)
+# Native memory the size estimate can't see: the service account's parsed
+# RSA key and the entry's own bookkeeping.
+ENTRY_OVERHEAD = 4096
+
+def load_credentials(key):
+    """Credentials for a (credentials_file, subject) key."""
+    credentials_file, subject = key
+    if GOOGLE_API_ROOT_URL and not credentials_file:
+        # Local Calendar API stubs don't check auth.
+        return AnonymousCredentials()
+    from google.oauth2 import service_account
+    credentials = service_account.Credentials.from_service_account_file(credentials_file, scopes=SCOPES)
+    return credentials.with_subject(subject) if subject else credentials
+
+def _approx_size(credentials) -> int:
+    fields = getattr(credentials, "__dict__", {})
+    return sys.getsizeof(credentials) + sum(sys.getsizeof(value) for value in fields.values()) + ENTRY_OVERHEAD
+
+class _Entry:
+    __slots__ = ("key", "credentials", "size", "lock", "refreshing")
+
+    def __init__(self, key, credentials):
+        self.key = key
+        self.credentials = credentials
+        self.size = _approx_size(credentials)
+        self.lock = threading.Lock()
+        self.refreshing = False
+
+class CalendarClientCache:
+    """Authorized Calendar credentials per tenant, in an LRU bounded by count and approximate bytes.
+
+    Entries are keyed by credentials file and subject, so tenants sharing a
+    service account share one entry (and one token). A token within
+    `refresh_ahead` of expiry is refreshed on a background thread while
+    requests keep using it; one within `refresh_margin` (or missing) is
+    refreshed before use. Concurrent first uses of a key load it once.
+    """
+
+    def __init__(self, max_entries: int = TENANT_CACHE_SIZE, max_bytes: int = TENANT_CACHE_MAX_BYTES,
+                 refresh_ahead: float = TOKEN_REFRESH_AHEAD, refresh_margin: timedelta = TOKEN_REFRESH_MARGIN,
+                 loader=load_credentials):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.refresh_ahead = timedelta(seconds=refresh_ahead)
+        self.refresh_margin = refresh_margin
+        self.loader = loader
+        self._entries = OrderedDict()
+        self._loading = {}
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._refresher = ThreadPoolExecutor(max_workers=2, thread_name_prefix="token-refresh")
+        self._stats = {"hits": 0, "misses": 0, "evictions": 0, "refreshes": 0, "refreshes_ahead": 0, "refresh_errors": 0}
+
+    def get(self, tenant):
+        """Credentials for `tenant`, with a token that is valid for at least `refresh_margin`."""
+        entry = self._entry(tenant.credentials_key)
+        self._ensure_fresh(entry)
+        return entry.credentials
+
+    def _entry(self, key) -> _Entry:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self._stats["hits"] += 1
+                return entry
+            future = self._loading.get(key)
+            owner = future is None
+            if owner:
+                future = self._loading[key] = Future()
+                self._stats["misses"] += 1
+        if not owner:
+            return future.result()
+        try:
+            entry = _Entry(key, self.loader(key))
+            with self._lock:
+                self._entries[key] = entry
+                self._bytes += entry.size
+                self._evict()
+            future.set_result(entry)
+            return entry
+        except BaseException as error:
+            future.set_exception(error)
+            raise
+        finally:
+            with self._lock:
+                del self._loading[key]
+
+    def _evict(self):
+        # Oldest first; the entry just used is never evicted.
+        while len(self._entries) > 1 and (len(self._entries) > self.max_entries or self._bytes > self.max_bytes):
+            _, entry = self._entries.popitem(last=False)
+            self._bytes -= entry.size
+            self._stats["evictions"] += 1
+
+    def _remaining(self, credentials):
+        if not credentials.token or credentials.expiry is None:
+            return None
+        return credentials.expiry - datetime.utcnow()
+
+    def _ensure_fresh(self, entry: _Entry):
+        if isinstance(entry.credentials, AnonymousCredentials):
+            return
+        remaining = self._remaining(entry.credentials)
+        if remaining is None or remaining < self.refresh_margin:
+            self._refresh(entry)
+        elif remaining < self.refresh_ahead:
+            with self._lock:
+                if entry.refreshing:
+                    return
+                entry.refreshing = True
+            self._refresher.submit(self._refresh, entry, True)
+
+    def _refresh(self, entry: _Entry, ahead: bool = False):
+        from google.auth.transport.requests import Request
+        with entry.lock:
+            try:
+                remaining = self._remaining(entry.credentials)
+                # Another thread may have refreshed it while we waited for the lock.
+                if remaining is None or remaining < (self.refresh_ahead if ahead else self.refresh_margin):
+                    entry.credentials.refresh(Request())
+                    with self._lock:
+                        self._stats["refreshes_ahead" if ahead else "refreshes"] += 1
+            except Exception as error:
+                with self._lock:
+                    self._stats["refresh_errors"] += 1
+                if not ahead:
+                    raise
+                logger.warning("token refresh failed", extra={"error": str(error)})
+            finally:
+                size = _approx_size(entry.credentials)
+                with self._lock:
+                    entry.refreshing = False
+                    if self._entries.get(entry.key) is entry:
+                        self._bytes += size - entry.size
+                    entry.size = size
+                    self._evict()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return dict(self._stats, entries=len(self._entries), bytes=self._bytes, max_entries=self.max_entries,
+                        max_bytes=self.max_bytes)
+
+calendar_clients = CalendarClientCache()
@@ -0,0 +1,207 @@
+import logging
+import sqlite3
+import threading
+import time
+from datetime import datetime, timezone
+import numpy as np
+import pytz
+from googleapiclient.errors import HttpError
+from backend.config import (GOOGLE_CALENDAR_ID, CALENDAR_MIRROR_PATH, CALENDAR_MIRROR_MAX_STALENESS,
+                            CALENDAR_MIRROR_POLL_INTERVAL, CALENDAR_MIRROR_LOOKBACK_DAYS)
+from backend.services import google_calendar_service as gcal
+from backend.utils.intervals import merge_intervals
+from backend.utils.time_utils import DEFAULT_TIMEZONE
+from backend.utils.tracing import span
+
+logger = logging.getLogger(__name__)
+
+def _epoch(value: dict, time_zone: str) -> float:
+    if "dateTime" in value:
+        return datetime.fromisoformat(value["dateTime"]).timestamp()
+    # All-day events span midnight to midnight in the calendar's zone; the
+    # end date is exclusive, as in the API.
+    return pytz.timezone(time_zone).localize(datetime.fromisoformat(value["date"])).timestamp()
+
+def _is_busy(event: dict) -> bool:
+    """Whether freebusy counts the event: not cancelled, not marked free, not declined by the calendar's owner."""
+    if event.get("status") == "cancelled" or event.get("transparency") == "transparent" or "start" not in event:
+        return False
+    return not any(attendee.get("self") and attendee.get("responseStatus") == "declined"
+                   for attendee in event.get("attendees", []))
+
+def _iso(epoch: float) -> str:
+    return datetime.fromtimestamp(epoch, timezone.utc).isoformat().replace("+00:00", "Z")
+
+class CalendarMirror:
+    """SQLite copy of one calendar's events, kept current with incremental sync.
+
+    The first sync lists every event ending after now minus `lookback_days`
+    and keeps the API's sync token; later syncs fetch only what changed since
+    (a 410 from an expired token triggers a full resync). Our own inserts
+    are applied write-through. busy() answers freebusy-style queries from an
+    index on start time, syncing first when the last sync is older than
+    `max_staleness` seconds, and returns None for ranges the mirror does
+    not cover or when it cannot sync, so callers fall back to the live API.
+    """
+
+    def __init__(self, calendar_id: str = GOOGLE_CALENDAR_ID, path: str = CALENDAR_MIRROR_PATH,
+                 max_staleness: float = CALENDAR_MIRROR_MAX_STALENESS, lookback_days: int = CALENDAR_MIRROR_LOOKBACK_DAYS):
+        self.calendar_id = calendar_id
+        self.max_staleness = max_staleness
+        self.lookback_days = lookback_days
+        self._lock = threading.RLock()
+        self._sync_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._poller = None
+        # Updated from every events.list response; all-day events are placed in it.
+        self.time_zone = DEFAULT_TIMEZONE
+        self._stats = {"full_syncs": 0, "incremental_syncs": 0, "changes": 0, "sync_errors": 0,
+                       "reads": 0, "stale_syncs": 0, "misses": 0}
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("CREATE TABLE IF NOT EXISTS events (calendar_id TEXT, event_id TEXT, start REAL, end REAL, "
+                         "PRIMARY KEY (calendar_id, event_id))")
+        self._db.execute("CREATE INDEX IF NOT EXISTS events_start ON events (calendar_id, start)")
+        self._db.execute("CREATE TABLE IF NOT EXISTS sync_state (calendar_id TEXT PRIMARY KEY, sync_token TEXT, "
+                         "time_min REAL, synced_at REAL)")
+        self._db.commit()
+        row = self._db.execute("SELECT sync_token, time_min, synced_at FROM sync_state WHERE calendar_id = ?",
+                               (calendar_id,)).fetchone()
+        self._sync_token, self._time_min, self._synced_at = row if row else (None, None, 0.0)
+        # Longest event seen, so range reads only scan starts within reach of the window.
+        self._max_duration = self._db.execute("SELECT COALESCE(MAX(end - start), 0) FROM events WHERE calendar_id = ?",
+                                              (calendar_id,)).fetchone()[0]
+
+    def _list(self, **params):
+        service = gcal.get_calendar_service()
+        items, page_token = [], None
+        while True:
+            response = gcal.execute(service.events().list(calendarId=self.calendar_id, singleEvents=True,
+                                                          maxResults=2500, pageToken=page_token, **params),
+                                    (self.calendar_id,))
+            items.extend(response.get("items", []))
+            self.time_zone = response.get("timeZone", self.time_zone)
+            page_token = response.get("nextPageToken")
+            if not page_token:
+                return items, response.get("nextSyncToken")
+
+    def _apply(self, items):
+        for event in items:
+            if not _is_busy(event):
+                self._db.execute("DELETE FROM events WHERE calendar_id = ? AND event_id = ?", (self.calendar_id, event["id"]))
+                continue
+            start, end = _epoch(event["start"], self.time_zone), _epoch(event["end"], self.time_zone)
+            self._max_duration = max(self._max_duration, end - start)
+            self._db.execute("INSERT OR REPLACE INTO events VALUES (?, ?, ?, ?)", (self.calendar_id, event["id"], start, end))
+
+    def _save_state(self, sync_token, time_min):
+        self._sync_token, self._time_min, self._synced_at = sync_token, time_min, time.time()
+        self._db.execute("INSERT OR REPLACE INTO sync_state VALUES (?, ?, ?, ?)",
+                         (self.calendar_id, sync_token, time_min, self._synced_at))
+        self._db.commit()
+
+    def full_sync(self):
+        time_min = time.time() - self.lookback_days * 86400
+        items, sync_token = self._list(timeMin=_iso(time_min))
+        with self._lock:
+            self._db.execute("DELETE FROM events WHERE calendar_id = ?", (self.calendar_id,))
+            self._max_duration = 0
+            self._apply(items)
+            self._save_state(sync_token, time_min)
+            self._stats["full_syncs"] += 1
+            self._stats["changes"] += len(items)
+        logger.info("calendar mirror full sync", extra={"calendar_id": self.calendar_id, "events": len(items)})
+
+    def incremental_sync(self):
+        try:
+            items, sync_token = self._list(syncToken=self._sync_token)
+        except HttpError as error:
+            if error.resp.status != 410:
+                raise
+            logger.info("calendar mirror sync token expired", extra={"calendar_id": self.calendar_id})
+            self.full_sync()
+            return
+        with self._lock:
+            self._apply(items)
+            self._save_state(sync_token, self._time_min)
+            self._stats["incremental_syncs"] += 1
+            self._stats["changes"] += len(items)
+
+    def sync(self):
+        with self._sync_lock, span("mirror.sync"):
+            try:
+                if self._sync_token is None:
+                    self.full_sync()
+                else:
+                    self.incremental_sync()
+            except Exception:
+                with self._lock:
+                    self._stats["sync_errors"] += 1
+                raise
+
+    def apply_event(self, event: dict):
+        """Write-through for an event we just created (the API response or the inserted body with its ID)."""
+        with self._lock:
+            self._apply([event])
+            self._db.commit()
+
+    @property
+    def staleness(self) -> float:
+        return time.time() - self._synced_at
+
+    def busy(self, start_time: str, end_time: str):
+        """Merged busy blocks in [start_time, end_time) as freebusy returns them, or None if not answerable locally."""
+        start, end = datetime.fromisoformat(start_time).timestamp(), datetime.fromisoformat(end_time).timestamp()
+        if self._sync_token is None or start < self._time_min:
+            with self._lock:
+                self._stats["misses"] += 1
+            return None
+        if self.staleness > self.max_staleness:
+            try:
+                self.sync()
+            except Exception as error:
+                logger.warning("calendar mirror sync failed", extra={"calendar_id": self.calendar_id, "error": str(error)})
+                return None
+            with self._lock:
+                self._stats["stale_syncs"] += 1
+        with self._lock:
+            self._stats["reads"] += 1
+            rows = self._db.execute("SELECT start, end FROM events WHERE calendar_id = ? AND start >= ? AND start < ? "
+                                    "AND end > ?", (self.calendar_id, start - self._max_duration, end, start)).fetchall()
+        starts = np.array([row[0] for row in rows], dtype=np.float64)
+        ends = np.array([row[1] for row in rows], dtype=np.float64)
+        starts, ends = merge_intervals(starts, ends)
+        return [{"start": _iso(block_start), "end": _iso(block_end)} for block_start, block_end in zip(starts, ends)]
+
+    def start(self, interval: float = CALENDAR_MIRROR_POLL_INTERVAL):
+        """Sync now and then every `interval` seconds on a daemon thread."""
+        def poll():
+            while not self._stop.is_set():
+                try:
+                    self.sync()
+                except Exception as error:
+                    logger.warning("calendar mirror sync failed", extra={"calendar_id": self.calendar_id, "error": str(error)})
+                self._stop.wait(interval)
+
+        self._stop.clear()
+        self._poller = threading.Thread(target=poll, name="calendar-mirror", daemon=True)
+        self._poller.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._poller is not None:
+            self._poller.join()
+            self._poller = None
+
+    def stats(self) -> dict:
+        with self._lock:
+            events = self._db.execute("SELECT COUNT(*) FROM events WHERE calendar_id = ?", (self.calendar_id,)).fetchone()[0]
+            return dict(self._stats, events=events, synced=self._sync_token is not None,
+                        staleness=self.staleness if self._sync_token else None, max_staleness=self.max_staleness)
+
+def start_mirror(**kwargs) -> CalendarMirror:
+    """Create the mirror, route google_calendar_service's availability reads through it and start polling."""
+    mirror = CalendarMirror(**kwargs)
+    gcal.set_mirror(mirror)
+    mirror.start()
+    return mirror
@@ -1,6 +1,8 @@
-from backend.services.agent_service import create_agent
+import asyncio
+from backend.services.agent_registry import get_agent
 
-agent = create_agent()
+agent = get_agent()
+config = {"configurable": {"thread_id": "debug-session"}}
 
 print(">>> You can now chat with the agent. Type 'exit' to quit.")
 while True:
@@ -8,7 +10,7 @@ while True:
     if user_input.lower() in ["exit", "quit"]:
         break
     try:
-        response = agent.invoke({"input": user_input})
+        response = asyncio.run(agent.ainvoke({"input": user_input}, config))
         print("Agent:", response["output"])
     except Exception as e:
         print("Error:", str(e))
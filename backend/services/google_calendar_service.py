@@ -1,54 +1,316 @@
-from google.oauth2 import service_account
-from googleapiclient.discovery import build
-from backend.config import GOOGLE_CREDENTIALS_FILE, GOOGLE_CALENDAR_ID
+import base64
+import contextvars
+import hashlib
+import logging
+import threading
+import time
+from functools import lru_cache
+from googleapiclient.errors import HttpError
+from backend.config import (GOOGLE_API_ROOT_URL, CALENDAR_BATCH_SIZE, CALENDAR_BATCH_RETRIES, CALENDAR_RATE,
+                            CALENDAR_BURST, CALENDAR_PER_CALENDAR_RATE, CALENDAR_PER_CALENDAR_BURST)
+from backend.services.calendar_clients import calendar_clients
+from backend.services.tenants import DEFAULT_TENANT, current_tenant
+from backend.utils.outbound import OutboundScheduler, default_classify
+from backend.utils.tracing import span
 
-SCOPES = ['https://www.googleapis.com/auth/calendar']
+logger = logging.getLogger(__name__)
+
+# The discovery client, HTTP transports and service-account loader are
+# imported where they are first used: they are slow to import, and the app
+# imports this module at start-up (the warm-up loads them in the background).
+
+_lock = threading.RLock()
+_local = threading.local()
+_service = None
+_mirror = None
+# A speculative freebusy prefetch the current turn may be answered from (see
+# backend/services/speculation.py).
+_prefetch = contextvars.ContextVar("freebusy_prefetch", default=None)
+
+# Calendar reports exhausted quota as a 403 with one of these reasons.
+RATE_LIMIT_REASONS = {"rateLimitExceeded", "userRateLimitExceeded"}
+
+def classify_calendar_error(error):
+    """default_classify(), plus 403s whose reason says a rate limit was hit; other 403s are permanent."""
+    if isinstance(error, HttpError) and error.resp.status == 403:
+        details = error.error_details if isinstance(error.error_details, list) else []
+        if any(isinstance(detail, dict) and detail.get("reason") in RATE_LIMIT_REASONS for detail in details):
+            return True, None
+    return default_classify(error)
+
+# Shared quota for every Calendar call: the API as a whole and each calendar.
+calendar_scheduler = OutboundScheduler("calendar", CALENDAR_RATE, CALENDAR_BURST,
+                                       CALENDAR_PER_CALENDAR_RATE, CALENDAR_PER_CALENDAR_BURST,
+                                       classify=classify_calendar_error)
+
+def get_credentials():
+    """The current tenant's credentials, refreshed ahead of expiry."""
+    return calendar_clients.get(current_tenant())
+
+def _get_http():
+    # httplib2.Http is not thread-safe, so each worker thread keeps its own
+    # keep-alive connection, shared by every tenant; the (cheap) authorizing
+    # wrapper carries the current tenant's credentials.
+    import google_auth_httplib2
+    http = getattr(_local, "http", None)
+    if http is None:
+        import httplib2
+        http = _local.http = httplib2.Http(timeout=30)
+    return google_auth_httplib2.AuthorizedHttp(get_credentials(), http=http)
 
 def get_calendar_service():
-    credentials = service_account.Credentials.from_service_account_file(
-        GOOGLE_CREDENTIALS_FILE, scopes=SCOPES
-    )
-    return build('calendar', 'v3', credentials=credentials)
+    global _service
+    if _service is None:
+        with _lock:
+            if _service is None:
+                import httplib2
+                from googleapiclient.discovery import build
+                # static_discovery uses the discovery document bundled with
+                # google-api-python-client instead of fetching it over HTTP.
+                # The http passed here is never used: execute() sends every
+                # request over the calling thread's authorized connection.
+                client_options = {"api_endpoint": GOOGLE_API_ROOT_URL + "calendar/v3/"} if GOOGLE_API_ROOT_URL else None
+                _service = build('calendar', 'v3', http=httplib2.Http(),
+                                 static_discovery=True, cache_discovery=False,
+                                 client_options=client_options)
+    return _service
 
-def create_event(start_time: str, end_time: str, summary: str, timeZone="UTC", location=None, conference=False):
-    service = get_calendar_service()
-    try:
-        calendars = service.calendarList().list().execute()
-        for cal in calendars.get('items', []):
-            print(f"  - {cal.get('id')}: {cal.get('summary')}")
-    except Exception as e:
-        print(f"[DEBUG] Error listing calendars: {e}")
-    print(f"[DEBUG] Using calendar ID: {GOOGLE_CALENDAR_ID}")
+def warm_up():
+    """Build the client, import the transports and fetch a token ahead of the first Calendar call."""
+    get_calendar_service()
+    _get_http()
+
+def set_mirror(mirror):
+    """Answer availability for mirror.calendar_id from a CalendarMirror (None for the live API only)."""
+    global _mirror
+    _mirror = mirror
+
+def use_prefetch(prefetch):
+    """Let freebusy queries in this context be answered by `prefetch`; returns a token for reset_prefetch()."""
+    return _prefetch.set(prefetch)
+
+def reset_prefetch(token):
+    _prefetch.reset(token)
+
+def _mirrors(calendar_id) -> bool:
+    # The mirror syncs with the default credentials; other tenants' reads and
+    # writes of the same calendar go to the API, which checks their access.
+    return (_mirror is not None and _mirror.calendar_id == calendar_id
+            and current_tenant().credentials_key == DEFAULT_TENANT.credentials_key)
+
+def _send(request):
+    with span(getattr(request, "methodId", None) or "calendar.request"):
+        return request.execute(http=_get_http())
+
+def execute(request, calendar_ids=()):
+    """Send `request` within the Calendar rate limits (per calendar for `calendar_ids`), retrying 429/5xx.
+
+    Only idempotent requests belong here: inserts carry a stable event ID.
+    """
+    return calendar_scheduler.call(lambda: _send(request), keys=calendar_ids)
+
+def get_calendar_metadata(calendar_id=None):
+    tenant = current_tenant()
+    return _calendar_metadata(calendar_id or tenant.calendar_id, tenant.credentials_key)
+
+@lru_cache(maxsize=1024)
+def _calendar_metadata(calendar_id, credentials_key):
+    return execute(get_calendar_service().calendars().get(calendarId=calendar_id), (calendar_id,))
+
+def event_id_for(calendar_id: str, start_time: str, end_time: str, summary: str) -> str:
+    """Stable event ID, so re-sending the same insert is rejected as a duplicate instead of booked twice."""
+    digest = hashlib.sha1(f"{calendar_id}|{start_time}|{end_time}|{summary}".encode()).digest()
+    # Calendar event IDs must use base32hex characters (a-v, 0-9).
+    return base64.b32hexencode(digest).decode().lower().rstrip("=")
+
+def build_event(start_time: str, end_time: str, summary: str, timeZone="UTC", location=None, conference=False, event_id=None):
     event = {
         'summary': summary,
         'start': {'dateTime': start_time, 'timeZone': timeZone},
         'end': {'dateTime': end_time, 'timeZone': timeZone},
     }
+    if event_id:
+        event['id'] = event_id
     if location:
         event['location'] = location
     if conference:
         event['conferenceData'] = {
             'createRequest': {
-                'requestId': f"meet-{start_time.replace(':','').replace('-','')}",
+                'requestId': event_id or f"meet-{start_time.replace(':','').replace('-','')}",
                 'conferenceSolutionKey': {'type': 'hangoutsMeet'}
             }
         }
-    response = service.events().insert(
-        calendarId=GOOGLE_CALENDAR_ID,
+    return event
+
+def _insert(service, calendar_id, event, conference):
+    return execute(service.events().insert(
+        calendarId=calendar_id,
         body=event,
         conferenceDataVersion=1 if conference else 0
-    ).execute()
-    print("[DEBUG] Event creation response:", response)
+    ), (calendar_id,))
+
+def _resolve_conflict(service, calendar_id, event, conference):
+    """(event, created) after an insert of `event` got a 409 for its stable ID.
+
+    A live event with that ID is returned as is; a deleted one keeps its ID
+    reserved, so the slot is booked again under a new ID.
+    """
+    response = execute(service.events().get(calendarId=calendar_id, eventId=event["id"]), (calendar_id,))
+    if response.get("status") != "cancelled":
+        return response, False
+    event = dict(event, id=f"{event['id']}{int(time.time())}")
+    return _insert(service, calendar_id, event, conference), True
+
+def create_event(start_time: str, end_time: str, summary: str, timeZone="UTC", location=None, conference=False):
+    service = get_calendar_service()
+    calendar_id = current_tenant().calendar_id
+    # The stable ID makes retries safe: if an earlier attempt went through but
+    # its response was lost, the retry gets a 409 and we return that event.
+    event_id = event_id_for(calendar_id, start_time, end_time, summary)
+    event = build_event(start_time, end_time, summary, timeZone=timeZone, location=location, conference=conference,
+                        event_id=event_id)
+    try:
+        response = _insert(service, calendar_id, event, conference)
+    except HttpError as error:
+        if error.resp.status != 409:
+            raise
+        response, _ = _resolve_conflict(service, calendar_id, event, conference)
+    logger.info("event created", extra={"event_id": response.get("id"), "calendar_id": calendar_id})
+    if _mirrors(calendar_id):
+        _mirror.apply_event(response)
     return response
 
-def check_availability(start_time: str, end_time: str):
+def new_batch(callback=None):
+    if GOOGLE_API_ROOT_URL:
+        from googleapiclient.http import BatchHttpRequest
+        return BatchHttpRequest(callback=callback, batch_uri=GOOGLE_API_ROOT_URL + "batch/calendar/v3")
+    return get_calendar_service().new_batch_http_request(callback=callback)
+
+def create_events_batch(events, calendar_id=None, batch_size=CALENDAR_BATCH_SIZE):
+    """Insert many events through Calendar batch requests, `batch_size` inserts per HTTP call.
+
+    `events` are dicts with start_time, end_time, summary and optional
+    timeZone, location, conference. Each insert carries a stable event ID, so
+    retrying (here or by the caller) cannot create duplicates: an ID that
+    already exists comes back as status "exists", unless that event was
+    deleted, in which case the slot is booked again as create_event() does.
+    Returns one result per event, in order:
+    {"index", "status": "created" | "exists" | "error", ...}. A batch call
+    that fails part-way (HTTP error or lost connection) leaves "error" for
+    the inserts it did not answer. `calendar_id` defaults to the current
+    tenant's calendar.
+    """
+    calendar_id = calendar_id or current_tenant().calendar_id
+    service = get_calendar_service()
+    results = [None] * len(events)
+    requests = {}
+    for index, item in enumerate(events):
+        event_id = event_id_for(calendar_id, item["start_time"], item["end_time"], item["summary"])
+        body = build_event(item["start_time"], item["end_time"], item["summary"], timeZone=item.get("timeZone", "UTC"),
+                           location=item.get("location"), conference=item.get("conference", False), event_id=event_id)
+        requests[index] = (event_id, body, bool(item.get("conference")))
+
+    pending, conflicts = list(requests), []
+    for attempt in range(CALENDAR_BATCH_RETRIES + 1):
+        if attempt:
+            time.sleep(calendar_scheduler.backoff(attempt - 1, retry_after))
+        retry, retry_after, answered = [], None, set()
+
+        def on_response(request_id, response, exception):
+            nonlocal retry_after
+            index = int(request_id)
+            event_id = requests[index][0]
+            answered.add(index)
+            if exception is None:
+                results[index] = {"index": index, "status": "created", "event_id": response.get("id"), "htmlLink": response.get("htmlLink")}
+                if _mirrors(calendar_id):
+                    _mirror.apply_event(response)
+            elif isinstance(exception, HttpError) and exception.resp.status == 409:
+                # Resolved after the batches: the ID may belong to a deleted event.
+                conflicts.append(index)
+            else:
+                results[index] = {"index": index, "status": "error", "event_id": event_id, "error": str(exception)}
+                retryable, error_retry_after = classify_calendar_error(exception)
+                if retryable:
+                    retry.append(index)
+                    retry_after = error_retry_after or retry_after
+
+        for offset in range(0, len(pending), batch_size):
+            chunk = pending[offset:offset + batch_size]
+            batch = new_batch(callback=on_response)
+            for index in chunk:
+                _, body, conference = requests[index]
+                batch.add(service.events().insert(calendarId=calendar_id, body=body,
+                                                  conferenceDataVersion=1 if conference else 0),
+                          request_id=str(index))
+            # Each insert in a batch counts against the quota.
+            calendar_scheduler.throttle((calendar_id,), tokens=len(chunk))
+            try:
+                with span("calendar.batch", requests=len(chunk), attempt=attempt):
+                    batch.execute(http=_get_http())
+            except Exception as error:
+                # The batch call failed (an HTTP error, or the connection
+                # dropped part-way); inserts already answered keep their result.
+                unanswered = [index for index in chunk if index not in answered]
+                for index in unanswered:
+                    results[index] = {"index": index, "status": "error", "event_id": requests[index][0], "error": str(error)}
+                retryable, error_retry_after = classify_calendar_error(error)
+                if retryable:
+                    retry.extend(unanswered)
+                    retry_after = error_retry_after
+        if not retry:
+            break
+        pending = sorted(retry)
+
+    for index in conflicts:
+        event_id, body, conference = requests[index]
+        try:
+            response, created = _resolve_conflict(service, calendar_id, body, conference)
+        except Exception as error:
+            results[index] = {"index": index, "status": "error", "event_id": event_id, "error": str(error)}
+            continue
+        if created:
+            results[index] = {"index": index, "status": "created", "event_id": response.get("id"),
+                              "htmlLink": response.get("htmlLink")}
+            if _mirrors(calendar_id):
+                _mirror.apply_event(response)
+        else:
+            results[index] = {"index": index, "status": "exists", "event_id": event_id}
+    return results
+
+def query_freebusy(start_time: str, end_time: str, calendar_ids):
+    """One freebusy call for up to 50 calendars; returns the API's per-calendar dict.
+
+    The mirrored calendar, if any, is answered locally when the mirror covers
+    the range, and so are calendars a speculative prefetch already covers.
+    """
+    calendars = {}
+    if _mirror is not None and _mirror.calendar_id in calendar_ids and _mirrors(_mirror.calendar_id):
+        busy = _mirror.busy(start_time, end_time)
+        if busy is not None:
+            calendars[_mirror.calendar_id] = {"busy": busy}
+    prefetch = _prefetch.get()
+    if prefetch is not None:
+        calendars.update(prefetch.answer(start_time, end_time,
+                                         [calendar_id for calendar_id in calendar_ids if calendar_id not in calendars]))
+    remaining = [calendar_id for calendar_id in calendar_ids if calendar_id not in calendars]
+    if not remaining:
+        return calendars
     service = get_calendar_service()
     body = {
         "timeMin": start_time,
         "timeMax": end_time,
         "timeZone": "UTC",
-        "items": [{"id": GOOGLE_CALENDAR_ID}],
+        "items": [{"id": calendar_id} for calendar_id in remaining],
     }
-    events_result = service.freebusy().query(body=body).execute()
-    busy_times = events_result["calendars"][GOOGLE_CALENDAR_ID]["busy"]
+    # Identical queries already in flight (a burst of "am I free at 3pm?")
+    # share one call; only with the same credentials, as access may differ.
+    key = ("freebusy", start_time, end_time, tuple(remaining), current_tenant().credentials_key)
+    calendars.update(calendar_scheduler.coalesce(
+        key, lambda: execute(service.freebusy().query(body=body), remaining)["calendars"]))
+    return calendars
+
+def check_availability(start_time: str, end_time: str):
+    calendar_id = current_tenant().calendar_id
+    busy_times = query_freebusy(start_time, end_time, [calendar_id])[calendar_id]["busy"]
     return busy_times
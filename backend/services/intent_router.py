@@ -0,0 +1,129 @@
+import re
+import threading
+from datetime import datetime, time, timedelta
+from backend.utils.datetime_parser import find_datetime
+from backend.utils.time_utils import extract_timezone, get_timezone
+
+# Deterministic intent and slot extraction on the user's own message. Only
+# unambiguous requests are routed here ("book a meeting with Bob tomorrow at
+# 3pm", "am I free on July 10 at 3pm?", "yes, book it"); anything else, or
+# anything missing a usable future time, is left to the LLM.
+
+CHAT = "chat"
+
+_AFFIRMATIVE = re.compile(r"^\s*(?:(?:yes|yeah|yep|ok|okay|sure|confirm(?:ed)?|please do|go ahead|do it|book it|add it|sounds good)\b[\s,.!]*)+(?:please|thanks?(?: you)?)?[\s.!]*$")
+_BOOK = re.compile(r"\b(?:book|schedule|set up|arrange|add)\b")
+_CHECK = re.compile(r"\b(?:check|available|availability|am i free|are we free|is .+ free|busy)\b")
+_FREE_SLOTS = re.compile(r"\b(?:free slots?|open slots?|when am i free|next (?:free|available|open) (?:slot|time)s?)\b")
+_NEGATION = re.compile(r"\b(?:don't|do not|not|cancel|never mind|nevermind|no)\b")
+_DURATION = re.compile(r"\b(\d+)\s*(?:-\s*)?(minutes?|mins?|hours?|hrs?)\b")
+_WITH = re.compile(r"\bwith ([A-Za-z][\w'.-]*(?: [A-Z][\w'.-]*)*)")
+_TITLE = re.compile(
+    r"\b(?:book|schedule|set up|arrange|add)\s+(?:a\s+|an\s+|the\s+|my\s+)?"
+    r"([a-z][\w-]*(?: (?!(?:with|on|at|for|tomorrow|today|next)\b)[a-z][\w-]*)?)"
+    r"\s+(?=with\b|on\b|at\b|for\b|tomorrow\b|today\b|next\b)", re.IGNORECASE)
+_OPTIONS = re.compile(r"\bor\b|;")
+_SCHEDULING = re.compile(r"\b(?:book|schedule|set up|arrange|meet(?:ing)?|call|sync|free|available|availability|busy"
+                         r"|works?|slots?)\b")
+
+def duration_minutes(text: str, default: int = 30) -> int:
+    match = _DURATION.search(text)
+    if not match:
+        return default
+    value = int(match.group(1))
+    return value * 60 if match.group(2).startswith("h") else value
+
+def meeting_summary(text: str) -> str:
+    title_match = _TITLE.search(text)
+    title = title_match.group(1).strip().capitalize() if title_match else "Meeting"
+    with_match = _WITH.search(text)
+    if with_match:
+        name = with_match.group(1).strip()
+        return f"{title} with {name[0].upper() + name[1:]}"
+    return title
+
+def classify(text: str, pending_event=None, now: datetime | None = None):
+    """Return (intent, decision) for the user's message.
+
+    `decision` is the state update to apply (tool_name/tool_args, or None
+    for the "chat" intent, which goes to the LLM).
+    """
+    lowered = text.lower().strip()
+    if not lowered:
+        return CHAT, None
+    if pending_event and _AFFIRMATIVE.match(lowered):
+        return "confirm", {"tool_name": "book_meeting", "tool_args": dict(pending_event), "pending_event": None}
+    if _NEGATION.search(lowered):
+        return CHAT, None
+    timezone = extract_timezone(text)
+    if now is None:
+        now = datetime.now(get_timezone(timezone))
+    duration = duration_minutes(lowered)
+    if _FREE_SLOTS.search(lowered):
+        start = find_datetime(lowered, timezone, now)
+        start = start if start and start > now else now
+        return "find_slots", {"tool_name": "find_free_slots",
+                              "tool_args": {"start_time": start.isoformat(), "duration_minutes": duration, "timeZone": timezone}}
+    is_book, is_check = bool(_BOOK.search(lowered)), bool(_CHECK.search(lowered))
+    if is_book == is_check:
+        return CHAT, None
+    if is_check and _OPTIONS.search(lowered):
+        options = [find_datetime(segment, timezone, now) for segment in _OPTIONS.split(lowered)]
+        if None in options or any(option <= now for option in options) or len(options) < 2:
+            return CHAT, None
+        windows = [{"start_time": option.isoformat(), "end_time": (option + timedelta(minutes=duration)).isoformat()}
+                   for option in options]
+        return "check", {"tool_name": "check_availability_batch", "tool_args": {"windows": windows, "timeZone": timezone}}
+    start = find_datetime(lowered, timezone, now)
+    if start is None or start <= now:
+        return CHAT, None
+    if is_check:
+        return "check", {"tool_name": "check_availability",
+                         "tool_args": {"date": start.isoformat(), "duration_minutes": duration, "timeZone": timezone}}
+    end = start + timedelta(minutes=duration)
+    return "book", {"tool_name": "book_meeting",
+                    "tool_args": {"start_time": start.isoformat(), "end_time": end.isoformat(),
+                                  "summary": meeting_summary(text), "timeZone": timezone}}
+
+def speculative_range(text: str, now: datetime | None = None, max_days: int = 7):
+    """The (start, end) ISO range worth prefetching freebusy for while the LLM reads an ambiguous message.
+
+    The whole local day of every time the message mentions ("does friday at
+    3pm or monday at 10am work?"), so the check the LLM ends up proposing is
+    likely inside it even if it picks another hour. None unless the message
+    is about scheduling and every time found is in the future.
+    """
+    lowered = text.lower().strip()
+    if not _SCHEDULING.search(lowered) or _NEGATION.search(lowered):
+        return None
+    timezone = extract_timezone(text)
+    if now is None:
+        now = datetime.now(get_timezone(timezone))
+    found = [find_datetime(segment, timezone, now) for segment in _OPTIONS.split(lowered)]
+    times = [when for when in found if when is not None]
+    if not times or any(when <= now for when in times):
+        return None
+    first, last = min(times).date(), max(times).date() + timedelta(days=1)
+    if (last - first).days > max_days:
+        return None
+    zone = get_timezone(timezone)
+    start, end = (zone.localize(datetime.combine(day, time())) for day in (first, last))
+    return start.isoformat(), end.isoformat()
+
+_stats_lock = threading.Lock()
+_stats = {}
+
+def record_turn(intent: str, seconds: float):
+    with _stats_lock:
+        entry = _stats.setdefault(intent, {"turns": 0, "seconds": 0.0, "max_seconds": 0.0})
+        entry["turns"] += 1
+        entry["seconds"] += seconds
+        entry["max_seconds"] = max(entry["max_seconds"], seconds)
+
+def intent_stats() -> dict:
+    """Turns and latency per intent, and the share of turns routed without the first LLM call."""
+    with _stats_lock:
+        intents = {name: dict(entry, avg_ms=1000 * entry["seconds"] / entry["turns"]) for name, entry in _stats.items()}
+    turns = sum(entry["turns"] for entry in intents.values())
+    routed = turns - intents.get(CHAT, {}).get("turns", 0)
+    return {"turns": turns, "skipped_llm": routed, "skip_rate": routed / turns if turns else 0.0, "intents": intents}
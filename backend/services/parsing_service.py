@@ -0,0 +1,141 @@
+import asyncio
+import functools
+import math
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, wait
+from backend.config import PARSER_POOL, PARSER_WORKERS
+from backend.services.intent_router import classify
+from backend.services.reply_router import route_to_tools
+from backend.utils import datetime_parser
+from backend.utils.concurrency import run_blocking
+from backend.utils.tracing import SPAN_SECONDS
+
+# Intent and reply parsing (intent_router.classify, reply_router.route_to_tools)
+# is pure-Python CPU work: regexes, timezone lookup, the date parser and its
+# dateparser fallback. It runs on a pool of workers that have dateparser and
+# the common zones loaded, so it stays off the event loop; in process mode it
+# also runs in parallel across cores instead of contending for the GIL.
+# Worker processes send back the parser counters and span timings each call
+# recorded, so /stats and /metrics in the API process include them.
+
+def _warm_worker():
+    from backend.utils.datetime_parser import warm_up as warm_dateparser
+    from backend.utils.time_utils import warm_up as warm_timezones
+    warm_timezones()
+    warm_dateparser()
+
+def _ready():
+    return True
+
+def _apply_chunk(fn, chunk):
+    return [fn(*args) for args in chunk]
+
+def _apply_chunk_in_process(fn, chunk):
+    """_apply_chunk() in a worker process, with the stats it recorded there."""
+    parser, spans = datetime_parser.counters(), SPAN_SECONDS.snapshot()
+    results = _apply_chunk(fn, chunk)
+    return results, datetime_parser.counters_since(parser), SPAN_SECONDS.since(spans)
+
+def _merge_worker_stats(returned):
+    results, parser, spans = returned
+    datetime_parser.merge_counters(parser)
+    SPAN_SECONDS.merge(spans)
+    return results
+
+class ParsingService:
+    """Runs parsing functions on a "thread" or "process" pool, or "inline".
+
+    Functions and arguments must be picklable in process mode (module-level
+    functions, plain data). Workers are created by start() or on first use.
+    """
+
+    def __init__(self, mode: str = PARSER_POOL, workers: int = PARSER_WORKERS):
+        self.mode = mode
+        self.workers = workers
+        self._executor = None
+        self._lock = threading.Lock()
+        self._stats = {"calls": 0, "batches": 0, "batched_items": 0}
+
+    def _get_executor(self):
+        if self.mode == "inline":
+            return None
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    if self.mode == "process":
+                        # spawn: the server process has threads running, which fork does not copy safely.
+                        self._executor = ProcessPoolExecutor(self.workers, mp_context=multiprocessing.get_context("spawn"),
+                                                             initializer=_warm_worker)
+                    else:
+                        self._executor = ThreadPoolExecutor(self.workers, thread_name_prefix="parser",
+                                                            initializer=_warm_worker)
+        return self._executor
+
+    def start(self):
+        """Create every worker now and wait until they are warm."""
+        executor = self._get_executor()
+        if executor is not None:
+            # Pools add a worker per submission while none is idle, so this starts all of them.
+            wait([executor.submit(_ready) for _ in range(self.workers)])
+
+    def shutdown(self):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(cancel_futures=True)
+
+    def _count(self, key: str, n: int = 1):
+        with self._lock:
+            self._stats[key] += n
+
+    async def run(self, fn, *args):
+        """`fn(*args)` on a worker."""
+        self._count("calls")
+        return await self._run(fn, *args)
+
+    async def _run(self, fn, *args):
+        executor = self._get_executor()
+        if executor is None:
+            return fn(*args)
+        if self.mode == "thread":
+            return await run_blocking(fn, *args, executor=executor)
+        returned = await asyncio.get_running_loop().run_in_executor(executor, _apply_chunk_in_process, fn, [args])
+        return _merge_worker_stats(returned)[0]
+
+    def _chunks(self, items: list) -> list:
+        # A few chunks per worker: big enough to amortize the round trip to a
+        # process, small enough to even out uneven items.
+        size = max(1, math.ceil(len(items) / (self.workers * 4)))
+        return [items[i:i + size] for i in range(0, len(items), size)]
+
+    def map(self, fn, items) -> list:
+        """[fn(*args) for args in items], spread over the workers; blocks until all are done."""
+        items = list(items)
+        self._count("batches")
+        self._count("batched_items", len(items))
+        executor = self._get_executor()
+        if executor is None:
+            return _apply_chunk(fn, items)
+        if self.mode == "thread":
+            results = executor.map(functools.partial(_apply_chunk, fn), self._chunks(items))
+        else:
+            results = map(_merge_worker_stats, executor.map(functools.partial(_apply_chunk_in_process, fn),
+                                                            self._chunks(items)))
+        return [result for chunk in results for result in chunk]
+
+    async def amap(self, fn, items) -> list:
+        """map() for coroutines: waits without blocking the event loop."""
+        items = list(items)
+        self._count("batches")
+        self._count("batched_items", len(items))
+        if self._get_executor() is None:
+            return _apply_chunk(fn, items)
+        chunks = await asyncio.gather(*(self._run(_apply_chunk, fn, chunk) for chunk in self._chunks(items)))
+        return [result for chunk in chunks for result in chunk]
+
+    def stats(self) -> dict:
+        with self._lock:
+            return dict(self._stats, mode=self.mode, workers=self.workers, started=self._executor is not None)
+
+parsing_service = ParsingService()
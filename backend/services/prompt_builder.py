@@ -0,0 +1,134 @@
+import re
+import threading
+from functools import lru_cache
+from langchain_core.messages import AIMessage, HumanMessage, SystemMessage, ToolMessage
+from backend.config import PROMPT_TOKEN_BUDGET, PROMPT_SUMMARY_TOKENS
+
+# Fixed per-message overhead of the chat format (role markers, separators).
+MESSAGE_OVERHEAD = 4
+
+_encoding = None
+_encoding_lock = threading.Lock()
+_WORDS = re.compile(r"\w+|[^\w\s]")
+
+def _get_encoding():
+    global _encoding
+    if _encoding is None:
+        with _encoding_lock:
+            if _encoding is None:
+                try:
+                    import tiktoken
+                    _encoding = tiktoken.get_encoding("cl100k_base")
+                except Exception:
+                    # tiktoken downloads its tables on first use; offline,
+                    # count words and punctuation instead (close for English).
+                    _encoding = False
+    return _encoding
+
+def count_tokens(text: str) -> int:
+    encoding = _get_encoding()
+    if encoding:
+        return len(encoding.encode(text, disallowed_special=()))
+    return len(_WORDS.findall(text))
+
+def _message_tokens(message) -> int:
+    return count_tokens(str(message.content)) + MESSAGE_OVERHEAD
+
+def _history_message(msg):
+    if msg["role"] == "user":
+        return HumanMessage(content=msg["content"])
+    return AIMessage(content=msg["content"])
+
+def _first_sentence(text: str, limit: int = 120) -> str:
+    line = text.strip().split("\n", 1)[0]
+    sentence = re.split(r"(?<=[.!?])\s", line, maxsplit=1)[0]
+    return sentence if len(sentence) <= limit else sentence[:limit - 1] + "…"
+
+@lru_cache(maxsize=1024)
+def summarize_turns(turns: tuple, max_tokens: int = PROMPT_SUMMARY_TOKENS) -> str:
+    """One line per rolled-off message, newest first to be kept within `max_tokens`.
+
+    `turns` is a tuple of (role, content) pairs; the result is cached, so a
+    session whose rolled-off prefix hasn't changed reuses its summary.
+    Returns "" when not even one line fits.
+    """
+    header = "Earlier in this conversation:"
+    lines = [f"{'User' if role == 'user' else 'Assistant'}: {_first_sentence(content)}" for role, content in turns]
+    kept, used = [], count_tokens(header)
+    for line in reversed(lines):
+        used += count_tokens(line) + 1
+        if used > max_tokens:
+            break
+        kept.append(line)
+    return header + "\n" + "\n".join(reversed(kept)) if kept else ""
+
+def _pending_note(pending_event: dict) -> str:
+    return (f"Meeting awaiting the user's confirmation: {pending_event.get('summary', 'Meeting')} "
+            f"from {pending_event.get('start_time')} to {pending_event.get('end_time')} ({pending_event.get('timeZone')}).")
+
+_stats_lock = threading.Lock()
+_stats = {"prompts": 0, "tokens": 0, "max_tokens": 0, "last_tokens": 0, "rolled_messages": 0, "over_budget": 0}
+
+def _record(tokens: int, rolled: int, budget: int):
+    with _stats_lock:
+        _stats["prompts"] += 1
+        _stats["tokens"] += tokens
+        _stats["max_tokens"] = max(_stats["max_tokens"], tokens)
+        _stats["last_tokens"] = tokens
+        _stats["rolled_messages"] += rolled
+        _stats["over_budget"] += tokens > budget
+
+def prompt_stats() -> dict:
+    with _stats_lock:
+        stats = dict(_stats)
+    stats["avg_tokens"] = stats["tokens"] / stats["prompts"] if stats["prompts"] else 0.0
+    stats["budget"] = PROMPT_TOKEN_BUDGET
+    return stats
+
+def build_prompt(system_prompt: str, history, user_input: str, tool_result=None, tool_call=None,
+                 pending_event=None, budget: int = PROMPT_TOKEN_BUDGET):
+    """Assemble the messages for one LLM pass within `budget` tokens.
+
+    The system prompt, the pending event, the user's input and the tool
+    call/result are always included. The most recent history turns fill
+    the rest of the budget; older ones are rolled into a summary.
+    Returns (messages, prompt_tokens).
+    """
+    head = [SystemMessage(content=system_prompt)]
+    if pending_event:
+        head.append(SystemMessage(content=_pending_note(pending_event)))
+    tail = [HumanMessage(content=user_input)] if user_input else []
+    if tool_result is not None:
+        # The result answers an explicit tool call, as the chat API expects.
+        name, args = tool_call or ("tool", {})
+        call_id = f"call_{name}"
+        tail.append(AIMessage(content="", tool_calls=[{"name": name, "args": args or {}, "id": call_id}]))
+        tail.append(ToolMessage(content=str(tool_result), tool_call_id=call_id))
+    used = sum(_message_tokens(message) for message in head + tail)
+
+    history = history or []
+    kept = []
+    summary_reserve = PROMPT_SUMMARY_TOKENS + MESSAGE_OVERHEAD
+    index = len(history)
+    # Walk back whole user/assistant turns while they fit, leaving room for
+    # a summary of whatever does not.
+    while index > 0:
+        start = index - 2 if index >= 2 and history[index - 2]["role"] == "user" else index - 1
+        turn = [_history_message(msg) for msg in history[start:index]]
+        cost = sum(_message_tokens(message) for message in turn)
+        reserve = summary_reserve if start > 0 else 0
+        if used + cost + reserve > budget:
+            break
+        kept[:0] = turn
+        used += cost
+        index = start
+    messages = list(head)
+    if index > 0:
+        room = min(PROMPT_SUMMARY_TOKENS, budget - used - MESSAGE_OVERHEAD)
+        summary = summarize_turns(tuple((msg["role"], msg["content"]) for msg in history[:index]), room) if room > 0 else ""
+        if summary:
+            messages.append(SystemMessage(content=summary))
+            used += _message_tokens(messages[-1])
+    messages += kept + tail
+    _record(used, index, budget)
+    return messages, used
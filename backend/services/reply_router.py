@@ -0,0 +1,87 @@
+import re
+from datetime import datetime, timedelta
+from backend.utils.datetime_parser import parse_datetime
+from backend.utils.time_utils import DEFAULT_TIMEZONE, extract_timezone, get_timezone, is_valid_timezone
+
+# Tool routing on the LLM's reply: whether it proposes a booking, an
+# availability check or a free-slot search, and the tool arguments. Pure
+# CPU work with no backend state, so it can run on the parser worker pool.
+
+_WHEN_DATE = re.compile(r"\bon ([^.,;!?\n]+?)(?= at | for | or |[.,;!?\n]|$)")
+_WHEN_TIME = re.compile(r"\bat ([^,;!?\n]+?)(?= on | for | or |[,;!?\n]|\.(?!m\.)|$)")
+
+def when_phrase(text: str) -> str:
+    """The "on <date> at <time>" part of a reply, ready for parse_datetime()."""
+    date_match = _WHEN_DATE.search(text)
+    time_match = _WHEN_TIME.search(text)
+    parts = [match.group(1).strip() for match in (date_match, time_match) if match]
+    return " ".join(parts)
+
+def option_datetime(segment: str, timezone: str, now: datetime):
+    # Later options are often bare ("... on friday at 3pm or monday at 10am"),
+    # so try the whole segment before looking for "on ..."/"at ...".
+    parsed = parse_datetime(segment.strip(" .,;!?"), timezone, now)
+    if parsed is None:
+        phrase = when_phrase(segment)
+        parsed = parse_datetime(phrase, timezone, now) if phrase else None
+    return parsed
+
+def route_to_tools(state: dict):
+    output = state["output"].lower()
+    # Free-slot search ("when am I free", "next available slot")
+    if re.search(r"\b(?:free slots?|open slots?|when am i free|next (?:free|available|open) (?:slot|time)s?)\b", output):
+        duration_match = re.search(r"(\d+)[ -]minutes?", output)
+        duration = int(duration_match.group(1)) if duration_match else 30
+        timezone = extract_timezone(output)
+        now = datetime.now(get_timezone(timezone))
+        date_match = re.search(r"(?:on|from|after) ([^.,;\n]+)", output)
+        start = parse_datetime(date_match.group(1), timezone, now) if date_match else None
+        if not start or start < now:
+            start = now
+        return {"tool_name": "find_free_slots", "tool_args": {"start_time": start.isoformat(), "duration_minutes": duration, "timeZone": timezone}}
+    # Book meeting extraction
+    if "book" in output:
+        summary_match = re.search(r"book (?:a )?meeting(?: with ([\w\s]+))?", output)
+        summary = summary_match.group(1).strip() if summary_match and summary_match.group(1) else "Meeting"
+        time_match = re.search(r"at ([^.,;\n]+)", output)
+        time_str = time_match.group(1).strip() if time_match else None
+        timezone = extract_timezone(output)
+        if not is_valid_timezone(timezone):
+            timezone = DEFAULT_TIMEZONE
+        now = datetime.now(get_timezone(timezone))
+        if time_str:
+            parsed_time = parse_datetime(time_str, timezone, now)
+        else:
+            parsed_time = None
+        if parsed_time and "tomorrow" in output:
+            parsed_time = parsed_time + timedelta(days=1)
+        if not parsed_time or parsed_time < now:
+            return {"output": "Sorry, I couldn't understand the meeting time or it was in the past. Please specify a future date and time (e.g., 'Book a meeting tomorrow at 3pm IST')."}
+        start_time = parsed_time.isoformat()
+        end_time = (parsed_time + timedelta(minutes=30)).isoformat()
+        # Store pending event for confirmation
+        pending_event = {"start_time": start_time, "end_time": end_time, "summary": summary, "timeZone": timezone}
+        confirm_msg = f"I'll check your availability for the 1 PM - 1:30 PM slot on {parsed_time.astimezone(get_timezone(DEFAULT_TIMEZONE)).strftime('%B %d, %Y')} (Asia/Kolkata). Is that correct?\nLet me know if you'd like to adjust or confirm the booking!"
+        return {"output": confirm_msg, "pending_event": pending_event}
+    elif "check" in output or "available" in output:
+        duration_match = re.search(r"for (\d+) minutes", output)
+        duration = int(duration_match.group(1)) if duration_match else 30
+        timezone = extract_timezone(output)
+        if not is_valid_timezone(timezone):
+            timezone = DEFAULT_TIMEZONE
+        now = datetime.now(get_timezone(timezone))
+        # Several proposed options ("on friday at 3pm or monday at 10am") are
+        # checked together in one batched freebusy call.
+        if re.search(r"\bor\b", output):
+            options = [option_datetime(segment, timezone, now) for segment in re.split(r"\bor\b|;", output)]
+            windows = [{"start_time": option.isoformat(), "end_time": (option + timedelta(minutes=duration)).isoformat()}
+                       for option in options if option and option >= now]
+            if len(windows) > 1:
+                return {"tool_name": "check_availability_batch", "tool_args": {"windows": windows, "timeZone": timezone}}
+        parsed_time = parse_datetime(when_phrase(output), timezone, now)
+        if not parsed_time or parsed_time < now:
+            return {"output": "Sorry, I couldn't understand the date/time for availability. Please specify a future date and time (e.g., 'Check availability on July 10th at 3pm IST')."}
+        start_time = parsed_time.isoformat()
+        end_time = (parsed_time + timedelta(minutes=duration)).isoformat()
+        return {"tool_name": "check_availability", "tool_args": {"date": start_time, "duration_minutes": duration, "timeZone": timezone}}
+    return {"output": state["output"]}
@@ -0,0 +1,121 @@
+from datetime import datetime
+from backend.config import RESPONSE_LOCALE
+from backend.utils.time_utils import get_timezone
+
+# Replies for tool outcomes, filled in from the structured result instead of
+# a second LLM pass. English wording keeps the "Booked:", "Available from",
+# "Busy during" and "Error" markers the frontend highlights.
+TEMPLATES = {
+    "en": {
+        "booked": "Booked: {summary} on {date} at {time} ({timezone}) for {minutes} minutes.",
+        "link": "[View in Google Calendar]({link})",
+        "free": "Available from {start} to {end} ({timezone}). Want me to book it?",
+        "busy": "Busy during {busy} ({timezone}). Shall I look for another time?",
+        "options": "Availability ({timezone}): {options}",
+        "option_status": {"free": "free", "busy": "busy", "unknown": "unknown"},
+        "slots": "Free slots ({minutes} minutes, {timezone}): {slots}",
+        "no_slots": "No free {minutes}-minute slots found in the next {days} days.",
+        "error": "Error {action}: {message}",
+        "actions": {"book": "booking meeting", "check": "checking availability", "slots": "finding free slots"},
+        "date": "{month} {day}, {year}",
+        "weekday_date": "{weekday} {month} {day}",
+        "time": "{hour12}:{minute} {ampm}",
+        "months": ["January", "February", "March", "April", "May", "June", "July", "August", "September",
+                   "October", "November", "December"],
+        "weekdays": ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"],
+        "separator": "; ",
+    },
+    "es": {
+        "booked": "Reservado: {summary} el {date} a las {time} ({timezone}) durante {minutes} minutos.",
+        "link": "[Ver en Google Calendar]({link})",
+        "free": "Disponible de {start} a {end} ({timezone}). ¿Quieres que lo reserve?",
+        "busy": "Ocupado durante {busy} ({timezone}). ¿Busco otro horario?",
+        "options": "Disponibilidad ({timezone}): {options}",
+        "option_status": {"free": "libre", "busy": "ocupado", "unknown": "desconocido"},
+        "slots": "Huecos libres ({minutes} minutos, {timezone}): {slots}",
+        "no_slots": "No hay huecos libres de {minutes} minutos en los próximos {days} días.",
+        "error": "Error {action}: {message}",
+        "actions": {"book": "al reservar la reunión", "check": "al consultar la disponibilidad", "slots": "al buscar huecos libres"},
+        "date": "{day} de {month} de {year}",
+        "weekday_date": "{weekday} {day} de {month}",
+        "time": "{hour24}:{minute}",
+        "months": ["enero", "febrero", "marzo", "abril", "mayo", "junio", "julio", "agosto", "septiembre",
+                   "octubre", "noviembre", "diciembre"],
+        "weekdays": ["lunes", "martes", "miércoles", "jueves", "viernes", "sábado", "domingo"],
+        "separator": "; ",
+    },
+    "fr": {
+        "booked": "Réservé : {summary} le {date} à {time} ({timezone}) pendant {minutes} minutes.",
+        "link": "[Voir dans Google Agenda]({link})",
+        "free": "Disponible de {start} à {end} ({timezone}). Voulez-vous que je le réserve ?",
+        "busy": "Occupé pendant {busy} ({timezone}). Dois-je chercher un autre créneau ?",
+        "options": "Disponibilités ({timezone}) : {options}",
+        "option_status": {"free": "libre", "busy": "occupé", "unknown": "inconnu"},
+        "slots": "Créneaux libres ({minutes} minutes, {timezone}) : {slots}",
+        "no_slots": "Aucun créneau libre de {minutes} minutes dans les {days} prochains jours.",
+        "error": "Erreur {action} : {message}",
+        "actions": {"book": "lors de la réservation", "check": "lors de la vérification des disponibilités", "slots": "lors de la recherche de créneaux"},
+        "date": "{day} {month} {year}",
+        "weekday_date": "{weekday} {day} {month}",
+        "time": "{hour24}h{minute}",
+        "months": ["janvier", "février", "mars", "avril", "mai", "juin", "juillet", "août", "septembre",
+                   "octobre", "novembre", "décembre"],
+        "weekdays": ["lundi", "mardi", "mercredi", "jeudi", "vendredi", "samedi", "dimanche"],
+        "separator": " ; ",
+    },
+}
+
+def templates_for(locale: str | None) -> dict:
+    """Templates for `locale` ("es-MX" falls back to "es"), else RESPONSE_LOCALE, else English."""
+    for candidate in (locale, (locale or "").split("-")[0].split("_")[0], RESPONSE_LOCALE, "en"):
+        if candidate and candidate.lower() in TEMPLATES:
+            return TEMPLATES[candidate.lower()]
+    return TEMPLATES["en"]
+
+def _local(value: str, timezone: str) -> datetime:
+    return datetime.fromisoformat(value).astimezone(get_timezone(timezone))
+
+def _fields(t: dict, dt: datetime) -> dict:
+    return {"day": dt.day, "month": t["months"][dt.month - 1], "year": dt.year, "weekday": t["weekdays"][dt.weekday()],
+            "hour12": f"{(dt.hour % 12) or 12:02d}", "hour24": f"{dt.hour:02d}", "minute": f"{dt.minute:02d}",
+            "ampm": "AM" if dt.hour < 12 else "PM"}
+
+def format_date(t: dict, dt: datetime) -> str:
+    return t["date"].format(**_fields(t, dt))
+
+def format_time(t: dict, dt: datetime) -> str:
+    return t["time"].format(**_fields(t, dt))
+
+def format_when(t: dict, dt: datetime) -> str:
+    """Weekday, date and time, as used in lists of options and slots."""
+    return t["weekday_date"].format(**_fields(t, dt)) + ", " + format_time(t, dt)
+
+def render(outcome: dict, locale: str | None = None) -> str:
+    """Reply text for a tool outcome dict (see the tools in agent_service)."""
+    t = templates_for(locale)
+    kind = outcome["kind"]
+    timezone = outcome.get("timezone", "UTC")
+    if kind == "booked":
+        start = _local(outcome["start_time"], timezone)
+        text = t["booked"].format(summary=outcome["summary"], date=format_date(t, start), time=format_time(t, start),
+                                  timezone=timezone, minutes=outcome["minutes"])
+        if outcome.get("link"):
+            text += "\n" + t["link"].format(link=outcome["link"])
+        return text
+    if kind == "free":
+        start, end = _local(outcome["start_time"], timezone), _local(outcome["end_time"], timezone)
+        return t["free"].format(start=format_when(t, start), end=format_time(t, end), timezone=timezone)
+    if kind == "busy":
+        blocks = [f"{format_when(t, _local(block['start'], timezone))}–{format_time(t, _local(block['end'], timezone))}"
+                  for block in outcome["busy"]]
+        return t["busy"].format(busy=t["separator"].join(blocks), timezone=timezone)
+    if kind == "options":
+        options = [f"{format_when(t, _local(option['start_time'], timezone))}: {t['option_status'][option['status']]}"
+                   for option in outcome["options"]]
+        return t["options"].format(options=t["separator"].join(options), timezone=timezone)
+    if kind == "slots":
+        slots = [format_when(t, _local(start, timezone)) for start in outcome["slots"]]
+        if not slots:
+            return t["no_slots"].format(minutes=outcome["minutes"], days=outcome["days"])
+        return t["slots"].format(minutes=outcome["minutes"], timezone=timezone, slots=t["separator"].join(slots))
+    return t["error"].format(action=t["actions"].get(outcome.get("action"), ""), message=outcome.get("message", ""))
@@ -0,0 +1,156 @@
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from langgraph.checkpoint.base import BaseCheckpointSaver, CheckpointTuple, WRITES_IDX_MAP, get_checkpoint_id, get_checkpoint_metadata
+from backend.config import SESSION_MAX_SESSIONS, SESSION_TTL, SESSION_DB_PATH
+
+class SessionStore(BaseCheckpointSaver):
+    """LangGraph checkpointer holding one compact record per chat session.
+
+    Sessions are graph threads (thread_id = session ID). Only the latest
+    checkpoint of each session and its pending writes are kept, serialized
+    into a single blob, so a record is a few KB however long the
+    conversation runs. Records live in an in-memory LRU bounded by
+    `max_sessions` and expire `ttl` seconds after their last turn. With
+    `path` set they are stored in SQLite instead, so every worker process
+    sees the same sessions.
+    """
+
+    def __init__(self, max_sessions: int = SESSION_MAX_SESSIONS, ttl: float = SESSION_TTL, path: str | None = SESSION_DB_PATH):
+        super().__init__()
+        self.max_sessions = max_sessions
+        self.ttl = ttl
+        self._records = OrderedDict()
+        self._lock = threading.Lock()
+        self._db = None
+        self._evicted = 0
+        if path:
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("CREATE TABLE IF NOT EXISTS sessions (key TEXT PRIMARY KEY, type TEXT, data BLOB, updated REAL)")
+            self._db.execute("CREATE INDEX IF NOT EXISTS sessions_updated ON sessions (updated)")
+            self._db.commit()
+
+    @staticmethod
+    def _key(config) -> str:
+        configurable = config["configurable"]
+        return f"{configurable['thread_id']}|{configurable.get('checkpoint_ns', '')}"
+
+    def _load(self, key: str):
+        now = time.time()
+        with self._lock:
+            if self._db is not None:
+                row = self._db.execute("SELECT type, data, updated FROM sessions WHERE key = ?", (key,)).fetchone()
+                if row is None or now - row[2] > self.ttl:
+                    return None
+                return self.serde.loads_typed((row[0], row[1]))
+            entry = self._records.get(key)
+            if entry is None:
+                return None
+            if now - entry[1] > self.ttl:
+                del self._records[key]
+                self._evicted += 1
+                return None
+            self._records.move_to_end(key)
+            return self.serde.loads_typed(entry[0])
+
+    def _save(self, key: str, record: dict):
+        typed = self.serde.dumps_typed(record)
+        now = time.time()
+        with self._lock:
+            if self._db is not None:
+                self._db.execute("INSERT OR REPLACE INTO sessions VALUES (?, ?, ?, ?)", (key, typed[0], typed[1], now))
+                self._evicted += self._db.execute("DELETE FROM sessions WHERE updated < ?", (now - self.ttl,)).rowcount
+                self._db.commit()
+                return
+            self._records[key] = (typed, now)
+            self._records.move_to_end(key)
+            while len(self._records) > self.max_sessions:
+                self._records.popitem(last=False)
+                self._evicted += 1
+
+    def get_tuple(self, config):
+        record = self._load(self._key(config))
+        if record is None:
+            return None
+        checkpoint_id = get_checkpoint_id(config)
+        if checkpoint_id and checkpoint_id != record["checkpoint"]["id"]:
+            return None  # older checkpoints are not kept
+        configurable = config["configurable"]
+        thread = {"thread_id": configurable["thread_id"], "checkpoint_ns": configurable.get("checkpoint_ns", "")}
+        return CheckpointTuple(
+            config={"configurable": {**thread, "checkpoint_id": record["checkpoint"]["id"]}},
+            checkpoint=record["checkpoint"],
+            metadata=record["metadata"],
+            parent_config={"configurable": {**thread, "checkpoint_id": record["parent_id"]}} if record["parent_id"] else None,
+            pending_writes=[(task_id, channel, value) for task_id, channel, value, _ in record["writes"].values()],
+        )
+
+    def list(self, config, *, filter=None, before=None, limit=None):
+        if config is None:
+            return
+        checkpoint = self.get_tuple(config)
+        if checkpoint is not None and (not filter or all(checkpoint.metadata.get(k) == v for k, v in filter.items())):
+            yield checkpoint
+
+    def put(self, config, checkpoint, metadata, new_versions):
+        configurable = config["configurable"]
+        self._save(self._key(config), {
+            "checkpoint": checkpoint,
+            "metadata": get_checkpoint_metadata(config, metadata),
+            "parent_id": configurable.get("checkpoint_id"),
+            "writes": {},
+        })
+        return {"configurable": {"thread_id": configurable["thread_id"],
+                                 "checkpoint_ns": configurable.get("checkpoint_ns", ""),
+                                 "checkpoint_id": checkpoint["id"]}}
+
+    def put_writes(self, config, writes, task_id, task_path=""):
+        key = self._key(config)
+        record = self._load(key)
+        if record is None or record["checkpoint"]["id"] != config["configurable"]["checkpoint_id"]:
+            return
+        for idx, (channel, value) in enumerate(writes):
+            write_key = f"{task_id}|{WRITES_IDX_MAP.get(channel, idx)}"
+            if WRITES_IDX_MAP.get(channel, idx) >= 0 and write_key in record["writes"]:
+                continue
+            record["writes"][write_key] = (task_id, channel, value, task_path)
+        self._save(key, record)
+
+    def delete_thread(self, thread_id):
+        prefix = f"{thread_id}|"
+        with self._lock:
+            if self._db is not None:
+                self._db.execute("DELETE FROM sessions WHERE key LIKE ?", (prefix + "%",))
+                self._db.commit()
+                return
+            for key in [key for key in self._records if key.startswith(prefix)]:
+                del self._records[key]
+
+    async def aget_tuple(self, config):
+        return self.get_tuple(config)
+
+    async def alist(self, config, *, filter=None, before=None, limit=None):
+        for checkpoint in self.list(config, filter=filter, before=before, limit=limit):
+            yield checkpoint
+
+    async def aput(self, config, checkpoint, metadata, new_versions):
+        return self.put(config, checkpoint, metadata, new_versions)
+
+    async def aput_writes(self, config, writes, task_id, task_path=""):
+        self.put_writes(config, writes, task_id, task_path)
+
+    async def adelete_thread(self, thread_id):
+        self.delete_thread(thread_id)
+
+    def stats(self) -> dict:
+        with self._lock:
+            if self._db is not None:
+                count, size = self._db.execute("SELECT COUNT(*), COALESCE(SUM(LENGTH(data)), 0) FROM sessions").fetchone()
+            else:
+                count, size = len(self._records), sum(len(entry[0][1]) for entry in self._records.values())
+            return {"sessions": count, "bytes": size, "evicted": self._evicted, "max_sessions": self.max_sessions,
+                    "ttl": self.ttl, "sqlite": self._db is not None}
+
+session_store = SessionStore()
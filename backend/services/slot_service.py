@@ -0,0 +1,79 @@
+import re
+from datetime import datetime, timedelta
+import numpy as np
+from backend.config import WORKDAY_START, WORKDAY_END, SLOT_SEARCH_DAYS
+from backend.services.google_calendar_service import check_availability
+from backend.utils.intervals import busy_to_arrays, invert_intervals, merge_intervals, to_epoch
+from backend.utils.time_utils import DEFAULT_TIMEZONE, get_timezone
+
+def _from_epoch(value: int, tz) -> str:
+    return datetime.fromtimestamp(int(value), tz).isoformat()
+
+_HHMM = re.compile(r"([01]\d|2[0-3]):[0-5]\d")
+
+def is_valid_hhmm(value) -> bool:
+    return isinstance(value, str) and _HHMM.fullmatch(value) is not None
+
+def _parse_hhmm(value: str):
+    hour, minute = value.split(":")
+    return int(hour), int(minute)
+
+def non_working_intervals(window_start: int, window_end: int, tz, work_start=WORKDAY_START, work_end=WORKDAY_END, include_weekends=False):
+    """Nights (and weekends) in `tz` between the two epochs, as blocked intervals."""
+    start_hm, end_hm = _parse_hhmm(work_start), _parse_hhmm(work_end)
+    day = datetime.fromtimestamp(window_start, tz).date() - timedelta(days=1)
+    last_day = datetime.fromtimestamp(window_end, tz).date() + timedelta(days=1)
+    open_times, close_times = [], []
+    while day <= last_day:
+        if include_weekends or day.weekday() < 5:
+            open_times.append(int(tz.localize(datetime(day.year, day.month, day.day, *start_hm)).timestamp()))
+            close_times.append(int(tz.localize(datetime(day.year, day.month, day.day, *end_hm)).timestamp()))
+        day += timedelta(days=1)
+    opens = np.array(open_times, dtype=np.int64)
+    closes = np.array(close_times, dtype=np.int64)
+    return invert_intervals(opens, closes, window_start, window_end)
+
+def slots_in_gaps(gap_starts: np.ndarray, gap_ends: np.ndarray, duration: int, step: int, count: int):
+    """First `count` slot starts of `duration` seconds, aligned to `step`, inside the gaps."""
+    first = -(-gap_starts // step) * step  # round up to the step grid
+    per_gap = np.where(gap_ends - first >= duration, (gap_ends - duration - first) // step + 1, 0)
+    # Only expand as many gaps as needed to reach `count` slots.
+    needed = np.searchsorted(np.cumsum(per_gap), count) + 1
+    first, per_gap = first[:needed], per_gap[:needed]
+    total = int(per_gap.sum())
+    if total == 0:
+        return np.empty(0, dtype=np.int64)
+    gap_index = np.repeat(np.arange(per_gap.size), per_gap)
+    offsets = np.arange(total) - np.repeat(np.cumsum(per_gap) - per_gap, per_gap)
+    return (first[gap_index] + offsets * step)[:count]
+
+def find_slots_in_busy(busy, window_start, window_end, duration_minutes=30, count=5, timezone=DEFAULT_TIMEZONE,
+                       work_start=WORKDAY_START, work_end=WORKDAY_END, buffer_minutes=0, step_minutes=30,
+                       include_weekends=False):
+    """Earliest free slots given freebusy-style busy blocks ([{"start": iso, "end": iso}, ...])."""
+    tz = get_timezone(timezone)
+    start, end = to_epoch(window_start), to_epoch(window_end)
+    buffer = buffer_minutes * 60
+    busy_starts, busy_ends = busy_to_arrays(busy)
+    busy_starts, busy_ends = busy_starts - buffer, busy_ends + buffer
+    closed_starts, closed_ends = non_working_intervals(start, end, tz, work_start, work_end, include_weekends)
+    merged_starts, merged_ends = merge_intervals(np.r_[busy_starts, closed_starts], np.r_[busy_ends, closed_ends])
+    gap_starts, gap_ends = invert_intervals(merged_starts, merged_ends, start, end)
+    duration = duration_minutes * 60
+    slot_starts = slots_in_gaps(gap_starts, gap_ends, duration, step_minutes * 60, count)
+    return [{"start": _from_epoch(s, tz), "end": _from_epoch(s + duration, tz)} for s in slot_starts]
+
+def find_free_slots(start_time=None, end_time=None, duration_minutes=30, count=5, timezone=DEFAULT_TIMEZONE,
+                    work_start=WORKDAY_START, work_end=WORKDAY_END, buffer_minutes=0, step_minutes=30,
+                    include_weekends=False):
+    """Earliest `count` free slots between start_time and end_time using a single freebusy query."""
+    tz = get_timezone(timezone)
+    start = datetime.fromisoformat(start_time) if start_time else datetime.now(tz)
+    if start.tzinfo is None:
+        start = tz.localize(start)
+    end = datetime.fromisoformat(end_time) if end_time else start + timedelta(days=SLOT_SEARCH_DAYS)
+    if end.tzinfo is None:
+        end = tz.localize(end)
+    busy = check_availability(start.isoformat(), end.isoformat())
+    return find_slots_in_busy(busy, start, end, duration_minutes, count, timezone, work_start, work_end,
+                              buffer_minutes, step_minutes, include_weekends)
@@ -0,0 +1,107 @@
+import contextvars
+import threading
+import uuid
+from collections import OrderedDict
+from backend.services.google_calendar_service import query_freebusy
+from backend.services.tenants import current_tenant
+from backend.utils.concurrency import calendar_executor
+from backend.utils.intervals import to_epoch
+
+# Speculative freebusy. When a message goes to the LLM but names a time
+# ("could friday at 3pm work?"), the days it mentions are queried on the
+# calendar executor while the LLM is still answering. If the reply leads to an
+# availability check inside that range, query_freebusy() answers it from the
+# prefetch instead of calling the API; otherwise the prefetch is discarded
+# when the turn ends.
+
+MAX_INFLIGHT = 1024
+
+def narrow(info: dict, start: int, end: int) -> dict:
+    """A freebusy calendar entry cut down to the busy blocks overlapping [start, end), as a query for it returns."""
+    if info.get("errors"):
+        return info
+    busy = [block for block in info.get("busy", [])
+            if to_epoch(block["start"]) < end and to_epoch(block["end"]) > start]
+    return dict(info, busy=busy)
+
+class FreebusyPrefetch:
+    """A freebusy query for the current tenant's calendar, started ahead of need."""
+
+    def __init__(self, start_time: str, end_time: str, executor=calendar_executor):
+        tenant = current_tenant()
+        self.calendar_id = tenant.calendar_id
+        self.credentials_key = tenant.credentials_key
+        self.start, self.end = to_epoch(start_time), to_epoch(end_time)
+        self.used = False
+        ctx = contextvars.copy_context()
+        self.future = executor.submit(ctx.run, query_freebusy, start_time, end_time, [self.calendar_id])
+
+    def answer(self, start_time: str, end_time: str, calendar_ids) -> dict:
+        """{calendar_id: entry} for the queried calendars the prefetch covers; {} means query the API."""
+        start, end = to_epoch(start_time), to_epoch(end_time)
+        if (self.calendar_id not in calendar_ids or start < self.start or end > self.end
+                or current_tenant().credentials_key != self.credentials_key):
+            return {}
+        # Still queued behind other Calendar calls: the live query is no slower.
+        if self.future.cancel():
+            return {}
+        try:
+            calendars = self.future.result()
+        except Exception:
+            _count("errors")
+            return {}
+        if self.calendar_id not in calendars:
+            return {}
+        self.used = True
+        _count("answered")
+        return {self.calendar_id: narrow(calendars[self.calendar_id], start, end)}
+
+_lock = threading.Lock()
+_inflight = OrderedDict()
+_stats = {"started": 0, "answered": 0, "used": 0, "wasted": 0, "cancelled": 0, "errors": 0}
+
+def _count(key: str):
+    with _lock:
+        _stats[key] += 1
+
+def start(start_time: str, end_time: str) -> str:
+    """Prefetch freebusy for [start_time, end_time); returns the ID to look it up with."""
+    speculation_id = uuid.uuid4().hex
+    prefetch = FreebusyPrefetch(start_time, end_time)
+    with _lock:
+        _stats["started"] += 1
+        _inflight[speculation_id] = prefetch
+        # Turns that failed before discarding theirs.
+        while len(_inflight) > MAX_INFLIGHT:
+            _settle(_inflight.popitem(last=False)[1])
+    return speculation_id
+
+def get(speculation_id: str | None):
+    if not speculation_id:
+        return None
+    with _lock:
+        return _inflight.get(speculation_id)
+
+def discard(speculation_id: str | None):
+    """End a speculation, cancelling its query if it has not started."""
+    if not speculation_id:
+        return
+    with _lock:
+        prefetch = _inflight.pop(speculation_id, None)
+        if prefetch is not None:
+            _settle(prefetch)
+
+def _settle(prefetch: FreebusyPrefetch):
+    if prefetch.used:
+        _stats["used"] += 1
+    elif prefetch.future.cancel():
+        _stats["cancelled"] += 1
+    else:
+        _stats["wasted"] += 1
+
+def speculation_stats() -> dict:
+    """Prefetches started, used by the turn's check, wasted (queried but unused) and cancelled before running."""
+    with _lock:
+        stats = dict(_stats, inflight=len(_inflight))
+    settled = stats["used"] + stats["wasted"]
+    return dict(stats, hit_rate=stats["used"] / settled if settled else 0.0)
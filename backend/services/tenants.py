@@ -0,0 +1,86 @@
+import contextvars
+import json
+from typing import NamedTuple
+from backend.config import GOOGLE_CALENDAR_ID, GOOGLE_CREDENTIALS_FILE, TENANTS_FILE
+
+# Which calendar, and whose credentials, a request works with. Routes resolve
+# the tenant from the request and set it for the request's context; the
+# calendar service reads it from there, including in tool threads
+# (run_blocking copies the context), like the trace ID.
+
+class Tenant(NamedTuple):
+    id: str
+    calendar_id: str
+    credentials_file: str | None = None
+    # Workspace user a domain-wide delegated service account acts as.
+    subject: str | None = None
+    # Other calendars requests may select for this tenant.
+    calendar_ids: tuple = ()
+
+    @property
+    def credentials_key(self):
+        return self.credentials_file, self.subject
+
+    def allows(self, calendar_id: str) -> bool:
+        return calendar_id == self.calendar_id or calendar_id in self.calendar_ids
+
+DEFAULT_TENANT = Tenant("default", GOOGLE_CALENDAR_ID, GOOGLE_CREDENTIALS_FILE)
+
+class UnknownTenant(Exception):
+    pass
+
+class UnknownCalendar(Exception):
+    pass
+
+def load_tenants(path: str | None = TENANTS_FILE) -> dict:
+    """{tenant ID: Tenant} from a JSON object of {"calendar_id", "credentials_file", "subject", "calendar_ids"} entries."""
+    if not path:
+        return {}
+    with open(path) as f:
+        entries = json.load(f)
+    return {tenant_id: Tenant(tenant_id, entry["calendar_id"], entry.get("credentials_file", GOOGLE_CREDENTIALS_FILE),
+                              entry.get("subject"), tuple(entry.get("calendar_ids", ())))
+            for tenant_id, entry in entries.items()}
+
+_tenants = None
+_current = contextvars.ContextVar("tenant", default=None)
+
+def get_tenants() -> dict:
+    global _tenants
+    if _tenants is None:
+        _tenants = load_tenants()
+    return _tenants
+
+def set_tenants(tenants: dict):
+    """Replace the tenant registry (used by benchmarks and local tooling)."""
+    global _tenants
+    _tenants = tenants
+
+def resolve_tenant(tenant_id: str | None = None, calendar_id: str | None = None) -> Tenant:
+    """The tenant named by `tenant_id` (the default one if None), on `calendar_id` if given.
+
+    The calendar must be one the tenant is configured with, so a request
+    can't point a tenant's credentials, or the default ones, at any calendar.
+    """
+    tenant = DEFAULT_TENANT
+    if tenant_id:
+        tenant = get_tenants().get(tenant_id)
+        if tenant is None:
+            raise UnknownTenant(tenant_id)
+    if calendar_id:
+        if not tenant.allows(calendar_id):
+            raise UnknownCalendar(calendar_id)
+        # The tenant's other calendars stay usable, e.g. in batch availability.
+        tenant = tenant._replace(calendar_id=calendar_id,
+                                 calendar_ids=tuple(dict.fromkeys((tenant.calendar_id,) + tenant.calendar_ids)))
+    return tenant
+
+def current_tenant() -> Tenant:
+    return _current.get() or DEFAULT_TENANT
+
+def use_tenant(tenant: Tenant):
+    """Make `tenant` current for this context; returns a token for reset_tenant()."""
+    return _current.set(tenant)
+
+def reset_tenant(token):
+    _current.reset(token)
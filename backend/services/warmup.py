@@ -0,0 +1,105 @@
+import logging
+import threading
+import time
+from backend.config import STARTUP_WARMUP
+
+logger = logging.getLogger(__name__)
+
+# Work that would otherwise land on the first requests after a cold start.
+# Importing the app stays cheap (langgraph, langchain, openai, dateparser and
+# the Calendar client are imported where first used); the app's lifespan runs
+# these steps and /readyz reports their progress.
+
+def _timezones():
+    from backend.utils.time_utils import warm_up
+    warm_up()
+
+def _dateparser():
+    from backend.utils.datetime_parser import warm_up
+    warm_up()
+
+def _parser_pool():
+    from backend.services.parsing_service import parsing_service
+    parsing_service.start()
+
+def _calendar_client():
+    from backend.services.google_calendar_service import warm_up
+    warm_up()
+
+def _agent():
+    from backend.services.agent_registry import get_agent
+    get_agent()
+
+def _tokenizer():
+    from backend.services.prompt_builder import count_tokens
+    count_tokens("warm up")
+
+STEPS = [
+    ("timezones", _timezones),
+    ("dateparser", _dateparser),
+    ("parser_pool", _parser_pool),
+    ("calendar_client", _calendar_client),
+    ("agent", _agent),
+    ("tokenizer", _tokenizer),
+]
+
+class Warmup:
+    """Runs the warm-up steps in order and records their progress.
+
+    A failed step is logged and reported, not retried: whatever it was
+    loading is loaded again on first use.
+    """
+
+    def __init__(self, steps=STEPS):
+        self.steps = list(steps)
+        self.mode = None
+        self._progress = {name: {"status": "pending", "seconds": None} for name, _ in self.steps}
+        self._started = None
+        self._finished = None
+        self._lock = threading.Lock()
+
+    def run(self):
+        self._started = time.perf_counter()
+        for name, step in self.steps:
+            with self._lock:
+                self._progress[name]["status"] = "running"
+            start = time.perf_counter()
+            try:
+                step()
+                status, error = "done", None
+            except Exception as exc:
+                status, error = "failed", str(exc)
+                logger.warning("warm-up step failed", extra={"step": name, "error": error})
+            with self._lock:
+                self._progress[name].update(status=status, seconds=time.perf_counter() - start)
+                if error:
+                    self._progress[name]["error"] = error
+        self._finished = time.perf_counter()
+        logger.info("warm-up finished", extra={"seconds": self._finished - self._started})
+
+    def start(self, mode: str = STARTUP_WARMUP):
+        """Run in a background thread ("background"), right away ("blocking") or not at all ("off")."""
+        self.mode = mode
+        if mode == "off":
+            with self._lock:
+                for progress in self._progress.values():
+                    progress["status"] = "skipped"
+            self._started = self._finished = time.perf_counter()
+        elif mode == "blocking":
+            self.run()
+        else:
+            threading.Thread(target=self.run, name="warmup", daemon=True).start()
+
+    @property
+    def ready(self) -> bool:
+        return self._finished is not None
+
+    def status(self) -> dict:
+        with self._lock:
+            steps = {name: dict(progress) for name, progress in self._progress.items()}
+        finished = sum(progress["status"] in ("done", "failed", "skipped") for progress in steps.values())
+        elapsed = None
+        if self._started is not None:
+            elapsed = (self._finished or time.perf_counter()) - self._started
+        return {"ready": self.ready, "mode": self.mode, "progress": f"{finished}/{len(steps)}", "elapsed": elapsed,
+                "steps": steps}
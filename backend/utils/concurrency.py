@@ -0,0 +1,44 @@
+import asyncio
+import contextvars
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from backend.config import CALENDAR_MAX_WORKERS, CHAT_MAX_CONCURRENCY, CHAT_QUEUE_TIMEOUT
+
+# Google API calls are blocking (httplib2), so they run on a small dedicated
+# pool instead of the event loop or the default executor shared with FastAPI.
+calendar_executor = ThreadPoolExecutor(max_workers=CALENDAR_MAX_WORKERS, thread_name_prefix="calendar")
+
+async def run_blocking(fn, *args, executor=calendar_executor, **kwargs):
+    loop = asyncio.get_running_loop()
+    ctx = contextvars.copy_context()
+    return await loop.run_in_executor(executor, functools.partial(ctx.run, fn, *args, **kwargs))
+
+class QueueTimeout(Exception):
+    pass
+
+class ConcurrencyLimiter:
+    """Admit at most `limit` concurrent holders; others queue for up to `timeout` seconds."""
+
+    def __init__(self, limit: int, timeout: float):
+        self.limit = limit
+        self.timeout = timeout
+        self.active = 0
+        self.waiting = 0
+        self._semaphore = asyncio.Semaphore(limit)
+
+    async def __aenter__(self):
+        self.waiting += 1
+        try:
+            await asyncio.wait_for(self._semaphore.acquire(), self.timeout)
+        except asyncio.TimeoutError:
+            raise QueueTimeout(f"no capacity after waiting {self.timeout:.0f}s")
+        finally:
+            self.waiting -= 1
+        self.active += 1
+        return self
+
+    async def __aexit__(self, *exc):
+        self.active -= 1
+        self._semaphore.release()
+
+chat_limiter = ConcurrencyLimiter(CHAT_MAX_CONCURRENCY, CHAT_QUEUE_TIMEOUT)
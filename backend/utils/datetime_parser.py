@@ -0,0 +1,261 @@
+import os
+import re
+import threading
+from datetime import datetime, timedelta
+from functools import lru_cache
+from backend.config import DATEPARSER_CACHE_SIZE, DATEPARSER_BASE_BUCKET_SECONDS
+from backend.utils.time_utils import TZ_ABBREVIATIONS, get_timezone
+from backend.utils.tracing import span
+
+# Hand-written parser for the phrasings the agent actually sees ("tomorrow at
+# 3pm IST", "on July 10th at 15:30", "next Monday 10am"). Anything it does not
+# fully understand goes to dateparser behind a bounded LRU.
+
+_MONTHS = {
+    'january': 1, 'jan': 1, 'february': 2, 'feb': 2, 'march': 3, 'mar': 3, 'april': 4, 'apr': 4,
+    'may': 5, 'june': 6, 'jun': 6, 'july': 7, 'jul': 7, 'august': 8, 'aug': 8,
+    'september': 9, 'sept': 9, 'sep': 9, 'october': 10, 'oct': 10, 'november': 11, 'nov': 11,
+    'december': 12, 'dec': 12,
+}
+_WEEKDAYS = {
+    'monday': 0, 'mon': 0, 'tuesday': 1, 'tue': 1, 'tues': 1, 'wednesday': 2, 'wed': 2,
+    'thursday': 3, 'thu': 3, 'thurs': 3, 'friday': 4, 'fri': 4, 'saturday': 5, 'sat': 5,
+    'sunday': 6, 'sun': 6,
+}
+_MONTH = "(?P<month>" + "|".join(sorted(_MONTHS, key=len, reverse=True)) + r")\b\.?"
+_DAY = r"(?P<day>\d{1,2})(?:st|nd|rd|th)?\b"
+_YEAR = r"(?:,?\s+(?P<year>\d{4})\b)?"
+
+_SKIP = re.compile(r"(?:[\s,]+|(?:at|on|by|around)\b)")
+_RELATIVE_DAY = re.compile(r"(?P<rel>day after tomorrow|today|tomorrow)\b")
+_WEEKDAY = re.compile(r"(?:(?P<qual>next|this|coming)\s+)?(?P<weekday>" + "|".join(sorted(_WEEKDAYS, key=len, reverse=True)) + r")\b")
+_MONTH_DAY = re.compile(_MONTH + r"\s+" + _DAY + _YEAR)
+_DAY_MONTH = re.compile(_DAY + r"\s+(?:of\s+)?" + _MONTH + _YEAR)
+_ISO_DATE = re.compile(r"(?P<year>\d{4})-(?P<month>\d{1,2})-(?P<day>\d{1,2})\b")
+_ORDINAL_DAY = re.compile(r"the\s+(?P<day>\d{1,2})(?:st|nd|rd|th)\b")
+_TIME = re.compile(
+    r"(?:(?P<hour>\d{1,2})(?:[:.](?P<minute>\d{2}))?\s*(?P<ampm>am|pm|a\.m\.?|p\.m\.?)"
+    r"|(?P<h24>\d{1,2}):(?P<m24>\d{2})"
+    r"|(?P<word>noon|midnight))(?![\w])"
+)
+_TIMEZONE_WORDS = re.compile(
+    r"\b(?:(?:local|my) time|" + "|".join(abbr.lower() for abbr in TZ_ABBREVIATIONS) + r")\b"
+)
+
+_stats_lock = threading.Lock()
+_stats = {"fast_path": 0, "fallback": 0, "unparsed": 0}
+# What parser worker processes counted, merged in by merge_counters();
+# their cache sizes are kept per process ID.
+_worker_stats = {"fast_path": 0, "fallback": 0, "unparsed": 0, "cache_hits": 0, "cache_misses": 0}
+_worker_cache_sizes = {}
+
+def _count(key):
+    with _stats_lock:
+        _stats[key] += 1
+
+def _normalize(phrase: str) -> str:
+    # The timezone is resolved separately by extract_timezone(); left in the
+    # phrase, dateparser reads "IST" as Israel time.
+    return " ".join(_TIMEZONE_WORDS.sub(" ", phrase.lower()).split())
+
+def _date_from_match(kind, match, now):
+    """Return (date, keeps_current_time); raises ValueError for impossible dates."""
+    today = now.date()
+    if kind == "relative":
+        offset = {"today": 0, "tomorrow": 1, "day after tomorrow": 2}[match.group("rel")]
+        return today + timedelta(days=offset), True
+    if kind == "weekday":
+        days_ahead = (_WEEKDAYS[match.group("weekday")] - today.weekday()) % 7
+        if days_ahead == 0 and match.group("qual") != "this":
+            days_ahead = 7
+        return today + timedelta(days=days_ahead), False
+    if kind == "ordinal":
+        day = int(match.group("day"))
+        year, month = today.year, today.month
+        if day < today.day:
+            year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+        return datetime(year, month, day).date(), False
+    month = match.group("month")
+    month = int(month) if month.isdigit() else _MONTHS[month]
+    day = int(match.group("day"))
+    if match.group("year"):
+        return datetime(int(match.group("year")), month, day).date(), False
+    candidate = datetime(today.year, month, day).date()
+    if candidate < today:
+        candidate = datetime(today.year + 1, month, day).date()
+    return candidate, False
+
+def _time_from_match(match):
+    if match.group("word"):
+        return (12, 0) if match.group("word") == "noon" else (0, 0)
+    if match.group("h24") is not None:
+        hour, minute = int(match.group("h24")), int(match.group("m24"))
+    else:
+        hour, minute = int(match.group("hour")), int(match.group("minute") or 0)
+        if not 1 <= hour <= 12:
+            return None
+        hour = hour % 12 + (12 if match.group("ampm").startswith("p") else 0)
+    if hour > 23 or minute > 59:
+        return None
+    return hour, minute
+
+_DATE_PATTERNS = (
+    ("relative", _RELATIVE_DAY),
+    ("weekday", _WEEKDAY),
+    ("month_day", _MONTH_DAY),
+    ("day_month", _DAY_MONTH),
+    ("iso", _ISO_DATE),
+    ("ordinal", _ORDINAL_DAY),
+)
+
+def _match_date(text, pos):
+    for kind, pattern in _DATE_PATTERNS:
+        match = pattern.match(text, pos)
+        if match:
+            return kind, match
+    return None
+
+def fast_parse(phrase: str, timezone: str, now: datetime):
+    """Parse `phrase` without dateparser, or return None if any part of it is not understood."""
+    text = _normalize(phrase)
+    date_match = time_match = None
+    pos = 0
+    while pos < len(text):
+        skip = _SKIP.match(text, pos)
+        if skip and skip.end() > pos:
+            pos = skip.end()
+            continue
+        if date_match is None:
+            date_match = _match_date(text, pos)
+            if date_match:
+                pos = date_match[1].end()
+                continue
+        if time_match is None:
+            match = _TIME.match(text, pos)
+            if match:
+                time_match = match
+                pos = match.end()
+                continue
+        return None
+    if date_match is None and time_match is None:
+        return None
+    return _combine(date_match, time_match, timezone, now)
+
+def _combine(date_match, time_match, timezone, now):
+    try:
+        if date_match:
+            date, keeps_time = _date_from_match(*date_match, now)
+        else:
+            date, keeps_time = now.date(), True
+    except ValueError:
+        return None
+    if time_match:
+        hm = _time_from_match(time_match)
+        if hm is None:
+            return None
+        hour, minute, second = hm[0], hm[1], 0
+    elif keeps_time:
+        hour, minute, second = now.hour, now.minute, now.second
+    else:
+        hour = minute = second = 0
+    naive = datetime(date.year, date.month, date.day, hour, minute, second)
+    return get_timezone(timezone).localize(naive)
+
+def _first_match(pattern, text):
+    for match in pattern.finditer(text):
+        if match.start() == 0 or not text[match.start() - 1].isalnum():
+            return match
+    return None
+
+def find_datetime(text: str, timezone: str, now: datetime | None = None):
+    """The date and time of day mentioned anywhere in free text ("book lunch with Ana tomorrow at 1pm").
+
+    Unlike parse_datetime(), the rest of the text is ignored, and a time of
+    day is required. Returns None if there is no time or it is not valid.
+    """
+    if now is None:
+        now = datetime.now(get_timezone(timezone))
+    normalized = _normalize(text)
+    time_match = _first_match(_TIME, normalized)
+    if time_match is None:
+        return None
+    dates = [(kind, _first_match(pattern, normalized)) for kind, pattern in _DATE_PATTERNS]
+    dates = [(kind, match) for kind, match in dates
+             if match and (match.end() <= time_match.start() or match.start() >= time_match.end())]
+    date_match = min(dates, key=lambda item: item[1].start()) if dates else None
+    return _combine(date_match, time_match, timezone, now)
+
+@lru_cache(maxsize=DATEPARSER_CACHE_SIZE)
+def _dateparser_parse(phrase: str, timezone: str, base_bucket: int):
+    import dateparser
+    relative_base = datetime.fromtimestamp(base_bucket * DATEPARSER_BASE_BUCKET_SECONDS, get_timezone(timezone))
+    return dateparser.parse(
+        phrase,
+        settings={
+            "TIMEZONE": timezone,
+            "RETURN_AS_TIMEZONE_AWARE": True,
+            "PREFER_DATES_FROM": "future",
+            "RELATIVE_BASE": relative_base
+        }
+    )
+
+def parse_datetime(phrase: str, timezone: str, now: datetime | None = None):
+    """Parse a date/time phrase into an aware datetime in `timezone`, or None."""
+    if now is None:
+        now = datetime.now(get_timezone(timezone))
+    parsed = fast_parse(phrase, timezone, now)
+    if parsed is not None:
+        _count("fast_path")
+        return parsed
+    text = _normalize(phrase)
+    if not text:
+        _count("unparsed")
+        return None
+    _count("fallback")
+    # Keyed on the relative-base bucket so "in 2 hours" is not served from a
+    # stale base, while repeated phrases within a bucket hit the cache.
+    with span("dateparser"):
+        parsed = _dateparser_parse(text, timezone, int(now.timestamp() // DATEPARSER_BASE_BUCKET_SECONDS))
+    if parsed is None:
+        _count("unparsed")
+    return parsed
+
+def warm_up(timezone: str = "UTC"):
+    """Import dateparser and load its language data ahead of the first fallback parse."""
+    now = datetime.now(get_timezone(timezone))
+    _dateparser_parse.__wrapped__("in two weeks", timezone, int(now.timestamp() // DATEPARSER_BASE_BUCKET_SECONDS))
+
+def counters() -> dict:
+    """This process's own parse and cache counters."""
+    with _stats_lock:
+        stats = dict(_stats)
+    cache = _dateparser_parse.cache_info()
+    return dict(stats, cache_hits=cache.hits, cache_misses=cache.misses)
+
+def counters_since(before: dict) -> dict:
+    """What counters() moved since `before`, plus this process's ID and cache size, for merge_counters()."""
+    after = counters()
+    return dict({key: after[key] - before[key] for key in after}, pid=os.getpid(),
+                cache_size=_dateparser_parse.cache_info().currsize)
+
+def merge_counters(delta: dict):
+    """Add counters_since() from a worker process to this process's parser_stats()."""
+    with _stats_lock:
+        for key in _worker_stats:
+            _worker_stats[key] += delta[key]
+        _worker_cache_sizes[delta["pid"]] = delta["cache_size"]
+
+def parser_stats() -> dict:
+    """Parses by path and fallback cache use, in this process and merged from parser worker processes."""
+    own = counters()
+    with _stats_lock:
+        stats = {key: own[key] + _worker_stats[key] for key in own}
+        worker_cache_size = sum(_worker_cache_sizes.values())
+    hits, misses = stats.pop("cache_hits"), stats.pop("cache_misses")
+    cache = _dateparser_parse.cache_info()
+    total = stats["fast_path"] + stats["fallback"]
+    stats["fast_path_rate"] = stats["fast_path"] / total if total else 0.0
+    stats["cache"] = {"hits": hits, "misses": misses, "size": cache.currsize + worker_cache_size,
+                      "maxsize": cache.maxsize}
+    stats["cache_hit_rate"] = hits / (hits + misses) if hits + misses else 0.0
+    return stats
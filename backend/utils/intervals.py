@@ -0,0 +1,49 @@
+from datetime import datetime
+import numpy as np
+
+# Interval arithmetic on int64 epoch seconds, so thousands of busy blocks are
+# merged, inverted and intersected with a handful of numpy passes instead of
+# Python loops.
+
+def to_epoch(value) -> int:
+    if isinstance(value, datetime):
+        return int(value.timestamp())
+    return int(datetime.fromisoformat(value).timestamp())
+
+def busy_to_arrays(busy):
+    """freebusy-style [{"start": iso, "end": iso}, ...] -> (starts, ends) arrays."""
+    starts = np.fromiter((to_epoch(block["start"]) for block in busy), dtype=np.int64, count=len(busy))
+    ends = np.fromiter((to_epoch(block["end"]) for block in busy), dtype=np.int64, count=len(busy))
+    return starts, ends
+
+def merge_intervals(starts: np.ndarray, ends: np.ndarray):
+    """Union of [start, end) intervals, returned sorted and non-overlapping."""
+    if starts.size == 0:
+        return starts, ends
+    order = np.argsort(starts, kind="stable")
+    starts, ends = starts[order], ends[order]
+    running_end = np.maximum.accumulate(ends)
+    # A new merged interval begins wherever a start lies past everything before it.
+    new_group = np.empty(starts.size, dtype=bool)
+    new_group[0] = True
+    new_group[1:] = starts[1:] > running_end[:-1]
+    first = np.flatnonzero(new_group)
+    last = np.r_[first[1:] - 1, starts.size - 1]
+    return starts[first], running_end[last]
+
+def invert_intervals(starts: np.ndarray, ends: np.ndarray, window_start: int, window_end: int):
+    """Gaps of [window_start, window_end) not covered by merged intervals."""
+    gap_starts = np.r_[window_start, ends]
+    gap_ends = np.r_[starts, window_end]
+    gap_starts = np.maximum(gap_starts, window_start)
+    gap_ends = np.minimum(gap_ends, window_end)
+    keep = gap_ends > gap_starts
+    return gap_starts[keep], gap_ends[keep]
+
+def overlaps_any(starts: np.ndarray, ends: np.ndarray, window_starts: np.ndarray, window_ends: np.ndarray) -> np.ndarray:
+    """For each window, whether it overlaps any of the merged intervals."""
+    if starts.size == 0:
+        return np.zeros(window_starts.size, dtype=bool)
+    # The only candidate is the last interval starting before the window ends.
+    candidate = np.searchsorted(starts, window_ends, side="left") - 1
+    return (candidate >= 0) & (ends[np.maximum(candidate, 0)] > window_starts)
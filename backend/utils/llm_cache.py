@@ -0,0 +1,115 @@
+import hashlib
+import json
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from backend.config import LLM_CACHE_SIZE, LLM_CACHE_TTL, LLM_CACHE_PATH
+
+# Replies to these depend on when they are asked ("tomorrow", "in 2 hours",
+# "next friday"), so they are never served from the cache.
+_TIME_RELATIVE = re.compile(
+    r"\b(?:now|today|tonight|tomorrow|yesterday|day after tomorrow|this (?:morning|afternoon|evening|week|weekend|month)"
+    r"|next|last|coming|in \d+|\d+ (?:minutes?|hours?|days?|weeks?) (?:from now|ago)|later|soon"
+    r"|mon(?:day)?|tue(?:s|sday)?|wed(?:nesday)?|thu(?:rs|rsday)?|fri(?:day)?|sat(?:urday)?|sun(?:day)?)\b",
+    re.IGNORECASE,
+)
+_PUNCTUATION = re.compile(r"[^\w\s:/+\-@.]|\.(?=\s|$)")
+
+def normalize_text(text: str) -> str:
+    """Case, whitespace and trailing punctuation don't change the answer."""
+    return " ".join(_PUNCTUATION.sub(" ", str(text).lower()).split())
+
+def is_time_relative(text: str) -> bool:
+    return bool(_TIME_RELATIVE.search(text or ""))
+
+def cache_key(system_prompt: str, history, user_input: str, tool_result, pending_event=None) -> str:
+    parts = [
+        system_prompt,
+        [[msg.get("role"), normalize_text(msg.get("content", ""))] for msg in history or []],
+        normalize_text(user_input or ""),
+        None if tool_result is None else str(tool_result),
+        pending_event,
+    ]
+    return hashlib.sha256(json.dumps(parts).encode()).hexdigest()
+
+class ResponseCache:
+    """LLM replies keyed by cache_key(): an in-memory LRU with a TTL, backed
+    by an optional SQLite file so entries survive restarts.
+
+    `saved_seconds` adds up the LLM latency recorded for every hit.
+    """
+
+    def __init__(self, maxsize: int = LLM_CACHE_SIZE, ttl: float = LLM_CACHE_TTL, path: str | None = LLM_CACHE_PATH):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._db = None
+        self._stats = {"hits": 0, "disk_hits": 0, "misses": 0, "bypassed": 0, "saved_seconds": 0.0}
+        if path:
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            self._db.execute("CREATE TABLE IF NOT EXISTS llm_cache (key TEXT PRIMARY KEY, value TEXT, created REAL, latency REAL)")
+            self._db.commit()
+
+    @property
+    def enabled(self) -> bool:
+        return self.maxsize > 0
+
+    def bypass(self):
+        with self._lock:
+            self._stats["bypassed"] += 1
+
+    def get(self, key: str):
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and now - entry[1] > self.ttl:
+                del self._entries[key]
+                entry = None
+            if entry is None and self._db is not None:
+                row = self._db.execute("SELECT value, created, latency FROM llm_cache WHERE key = ?", (key,)).fetchone()
+                if row and now - row[1] <= self.ttl:
+                    entry = row
+                    self._store(key, entry)
+                    self._stats["disk_hits"] += 1
+            if entry is None:
+                self._stats["misses"] += 1
+                return None
+            self._entries.move_to_end(key)
+            self._stats["hits"] += 1
+            self._stats["saved_seconds"] += entry[2]
+            return entry[0]
+
+    def put(self, key: str, value: str, latency: float = 0.0):
+        entry = (value, time.time(), latency)
+        with self._lock:
+            self._store(key, entry)
+            if self._db is not None:
+                self._db.execute("INSERT OR REPLACE INTO llm_cache VALUES (?, ?, ?, ?)", (key, *entry))
+                self._db.execute("DELETE FROM llm_cache WHERE created < ?", (entry[1] - self.ttl,))
+                self._db.commit()
+
+    def _store(self, key, entry):
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM llm_cache")
+                self._db.commit()
+
+    def stats(self) -> dict:
+        with self._lock:
+            stats = dict(self._stats, size=len(self._entries), maxsize=self.maxsize, ttl=self.ttl,
+                         disk=self._db is not None)
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = stats["hits"] / lookups if lookups else 0.0
+        return stats
+
+llm_cache = ResponseCache()
@@ -0,0 +1,129 @@
+import math
+import threading
+
+# Prometheus text exposition without the client library: counters and
+# histograms updated in-process, plus collectors that turn the existing
+# stats() dicts into samples at scrape time.
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+TOKEN_BUCKETS = (16, 64, 128, 256, 512, 1024, 2048, 4096, 8192)
+
+def _labels(names, values) -> str:
+    if not names:
+        return ""
+    pairs = ",".join(f'{name}="{_escape(value)}"' for name, value in zip(names, values))
+    return "{" + pairs + "}"
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+def _number(value) -> str:
+    if value == math.inf:
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+class Counter:
+    def __init__(self, name: str, help: str, labels=()):
+        self.name, self.help, self.labels = name, help, tuple(labels)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1, **labels):
+        key = tuple(str(labels[name]) for name in self.labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def render(self):
+        with self._lock:
+            values = dict(self._values)
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        lines += [f"{self.name}{_labels(self.labels, key)} {_number(value)}" for key, value in sorted(values.items())]
+        return lines
+
+class Histogram:
+    def __init__(self, name: str, help: str, labels=(), buckets=LATENCY_BUCKETS):
+        self.name, self.help, self.labels = name, help, tuple(labels)
+        self.buckets = tuple(buckets) + (math.inf,)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels):
+        key = tuple(str(labels[name]) for name in self.labels)
+        with self._lock:
+            entry = self._values.get(key)
+            if entry is None:
+                entry = self._values[key] = [[0] * len(self.buckets), 0.0, 0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    entry[0][i] += 1
+                    break
+            entry[1] += value
+            entry[2] += 1
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {key: (list(entry[0]), entry[1], entry[2]) for key, entry in self._values.items()}
+
+    def since(self, before: dict) -> dict:
+        """Observations made since snapshot() returned `before`, in the form merge() takes."""
+        delta = {}
+        for key, (counts, total, count) in self.snapshot().items():
+            old_counts, old_total, old_count = before.get(key, ([0] * len(self.buckets), 0.0, 0))
+            if count != old_count:
+                delta[key] = ([new - old for new, old in zip(counts, old_counts)], total - old_total, count - old_count)
+        return delta
+
+    def merge(self, delta: dict):
+        """Add observations made elsewhere (another process's since())."""
+        with self._lock:
+            for key, (counts, total, count) in delta.items():
+                entry = self._values.get(key)
+                if entry is None:
+                    entry = self._values[key] = [[0] * len(self.buckets), 0.0, 0]
+                entry[0] = [old + new for old, new in zip(entry[0], counts)]
+                entry[1] += total
+                entry[2] += count
+
+    def render(self):
+        values = self.snapshot()
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        for key, (counts, total, count) in sorted(values.items()):
+            cumulative = 0
+            for bound, bucket in zip(self.buckets, counts):
+                cumulative += bucket
+                lines.append(f"{self.name}_bucket{_labels(self.labels + ('le',), key + (_number(bound),))} {cumulative}")
+            lines.append(f"{self.name}_sum{_labels(self.labels, key)} {_number(total)}")
+            lines.append(f"{self.name}_count{_labels(self.labels, key)} {count}")
+        return lines
+
+class MetricsRegistry:
+    def __init__(self):
+        self._metrics = []
+        self._collectors = []
+
+    def counter(self, name: str, help: str, labels=()) -> Counter:
+        metric = Counter(name, help, labels)
+        self._metrics.append(metric)
+        return metric
+
+    def histogram(self, name: str, help: str, labels=(), buckets=LATENCY_BUCKETS) -> Histogram:
+        metric = Histogram(name, help, labels, buckets)
+        self._metrics.append(metric)
+        return metric
+
+    def register_collector(self, collect):
+        """`collect()` returns (name, type, help, [(labels dict, value), ...]) tuples, read on every scrape."""
+        self._collectors.append(collect)
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics:
+            lines += metric.render()
+        for collect in self._collectors:
+            for name, kind, help, samples in collect():
+                lines += [f"# HELP {name} {help}", f"# TYPE {name} {kind}"]
+                lines += [f"{name}{_labels(tuple(labels), tuple(labels.values()))} {_number(value)}"
+                          for labels, value in samples]
+        return "\n".join(lines) + "\n"
+
+metrics = MetricsRegistry()
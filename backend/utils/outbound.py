@@ -0,0 +1,211 @@
+import asyncio
+import copy
+import random
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from email.utils import parsedate_to_datetime
+from backend.config import OUTBOUND_MAX_RETRIES, OUTBOUND_BACKOFF_BASE, OUTBOUND_BACKOFF_MAX, OUTBOUND_MAX_RETRY_AFTER
+
+# Rate limiting, retries and request coalescing for calls to upstream APIs
+# (OpenRouter, Google Calendar). One OutboundScheduler per upstream; its
+# buckets are shared by every request thread and the event loop.
+
+class TokenBucket:
+    """`rate` tokens per second, at most `burst` saved up (rate 0 = unlimited)."""
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = max(1, burst)
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self, tokens: int = 1) -> float:
+        """Take `tokens` and return how many seconds to wait before using them.
+
+        The balance may go negative, so concurrent callers queue up behind
+        each other instead of all waking at once.
+        """
+        if self.rate <= 0:
+            return 0.0
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= tokens
+            return max(0.0, -self._tokens / self.rate)
+
+def parse_retry_after(value):
+    """Seconds from a Retry-After header (delta-seconds or HTTP date), or None."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+def default_classify(error):
+    """(retryable, retry_after) for an exception from an HTTP client.
+
+    429 and 5xx are retried, honoring Retry-After; other statuses are not.
+    Errors without a status are retried if they are connection failures.
+    """
+    if getattr(error, "resp", None) is not None:
+        # googleapiclient HttpError: httplib2 response, a dict of lowercase headers
+        status, headers = error.resp.status, error.resp
+    else:
+        status = getattr(error, "status_code", None)
+        headers = getattr(getattr(error, "response", None), "headers", None)
+    if status is None:
+        return isinstance(error, (ConnectionError, TimeoutError)), None
+    status = int(status)
+    if status == 429 or status >= 500:
+        return True, parse_retry_after((headers or {}).get("retry-after"))
+    return False, None
+
+_schedulers = []
+
+class OutboundScheduler:
+    """Token buckets, retries and coalescing for one upstream.
+
+    Every attempt takes a token from the upstream bucket and from the bucket
+    of each key it touches (e.g. calendar IDs, `key_rate` per key). Failures
+    that `classify` deems retryable are retried up to `max_retries` times
+    after a full-jitter exponential backoff, or after Retry-After when the
+    server sends one (capped at `max_retry_after`).
+    """
+
+    def __init__(self, name: str, rate: float, burst: int, key_rate: float = 0, key_burst: int = 1,
+                 classify=default_classify, max_retries: int = OUTBOUND_MAX_RETRIES,
+                 backoff_base: float = OUTBOUND_BACKOFF_BASE, backoff_max: float = OUTBOUND_BACKOFF_MAX,
+                 max_retry_after: float = OUTBOUND_MAX_RETRY_AFTER, max_keys: int = 10000):
+        self.name = name
+        self.bucket = TokenBucket(rate, burst)
+        self.key_rate = key_rate
+        self.key_burst = key_burst
+        self.classify = classify
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.max_retry_after = max_retry_after
+        self.max_keys = max_keys
+        self._key_buckets = OrderedDict()
+        self._inflight = {}
+        self._lock = threading.Lock()
+        self._stats = {"attempts": 0, "retries": 0, "failures": 0, "throttled_seconds": 0.0, "backoff_seconds": 0.0,
+                       "coalesced": 0}
+        _schedulers.append(self)
+
+    def _key_bucket(self, key) -> TokenBucket:
+        bucket = self._key_buckets.get(key)
+        if bucket is None:
+            bucket = self._key_buckets[key] = TokenBucket(self.key_rate, self.key_burst)
+            while len(self._key_buckets) > self.max_keys:
+                self._key_buckets.popitem(last=False)
+        self._key_buckets.move_to_end(key)
+        return bucket
+
+    def reserve(self, keys=(), tokens: int = 1) -> float:
+        """Take tokens for one attempt and return the seconds to wait before sending it."""
+        wait = self.bucket.reserve(tokens)
+        if self.key_rate > 0:
+            with self._lock:
+                buckets = [self._key_bucket(key) for key in keys]
+            wait = max([wait] + [bucket.reserve(tokens) for bucket in buckets])
+        with self._lock:
+            self._stats["attempts"] += 1
+            self._stats["throttled_seconds"] += wait
+        return wait
+
+    def throttle(self, keys=(), tokens: int = 1):
+        wait = self.reserve(keys, tokens)
+        if wait:
+            time.sleep(wait)
+
+    def backoff(self, attempt: int, retry_after=None) -> float:
+        delay = random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+        if retry_after is not None:
+            delay = max(delay, min(retry_after, self.max_retry_after))
+        with self._lock:
+            self._stats["backoff_seconds"] += delay
+        return delay
+
+    def _should_retry(self, error, attempt: int):
+        """Backoff delay before the next attempt, or None to give up."""
+        retryable, retry_after = self.classify(error)
+        with self._lock:
+            if not retryable or attempt >= self.max_retries:
+                self._stats["failures"] += 1
+                return None
+            self._stats["retries"] += 1
+        return self.backoff(attempt, retry_after)
+
+    def call(self, fn, keys=(), tokens: int = 1):
+        """Run the blocking `fn()` under the rate limits, retrying retryable failures."""
+        attempt = 0
+        while True:
+            self.throttle(keys, tokens)
+            try:
+                return fn()
+            except Exception as error:
+                delay = self._should_retry(error, attempt)
+                if delay is None:
+                    raise
+            time.sleep(delay)
+            attempt += 1
+
+    async def acall(self, fn, keys=(), tokens: int = 1, on_retry=None):
+        """Async call(): `fn()` returns an awaitable, and waits don't block the event loop.
+
+        `on_retry()`, if given, runs before each retried attempt.
+        """
+        attempt = 0
+        while True:
+            wait = self.reserve(keys, tokens)
+            if wait:
+                await asyncio.sleep(wait)
+            try:
+                return await fn()
+            except Exception as error:
+                delay = self._should_retry(error, attempt)
+                if delay is None:
+                    raise
+            await asyncio.sleep(delay)
+            if on_retry is not None:
+                on_retry()
+            attempt += 1
+
+    def coalesce(self, key, fn):
+        """Run `fn()` once for concurrent callers with the same `key`; the others get a copy of its result."""
+        with self._lock:
+            future = self._inflight.get(key)
+            owner = future is None
+            if owner:
+                future = self._inflight[key] = Future()
+            else:
+                self._stats["coalesced"] += 1
+        if not owner:
+            return copy.deepcopy(future.result())
+        try:
+            result = fn()
+            future.set_result(result)
+            return result
+        except BaseException as error:
+            future.set_exception(error)
+            raise
+        finally:
+            with self._lock:
+                del self._inflight[key]
+
+    def stats(self) -> dict:
+        with self._lock:
+            return dict(self._stats, keys=len(self._key_buckets), inflight=len(self._inflight))
+
+def outbound_stats() -> dict:
+    return {scheduler.name: scheduler.stats() for scheduler in _schedulers}
@@ -0,0 +1,141 @@
+import re
+from functools import lru_cache
+import pytz
+
+DEFAULT_TIMEZONE = "Asia/Kolkata"
+
+# Set lookup instead of scanning the pytz.all_timezones list.
+ALL_TIMEZONES = frozenset(pytz.all_timezones)
+
+TZ_ABBREVIATIONS = {
+    'IST': 'Asia/Kolkata',
+    'PST': 'US/Pacific',
+    'PDT': 'US/Pacific',
+    'EST': 'US/Eastern',
+    'EDT': 'US/Eastern',
+    'CST': 'US/Central',
+    'CDT': 'US/Central',
+    'MST': 'US/Mountain',
+    'MDT': 'US/Mountain',
+    'BST': 'Europe/London',
+    'CET': 'Europe/Paris',
+    'EET': 'Europe/Athens',
+    'JST': 'Asia/Tokyo',
+    'AEST': 'Australia/Sydney',
+    'AEDT': 'Australia/Sydney',
+    'GMT': 'Etc/GMT',
+    'UTC': 'UTC',
+}
+
+# Names people use that are not the last component of a zone name.
+TZ_ALIASES = {
+    'india': 'Asia/Kolkata',
+    'mumbai': 'Asia/Kolkata',
+    'delhi': 'Asia/Kolkata',
+    'new delhi': 'Asia/Kolkata',
+    'bangalore': 'Asia/Kolkata',
+    'bengaluru': 'Asia/Kolkata',
+    'san francisco': 'America/Los_Angeles',
+    'seattle': 'America/Los_Angeles',
+    'boston': 'America/New_York',
+    'washington': 'America/New_York',
+    'eastern time': 'US/Eastern',
+    'central time': 'US/Central',
+    'mountain time': 'US/Mountain',
+    'pacific time': 'US/Pacific',
+    'beijing': 'Asia/Shanghai',
+}
+
+# Zone names and city components that are also everyday English words.
+_ALIAS_STOPWORDS = {
+    'met', 'universal', 'factory', 'center', 'wake', 'midway', 'easter', 'christmas',
+    'general', 'troll', 'palmer', 'davis', 'casey', 'stanley', 'regina', 'nome',
+    'north', 'south', 'east', 'west', 'central', 'eastern', 'pacific', 'mountain',
+}
+_CITY_REGIONS = {'Africa', 'America', 'Antarctica', 'Arctic', 'Asia', 'Atlantic', 'Australia', 'Europe', 'Indian', 'Pacific'}
+# Bare city and single-word zone names are also people ("Sofia", "Victoria"),
+# projects ("Phoenix") and words ("turkey", "wet"), so they only count next
+# to one of these.
+_PLACE_SUFFIXES = ('time', 'timezone', 'office')
+
+_LOCAL_TIME = re.compile(r'\b(local|my) time\b', re.IGNORECASE)
+_TOKEN = re.compile(r"[a-z0-9]+|[/+\-]")
+_END = None  # trie key marking a complete phrase
+
+def _tokenize(text: str):
+    return _TOKEN.findall(text.lower())
+
+class TimezoneIndex:
+    """Token trie over zone names, city aliases and abbreviations.
+
+    Every phrase maps to (tier, zone). A lookup walks the trie once from each
+    token of the input and keeps the best match: lower tier first, then the
+    leftmost, then the longest. Matching whole tokens means "meet" no longer
+    matches the "EET" zone.
+    """
+
+    def __init__(self):
+        self._root = {}
+
+    def add(self, phrase: str, zone: str, tier: int):
+        tokens = _tokenize(phrase)
+        if not tokens:
+            return
+        node = self._root
+        for token in tokens:
+            node = node.setdefault(token, {})
+        if _END not in node or node[_END][0] > tier:
+            node[_END] = (tier, zone)
+
+    def find(self, text: str):
+        tokens = _tokenize(text)
+        best_key, best_zone = None, None
+        for start in range(len(tokens)):
+            node = self._root
+            for end in range(start, len(tokens)):
+                node = node.get(tokens[end])
+                if node is None:
+                    break
+                entry = node.get(_END)
+                if entry is not None:
+                    key = (entry[0], start, start - end)
+                    if best_key is None or key < best_key:
+                        best_key, best_zone = key, entry[1]
+        return best_zone
+
+def _build_index() -> TimezoneIndex:
+    index = TimezoneIndex()
+    for abbr, zone in TZ_ABBREVIATIONS.items():
+        index.add(abbr, zone, tier=0)
+    for zone in pytz.all_timezones:
+        name = zone.replace('_', ' ')
+        region, _, city = name.rpartition('/')
+        if region:
+            # Full names ("Europe/Berlin") are unambiguous.
+            index.add(name, zone, tier=1)
+        if (not region or region.split('/')[0] in _CITY_REGIONS) and city.lower() not in _ALIAS_STOPWORDS:
+            for suffix in _PLACE_SUFFIXES:
+                index.add(f"{city} {suffix}", zone, tier=1)
+    for alias, zone in TZ_ALIASES.items():
+        index.add(alias, zone, tier=1)
+    return index
+
+_INDEX = _build_index()
+
+def is_valid_timezone(name) -> bool:
+    return name in ALL_TIMEZONES
+
+@lru_cache(maxsize=None)
+def get_timezone(name: str):
+    return pytz.timezone(name)
+
+def warm_up():
+    """Load the zones the parsers use most (the default and the abbreviations' targets)."""
+    for name in {DEFAULT_TIMEZONE, *TZ_ABBREVIATIONS.values()}:
+        get_timezone(name)
+
+def extract_timezone(text: str) -> str:
+    """Return the IANA zone named in `text`, or DEFAULT_TIMEZONE."""
+    if _LOCAL_TIME.search(text):
+        return DEFAULT_TIMEZONE
+    return _INDEX.find(text) or DEFAULT_TIMEZONE
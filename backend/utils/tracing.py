@@ -0,0 +1,118 @@
+import contextlib
+import contextvars
+import json
+import logging
+import time
+import uuid
+from backend.config import LOG_LEVEL, LOG_FORMAT
+from backend.utils.metrics import metrics
+
+# Every HTTP request gets a trace ID (the caller's X-Request-ID, or a new
+# one) that is attached to its log lines and echoed as X-Trace-ID. It lives
+# in a context variable, so it follows the request into LangGraph nodes and
+# onto the calendar executor (run_blocking copies the context).
+trace_id_var = contextvars.ContextVar("trace_id", default=None)
+
+logger = logging.getLogger("backend.tracing")
+
+SPAN_SECONDS = metrics.histogram("agent_span_seconds", "Duration of traced operations.", ("span", "status"))
+HTTP_SECONDS = metrics.histogram("agent_http_request_seconds", "HTTP request latency.", ("method", "route", "status"))
+
+def new_trace_id() -> str:
+    return uuid.uuid4().hex[:16]
+
+def current_trace_id():
+    return trace_id_var.get()
+
+@contextlib.contextmanager
+def span(name: str, **fields):
+    """Time a block into agent_span_seconds{span=name} and log it at DEBUG.
+
+    Yields `fields`, so the block can attach values known only at the end
+    (token counts, result sizes); they go to the log line, not the metric.
+    """
+    started = time.perf_counter()
+    status = "ok"
+    try:
+        yield fields
+    except BaseException:
+        status = "error"
+        raise
+    finally:
+        seconds = time.perf_counter() - started
+        SPAN_SECONDS.observe(seconds, span=name, status=status)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("span", extra={"span": name, "status": status, "duration_ms": round(1000 * seconds, 2), **fields})
+
+class TraceMiddleware:
+    """ASGI middleware that assigns the trace ID and records request latency."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        headers = dict(scope["headers"])
+        trace_id = headers.get(b"x-request-id", b"").decode("latin-1")[:64] or new_trace_id()
+        token = trace_id_var.set(trace_id)
+        started = time.perf_counter()
+        status = 500
+
+        async def send_with_trace(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                message["headers"] = list(message.get("headers", [])) + [(b"x-trace-id", trace_id.encode("latin-1"))]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_trace)
+        finally:
+            seconds = time.perf_counter() - started
+            # The route template, not the raw path, keeps label cardinality bounded.
+            route = getattr(scope.get("route"), "path", "unmatched")
+            HTTP_SECONDS.observe(seconds, method=scope["method"], route=route, status=status)
+            logger.info("request", extra={"method": scope["method"], "route": route, "status": status,
+                                          "duration_ms": round(1000 * seconds, 2)})
+            trace_id_var.reset(token)
+
+# LogRecord attributes that are not caller-supplied `extra` fields.
+_RESERVED = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime", "trace_id"}
+
+class TraceIdFilter(logging.Filter):
+    def filter(self, record):
+        record.trace_id = trace_id_var.get()
+        return True
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record):
+        entry = {"ts": round(record.created, 3), "level": record.levelname, "logger": record.name,
+                 "msg": record.getMessage(), "trace_id": getattr(record, "trace_id", None)}
+        entry.update((key, value) for key, value in vars(record).items() if key not in _RESERVED)
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+class TextFormatter(logging.Formatter):
+    def format(self, record):
+        fields = " ".join(f"{key}={value}" for key, value in vars(record).items() if key not in _RESERVED)
+        line = (f"{self.formatTime(record)} {record.levelname} {record.name} [{getattr(record, 'trace_id', None) or '-'}] "
+                f"{record.getMessage()}{' ' + fields if fields else ''}")
+        if record.exc_info:
+            line += "\n" + self.formatException(record.exc_info)
+        return line
+
+def configure_logging(level: str = LOG_LEVEL, fmt: str = LOG_FORMAT):
+    """Send the backend's loggers to stderr as JSON or text lines tagged with the trace ID."""
+    root = logging.getLogger("backend")
+    if any(getattr(handler, "_backend_handler", False) for handler in root.handlers):
+        return
+    handler = logging.StreamHandler()
+    handler._backend_handler = True
+    handler.addFilter(TraceIdFilter())
+    handler.setFormatter(TextFormatter() if fmt == "text" else JsonFormatter())
+    root.addHandler(handler)
+    root.setLevel(level)
+    root.propagate = False
@@ -0,0 +1,46 @@
+"""Per-request overhead of building the agent vs reusing the shared one.
+
+Run from the repository root:
+    python -m benchmarks.bench_agent_reuse
+
+Uses the "ping" turn, which never reaches OpenRouter, so the numbers are the
+pure cost of constructing ChatOpenAI + compiling the StateGraph per request.
+TLS handshakes saved by reusing the client's connection pool are not included.
+"""
+import asyncio
+import os
+import statistics
+import time
+import uuid
+
+os.environ.setdefault("OPENROUTER_API_KEY", "bench-key")
+
+from backend.services.agent_service import create_agent
+from backend.services.agent_registry import get_agent, reset_agent
+from backend.services.session_store import session_store
+
+STATE = {"input": "ping", "output": "", "tool_name": None, "tool_args": None, "tool_result": None}
+
+def run(label, factory, requests=200):
+    timings = []
+    for _ in range(requests):
+        start = time.perf_counter()
+        # A new session per request, as for a first /chat turn.
+        config = {"configurable": {"thread_id": uuid.uuid4().hex}}
+        asyncio.run(factory().ainvoke(dict(STATE), config))
+        timings.append((time.perf_counter() - start) * 1000)
+    timings.sort()
+    print(f"{label:<28} mean={statistics.mean(timings):7.3f} ms  "
+          f"p50={timings[len(timings) // 2]:7.3f} ms  p95={timings[int(len(timings) * 0.95)]:7.3f} ms")
+    return statistics.mean(timings)
+
+def main():
+    reset_agent()
+    get_agent()  # warm the shared instance, as the first request on a worker would
+    # Built like get_agent() builds the shared one, so only the reuse differs.
+    before = run("create_agent() per request", lambda: create_agent(checkpointer=session_store))
+    after = run("shared get_agent()", get_agent)
+    print(f"per-request overhead removed: {before - after:.3f} ms ({before / after:.1f}x)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""freebusy calls and wall time: one query per window/calendar vs the batched API.
+
+Run from the repository root:
+    python -m benchmarks.bench_batch_availability [--rtt 0.08]
+
+The Calendar API is replaced by a stub that sleeps --rtt seconds per call.
+The attendee calendars are configured for the tenant the queries run as.
+"""
+import argparse
+import time
+from datetime import datetime, timedelta, timezone
+
+from benchmarks.fakes import FakeChatModel  # noqa: F401  (sets offline env defaults)
+
+from backend.services import availability_service
+from backend.services.tenants import DEFAULT_TENANT, use_tenant
+
+CALENDARS = [f"attendee{i}@example.com" for i in range(5)]
+
+def make_stub(rtt, counter):
+    def query_freebusy(start_time, end_time, calendar_ids):
+        counter.append(len(calendar_ids))
+        time.sleep(rtt)
+        return {calendar_id: {"busy": []} for calendar_id in calendar_ids}
+    return query_freebusy
+
+def main(rtt):
+    start = datetime(2026, 11, 2, 9, tzinfo=timezone.utc)
+    windows = [{"start_time": (start + timedelta(days=d, hours=h)).isoformat(),
+                "end_time": (start + timedelta(days=d, hours=h, minutes=30)).isoformat()}
+               for d in range(6) for h in range(6)]
+
+    use_tenant(DEFAULT_TENANT._replace(id="bench", calendar_ids=tuple(CALENDARS)))
+    calls = []
+    availability_service.query_freebusy = make_stub(rtt, calls)
+    t0 = time.perf_counter()
+    for window in windows:
+        for calendar_id in CALENDARS:
+            availability_service.check_availability_batch([window], [calendar_id])
+    one_by_one = time.perf_counter() - t0
+    print(f"one query per window x calendar: {len(calls):4d} freebusy calls, {one_by_one:6.2f} s")
+
+    calls.clear()
+    t0 = time.perf_counter()
+    result = availability_service.check_availability_batch(windows, CALENDARS)
+    batched = time.perf_counter() - t0
+    print(f"batched:                         {len(calls):4d} freebusy calls, {batched:6.2f} s "
+          f"({len(windows)} windows x {len(CALENDARS)} calendars -> {len(result['busy'])}x{len(result['calendars'])} matrix)")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rtt", type=float, default=0.08)
+    main(parser.parse_args().rtt)
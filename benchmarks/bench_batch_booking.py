@@ -0,0 +1,74 @@
+"""Booking throughput: one events.insert per event vs Calendar batch requests.
+
+Run from the repository root:
+    python -m benchmarks.bench_batch_booking [--events 200] [--latency 0.05]
+
+Both runs go over HTTP to benchmarks.fake_calendar, which sleeps --latency
+seconds per HTTP request. The batched run is then repeated to show that
+resubmitting the same events books nothing twice, then again after a few of
+them were deleted upstream (those are booked again), and a batch is sent
+through a dropped connection.
+"""
+import argparse
+import time
+from datetime import datetime, timedelta, timezone
+
+from benchmarks.fakes import FakeChatModel  # noqa: F401  (sets offline env defaults)
+from benchmarks.fake_calendar import FakeCalendar
+
+def make_events(count, prefix):
+    start = datetime(2026, 11, 2, 9, tzinfo=timezone.utc)
+    return [{"start_time": (start + timedelta(minutes=30 * i)).isoformat(),
+             "end_time": (start + timedelta(minutes=30 * i + 30)).isoformat(),
+             "summary": f"{prefix} {i}"} for i in range(count)]
+
+def main(count, latency):
+    calendar = FakeCalendar(latency=latency)
+    from backend.services import google_calendar_service as gcal
+
+    with calendar.running():
+        events = make_events(count, "Sequential")
+        before = calendar.requests
+        t0 = time.perf_counter()
+        for event in events:
+            gcal.create_event(event["start_time"], event["end_time"], event["summary"])
+        sequential = time.perf_counter() - t0
+        print(f"sequential inserts: {calendar.requests - before:4d} HTTP calls, {sequential:6.2f} s, "
+              f"{count / sequential:7.1f} events/s")
+
+        events = make_events(count, "Batched")
+        before = calendar.requests
+        t0 = time.perf_counter()
+        results = gcal.create_events_batch(events)
+        batched = time.perf_counter() - t0
+        created = sum(result["status"] == "created" for result in results)
+        print(f"batched inserts:    {calendar.requests - before:4d} HTTP calls, {batched:6.2f} s, "
+              f"{count / batched:7.1f} events/s ({created} created, {sequential / batched:.1f}x faster)")
+
+        results = gcal.create_events_batch(events)
+        statuses = {status: sum(r["status"] == status for r in results) for status in ("created", "exists", "error")}
+        print(f"resubmitted batch:  {statuses}")
+        assert statuses["exists"] == count
+
+        deleted = [result["event_id"] for result in results[:3]]
+        for event_id in deleted:
+            calendar.store.delete(calendar.calendar_id, event_id)
+        results = gcal.create_events_batch(events)
+        statuses = {status: sum(r["status"] == status for r in results) for status in ("created", "exists", "error")}
+        live = calendar.store.events[calendar.calendar_id]
+        print(f"after deleting 3:   {statuses}, rebooked on the calendar: "
+              f"{all(results[i]['event_id'] in live for i in range(3))}")
+        assert statuses["created"] == 3 and all(results[i]["event_id"] in live for i in range(3))
+
+        calendar.faults = [(0, {})]
+        results = gcal.create_events_batch(make_events(10, "Dropped"))
+        statuses = {status: sum(r["status"] == status for r in results) for status in ("created", "exists", "error")}
+        print(f"dropped connection: {statuses}")
+        assert statuses["created"] + statuses["exists"] == 10
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--events", type=int, default=200)
+    parser.add_argument("--latency", type=float, default=0.05)
+    args = parser.parse_args()
+    main(args.events, args.latency)
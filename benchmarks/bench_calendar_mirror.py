@@ -0,0 +1,116 @@
+"""Availability read latency from the local calendar mirror vs live freebusy.
+
+Run from the repository root:
+    python -m benchmarks.bench_calendar_mirror [--events 2000] [--reads 200] [--calendar-latency 0.05]
+
+Fills the local Calendar stub with --events busy blocks over the next 60
+days, plus all-day events (placed in the calendar's zone, Asia/Kolkata) and
+events the owner declined, mirrors it into SQLite, and answers the same
+random windows, and windows around the all-day events' edges, from the
+mirror and from freebusy (each HTTP call takes --calendar-latency seconds),
+checking that both agree. Then adds, deletes and books events to show the
+incremental sync and write-through keeping the mirror current.
+"""
+import argparse
+import random
+import time
+from datetime import datetime, timedelta, timezone
+
+import pytz
+
+from benchmarks.fakes import FakeChatModel  # noqa: F401  (sets the backend's env defaults)
+from benchmarks.fake_calendar import FakeCalendar
+
+def percentile(values, pct):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * pct))]
+
+def iso(dt):
+    return dt.isoformat()
+
+def main(events, reads, calendar_latency):
+    calendar = FakeCalendar(latency=calendar_latency)
+    from backend.services import google_calendar_service as gcal
+    from backend.services.calendar_mirror import CalendarMirror
+
+    rng = random.Random(7)
+    now = datetime.now(timezone.utc).replace(minute=0, second=0, microsecond=0)
+    for _ in range(events):
+        start = now + timedelta(hours=rng.randint(1, 60 * 24), minutes=rng.choice([0, 15, 30, 45]))
+        calendar.store.add_busy(calendar.calendar_id, iso(start), iso(start + timedelta(minutes=rng.choice([15, 30, 60, 120]))),
+                                declined=rng.random() < 0.1)
+    windows = []
+    for _ in range(reads):
+        start = now + timedelta(hours=rng.randint(1, 59 * 24))
+        windows.append((iso(start), iso(start + timedelta(hours=rng.choice([1, 8, 24])))))
+    # All-day events, some declined, and windows straddling their local midnights.
+    zone = pytz.timezone(calendar.store.time_zone)
+    today = datetime.now(zone).date()
+    for _ in range(max(1, events // 100)):
+        day = today + timedelta(days=rng.randint(2, 58))
+        length = rng.choice([1, 1, 2])
+        calendar.store.add_all_day(calendar.calendar_id, day.isoformat(), (day + timedelta(days=length)).isoformat(),
+                                   declined=rng.random() < 0.2)
+        for edge in (day, day + timedelta(days=length)):
+            midnight = zone.localize(datetime.combine(edge, datetime.min.time()))
+            windows.append((iso(midnight - timedelta(hours=2)), iso(midnight + timedelta(hours=2))))
+
+    with calendar.running():
+        mirror = CalendarMirror(calendar_id=calendar.calendar_id, path=":memory:", max_staleness=3600)
+        started = time.perf_counter()
+        mirror.sync()
+        print(f"initial full sync: {events} events in {1000 * (time.perf_counter() - started):.0f} ms")
+
+        live, live_busy = [], []
+        for start, end in windows:
+            t0 = time.perf_counter()
+            live_busy.append(gcal.query_freebusy(start, end, [calendar.calendar_id])[calendar.calendar_id]["busy"])
+            live.append(time.perf_counter() - t0)
+        gcal.set_mirror(mirror)
+        local, mismatches = [], 0
+        for (start, end), expected in zip(windows, live_busy):
+            t0 = time.perf_counter()
+            busy = gcal.query_freebusy(start, end, [calendar.calendar_id])[calendar.calendar_id]["busy"]
+            local.append(time.perf_counter() - t0)
+            merged = [(block["start"], block["end"]) for block in busy]
+            # freebusy returns overlapping blocks as they are; compare covered time.
+            mismatches += _covered(merged) != _covered([(block["start"], block["end"]) for block in expected])
+        for name, samples in (("live freebusy", live), ("mirror", local)):
+            print(f"{name:13s}: p50 {1000 * percentile(samples, 0.5):7.2f} ms, p95 {1000 * percentile(samples, 0.95):7.2f} ms")
+        print(f"answers differing from freebusy: {mismatches}/{len(windows)}")
+        assert not mismatches
+
+        # Past the generated events, so these checks see only their own event.
+        start = now + timedelta(days=70)
+        added = calendar.store.add_busy(calendar.calendar_id, iso(start), iso(start + timedelta(hours=1)))
+        mirror.sync()
+        print(f"event added upstream visible after incremental sync: {bool(mirror.busy(iso(start), iso(start + timedelta(hours=1))))}")
+        calendar.store.delete(calendar.calendar_id, added)
+        mirror.sync()
+        print(f"event deleted upstream dropped after incremental sync: {not mirror.busy(iso(start), iso(start + timedelta(hours=1)))}")
+        booked = now + timedelta(days=75)
+        calls = calendar.store.calls["events.list"]
+        gcal.create_event(iso(booked), iso(booked + timedelta(minutes=30)), "Mirror check")
+        print(f"booking visible without a sync (write-through): {bool(mirror.busy(iso(booked), iso(booked + timedelta(minutes=30))))}, "
+              f"events.list calls since: {calendar.store.calls['events.list'] - calls}")
+        gcal.set_mirror(None)
+        print(f"mirror stats: {mirror.stats()}")
+
+def _covered(blocks):
+    seconds, end = 0.0, None
+    for block_start, block_end in sorted((datetime.fromisoformat(s), datetime.fromisoformat(e)) for s, e in blocks):
+        if end is None or block_start > end:
+            seconds += (block_end - block_start).total_seconds()
+            end = block_end
+        elif block_end > end:
+            seconds += (block_end - end).total_seconds()
+            end = block_end
+    return seconds
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--events", type=int, default=2000)
+    parser.add_argument("--reads", type=int, default=200)
+    parser.add_argument("--calendar-latency", type=float, default=0.05)
+    args = parser.parse_args()
+    main(args.events, args.reads, args.calendar_latency)
@@ -0,0 +1,105 @@
+"""Import-time profile of backend.main and time to first request from a cold process.
+
+Run from the repository root:
+    python -m benchmarks.bench_cold_start [--runs 3] [--top 12]
+
+The profile runs `python -X importtime -c "import backend.main"` in a fresh
+interpreter and sums self time by top-level package, then does the same for
+the modules the warm-up loads later. The cold-start part spawns
+`uvicorn backend.main:app` against the local Calendar stub once per
+STARTUP_WARMUP mode and reports, from process start: when the port answers
+/healthz, when /readyz turns 200, and when the first chat turn ("am I free
+tomorrow at 3pm?", routed without the LLM) is answered when it is sent as
+soon as the port is open. A second spawn per mode waits for /readyz and
+then times the first chat turn on its own.
+"""
+import argparse
+import os
+import subprocess
+import sys
+import time
+from collections import defaultdict
+
+import requests
+
+from benchmarks import fakes  # noqa: F401  (environment defaults)
+from benchmarks.fake_calendar import FakeCalendar
+from benchmarks.harness import free_port
+
+ROOT = os.path.join(os.path.dirname(__file__), "..")
+WARMED = ("langgraph.graph", "langchain_openai", "dateparser", "googleapiclient.discovery",
+          "google_auth_httplib2", "backend.services.session_store")
+
+def import_profile(statement):
+    """(total seconds, {top-level package: self seconds}) for running `statement` in a fresh interpreter."""
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", statement], cwd=ROOT, env=os.environ.copy(),
+                            capture_output=True, text=True, check=True)
+    by_package, total = defaultdict(float), 0.0
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, _, name = line[len("import time:"):].split("|")
+        by_package[name.strip().split(".")[0]] += int(self_us) / 1e6
+        total += int(self_us) / 1e6
+    return total, by_package
+
+def print_profile(label, statement, top):
+    total, by_package = import_profile(statement)
+    print(f"{label}: {1000 * total:7.1f} ms")
+    for name, seconds in sorted(by_package.items(), key=lambda item: -item[1])[:top]:
+        print(f"    {name:<28} {1000 * seconds:7.1f} ms")
+    return total
+
+def median(values):
+    return sorted(values)[len(values) // 2]
+
+def wait_for(url, started, timeout=60, status=200):
+    while time.perf_counter() - started < timeout:
+        try:
+            if requests.get(url, timeout=1).status_code == status:
+                return time.perf_counter() - started
+        except requests.ConnectionError:
+            pass
+        time.sleep(0.005)
+    raise TimeoutError(url)
+
+def cold_start(mode, wait_ready):
+    port = free_port()
+    env = dict(os.environ, STARTUP_WARMUP=mode)
+    started = time.perf_counter()
+    server = subprocess.Popen([sys.executable, "-m", "uvicorn", "backend.main:app", "--host", "127.0.0.1",
+                               "--port", str(port), "--log-level", "warning"], cwd=ROOT, env=env)
+    try:
+        base = f"http://127.0.0.1:{port}"
+        listening = wait_for(f"{base}/healthz", started)
+        if wait_ready:
+            wait_for(f"{base}/readyz", started)
+        sent = time.perf_counter()
+        response = requests.post(f"{base}/chat", json={"message": "Am I free tomorrow at 3pm?"}, timeout=60)
+        response.raise_for_status()
+        answered = time.perf_counter()
+        ready = wait_for(f"{base}/readyz", started)
+        return listening, ready, answered - started, answered - sent
+    finally:
+        server.terminate()
+        server.wait()
+
+def main(runs, top):
+    print_profile("import backend.main", "import backend.main", top)
+    print_profile("with the modules warm-up loads", "import backend.main; import " + ", ".join(WARMED), top)
+    print()
+    with FakeCalendar().running():
+        print(f"median of {runs}; seconds from spawn except the last column")
+        print(f"{'STARTUP_WARMUP':<16}{'/healthz up':>13}{'/readyz 200':>13}{'first chat':>13}{'chat after ready':>18}")
+        for mode in ("off", "background", "blocking"):
+            samples = [cold_start(mode, False) for _ in range(runs)]
+            listening, ready, first_chat, _ = (median(column) for column in zip(*samples))
+            after_ready = median([cold_start(mode, True)[3] for _ in range(runs)])
+            print(f"{mode:<16}{listening:>13.2f}{ready:>13.2f}{first_chat:>13.2f}{after_ready:>18.3f}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--top", type=int, default=12)
+    args = parser.parse_args()
+    main(args.runs, args.top)
@@ -0,0 +1,64 @@
+"""Fast-path parser + memoized dateparser fallback vs calling dateparser directly.
+
+Run from the repository root:
+    python -m benchmarks.bench_dateparse
+"""
+import time
+from datetime import datetime
+
+from benchmarks.fakes import FakeChatModel  # noqa: F401  (sets offline env defaults)
+
+import dateparser
+from backend.utils.datetime_parser import parse_datetime, parser_stats
+from backend.utils.time_utils import get_timezone
+
+TIMEZONE = "Asia/Kolkata"
+CORPUS = [
+    "tomorrow at 3pm ist", "tomorrow 10am", "on july 10th at 15:30", "july 10th 15:30",
+    "next monday 10am", "friday 3pm", "3pm", "today 5:30 pm", "the 12th 8am",
+    "10 july 3pm", "december 24 noon", "2026-11-02 10:00", "wednesday at 11am",
+    "in 2 hours", "end of the month", "tomorrow at 9 a.m.", "thursday 16:00",
+    "next friday at 2pm", "jan 5, 2027 at 9am", "in 30 minutes",
+]
+
+def legacy_parse(phrase, now):
+    return dateparser.parse(phrase, settings={
+        "TIMEZONE": TIMEZONE,
+        "RETURN_AS_TIMEZONE_AWARE": True,
+        "PREFER_DATES_FROM": "future",
+        "RELATIVE_BASE": now,
+    })
+
+def throughput(fn, rounds):
+    now = datetime.now(get_timezone(TIMEZONE))
+    parsed = 0
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for phrase in CORPUS:
+            parsed += fn(phrase, now) is not None
+    elapsed = time.perf_counter() - start
+    return rounds * len(CORPUS) / elapsed, parsed / rounds
+
+def main(rounds=20):
+    first = time.perf_counter()
+    legacy_parse("tomorrow", datetime.now(get_timezone(TIMEZONE)))
+    print(f"dateparser first call (language data load): {(time.perf_counter() - first) * 1000:.0f} ms")
+
+    fast = lambda phrase, now: parse_datetime(phrase, TIMEZONE, now)
+    # One cold round each (dateparser's language detection is slow the first
+    # time it sees a phrase shape), then steady-state throughput.
+    for label, fn in (("dateparser.parse", legacy_parse), ("parse_datetime", fast)):
+        rate, _ = throughput(fn, 1)
+        print(f"{label:<17}: cold round {len(CORPUS) / rate * 1000:8.1f} ms")
+    legacy_rate, legacy_ok = throughput(legacy_parse, rounds)
+    fast_rate, fast_ok = throughput(fast, rounds)
+    print(f"dateparser.parse : {legacy_rate:10.0f} phrases/s, {legacy_ok:.0f}/{len(CORPUS)} parsed")
+    print(f"parse_datetime   : {fast_rate:10.0f} phrases/s, {fast_ok:.0f}/{len(CORPUS)} parsed ({fast_rate / legacy_rate:.0f}x)")
+
+    stats = parser_stats()
+    print(f"fast-path rate {stats['fast_path_rate']:.0%}, fallback calls {stats['fallback']}, "
+          f"fallback cache hit rate {stats['cache_hit_rate']:.0%} "
+          f"({stats['cache']['hits']} hits / {stats['cache']['misses']} misses)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""Streamlit rerun latency with the per-rerun ping vs the cached health probe.
+
+Run from the repository root:
+    python -m benchmarks.bench_frontend_health [--reruns 20] [--backend-latency 0.3]
+
+Serves a stand-in backend whose /chat and /healthz take --backend-latency
+seconds. The old status check sent POST /chat {"message": "ping"} on a new
+connection every rerun; frontend/app.py now reads a status cached by
+frontend/backend_client and refreshed in the background. Reports the old
+check's cost per rerun, the full app.py rerun time (Streamlit's AppTest)
+and how many /healthz requests the reruns caused.
+"""
+import argparse
+import contextlib
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+from benchmarks.harness import free_port
+
+class _Backend(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    latency = 0.0
+    hits = {}
+
+    def log_message(self, format, *args):
+        pass
+
+    def _reply(self, payload):
+        self.rfile.read(int(self.headers.get("Content-Length") or 0))
+        time.sleep(self.latency)
+        self.hits[self.path] = self.hits.get(self.path, 0) + 1
+        body = json.dumps(payload).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        self._reply({"status": "ok"})
+
+    def do_POST(self):
+        self._reply({"response": "pong"})
+
+@contextlib.contextmanager
+def backend(latency):
+    _Backend.latency = latency
+    server = ThreadingHTTPServer(("127.0.0.1", free_port()), _Backend)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        yield f"http://127.0.0.1:{server.server_address[1]}"
+    finally:
+        server.shutdown()
+        server.server_close()
+
+def median(values):
+    return sorted(values)[len(values) // 2]
+
+def main(reruns, backend_latency):
+    logging.getLogger("streamlit").setLevel(logging.ERROR)
+    with backend(backend_latency) as url:
+        samples = []
+        for _ in range(reruns):
+            start = time.perf_counter()
+            requests.post(f"{url}/chat", json={"message": "ping"}, timeout=5)
+            samples.append(time.perf_counter() - start)
+        print(f"old status check (POST /chat ping, new connection): {1000 * median(samples):6.1f} ms added to every rerun")
+
+        os.environ["BACKEND_URL"] = url
+        frontend = os.path.join(os.path.dirname(__file__), "..", "frontend")
+        sys.path.insert(0, frontend)
+        from streamlit.testing.v1 import AppTest
+        app = AppTest.from_file(os.path.join(frontend, "app.py"), default_timeout=60)
+        start = time.perf_counter()
+        app.run()
+        first = time.perf_counter() - start
+        _Backend.hits.clear()
+        samples = []
+        for _ in range(reruns):
+            start = time.perf_counter()
+            app.run()
+            samples.append(time.perf_counter() - start)
+        print(f"app.py first run {1000 * first:6.1f} ms (one blocking /healthz), "
+              f"then median rerun {1000 * median(samples):6.1f} ms; "
+              f"/healthz requests during {reruns} reruns: {_Backend.hits.get('/healthz', 0)}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--reruns", type=int, default=20)
+    parser.add_argument("--backend-latency", type=float, default=0.3)
+    args = parser.parse_args()
+    main(args.reruns, args.backend_latency)
@@ -0,0 +1,98 @@
+"""Chat rendering time per Streamlit rerun against conversation length.
+
+Run from the repository root:
+    python -m benchmarks.bench_frontend_render [--counts 10 100 1000 5000] [--reruns 50]
+
+Compares the previous renderer, which re-formatted every message (regex
+included) on every rerun and sent the whole history, with frontend/chat_render,
+which formats each message once when it is added and sends only the recent
+window. Reports milliseconds and HTML bytes per rerun, then the time of a
+whole rerun of frontend/app.py (Streamlit's AppTest, backend unreachable).
+"""
+import argparse
+import logging
+import os
+import re
+import sys
+import time
+
+from benchmarks.harness import free_port
+from frontend.chat_render import CHAT_WINDOW, add_message, chat_html
+
+REPLIES = [
+    "Booked: Sync with Bob on November 3, 2026 at 02:00 PM (Asia/Kolkata) for 30 minutes.\n"
+    "[View in Google Calendar](https://calendar.google.com/event?eid=abc123)",
+    "Available from Tuesday November 4, 11:00 AM to 11:30 AM (Asia/Kolkata). Want me to book it?",
+    "Busy during Wednesday November 5, 10:00 AM–11:00 AM (Asia/Kolkata). Shall I look for another time?",
+    "I can book meetings, check your availability and find free slots in your calendar.",
+]
+
+def legacy_chat_html(messages):
+    chat_html = ""
+    for msg in messages:
+        if msg["role"] == "user":
+            chat_html += f"<div class='chat-bubble user'><span class='avatar user'>🧑</span><span>{msg['content']}</span></div>"
+        elif "Booked:" in msg["content"]:
+            link_match = re.search(r"\[View in Google Calendar\]\(([^)]+)\)", msg["content"])
+            if link_match:
+                link = link_match.group(1)
+                chat_html += f"<div class='chat-bubble agent success'><span class='avatar agent'>🤖</span><span>{msg['content'].split('[View in Google Calendar')[0]}</span></div>"
+                chat_html += f"<div style='text-align:center; margin: 12px 0;'><a href='{link}' target='_blank' style='display:inline-block; background:linear-gradient(90deg,#39ff14 0%,#00e0ff 100%); color:#18181b; font-weight:bold; border-radius:8px; font-size:1.1rem; padding:14px 32px; text-decoration:none; box-shadow:0 2px 8px 0 #39ff1444;'>Open in Google Calendar</a></div>"
+            else:
+                chat_html += f"<div class='chat-bubble agent success'><span class='avatar agent'>🤖</span><span>{msg['content']}</span></div>"
+        elif "Error" in msg["content"]:
+            chat_html += f"<div class='chat-bubble agent error'><span class='avatar agent'>🤖</span><span>{msg['content']}</span></div>"
+        elif "Available from" in msg["content"] or "Busy during" in msg["content"]:
+            chat_html += f"<div class='chat-bubble agent info'><span class='avatar agent'>🤖</span><span>{msg['content']}</span></div>"
+        else:
+            chat_html += f"<div class='chat-bubble agent'><span class='avatar agent'>🤖</span><span>{msg['content']}</span></div>"
+    return chat_html
+
+def conversation(count):
+    messages = []
+    for i in range(count):
+        if i % 2 == 0:
+            add_message(messages, "user", f"Book a sync with Bob on November {i % 28 + 1} at 2pm")
+        else:
+            add_message(messages, "agent", REPLIES[i // 2 % len(REPLIES)])
+    return messages
+
+def time_reruns(render, reruns):
+    start = time.perf_counter()
+    for _ in range(reruns):
+        html = render()
+    return 1000 * (time.perf_counter() - start) / reruns, len(html.encode())
+
+def app_rerun_ms(messages, reruns):
+    from streamlit.testing.v1 import AppTest
+    app = AppTest.from_file(os.path.join(os.path.dirname(__file__), "..", "frontend", "app.py"), default_timeout=60)
+    app.session_state["messages"] = messages
+    app.run()
+    start = time.perf_counter()
+    for _ in range(reruns):
+        app.run()
+    return 1000 * (time.perf_counter() - start) / reruns
+
+def main(counts, reruns):
+    print(f"{'messages':>8}  {'full history':>24}  {'cached + window of ' + str(CHAT_WINDOW):>24}")
+    for count in counts:
+        messages = conversation(count)
+        # The legacy renderer never saw the cached HTML.
+        plain = [{"role": msg["role"], "content": msg["content"]} for msg in messages]
+        legacy_ms, legacy_bytes = time_reruns(lambda: legacy_chat_html(plain), reruns)
+        ms, size = time_reruns(lambda: chat_html(messages), reruns)
+        print(f"{count:8d}  {legacy_ms:9.3f} ms {legacy_bytes / 1024:8.1f} KB  {ms:9.3f} ms {size / 1024:8.1f} KB")
+
+    # app.py imports chat_render as `streamlit run` does, from its own directory.
+    sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "frontend"))
+    os.environ["BACKEND_URL"] = f"http://127.0.0.1:{free_port()}"
+    logging.getLogger("streamlit").setLevel(logging.ERROR)
+    for count in counts:
+        print(f"{count:8d} messages: full app.py rerun {app_rerun_ms(conversation(count), max(1, reruns // 10)):7.1f} ms")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--counts", type=int, nargs="+", default=[10, 100, 1000, 5000])
+    parser.add_argument("--reruns", type=int, default=50)
+    args = parser.parse_args()
+    main(args.counts, args.reruns)
@@ -0,0 +1,73 @@
+"""Turn latency per intent with and without the deterministic pre-router.
+
+Run from the repository root:
+    python -m benchmarks.bench_intent_router [--turns 60] [--llm-latency 0.4]
+
+Replays a mix of booking, availability, confirmation and small-talk turns
+against a fake LLM (--llm-latency seconds per call) and the local Calendar
+stub. The fake LLM restates the request, so in the baseline, which sends
+every message through the LLM first as before, route_to_tools can still
+pick the tool from its reply.
+"""
+import argparse
+import asyncio
+import random
+import time
+from collections import defaultdict
+
+from benchmarks.fakes import FakeChatModel
+from benchmarks.fake_calendar import FakeCalendar
+
+MESSAGES = [
+    ("book", "Book a meeting with Bob tomorrow at 3pm"),
+    ("book", "Schedule lunch with Ana on friday at 1pm for 60 minutes"),
+    ("check", "Am I free on the 28th at 11am?"),
+    ("check", "Check availability next monday at 10am or tuesday at 4pm"),
+    ("find_slots", "When am I free next week?"),
+    ("chat", "What can you do?"),
+    ("chat", "Can you move my 1:1 to sometime later?"),
+]
+
+def llm_first(text, pending_event=None):
+    from backend.services.intent_router import CHAT
+    return CHAT, None
+
+async def run(turns, llm_latency, router):
+    from backend.services import agent_service, intent_router
+    from backend.services.session_store import SessionStore
+    if not router:
+        agent_service.classify = llm_first
+    else:
+        agent_service.classify = intent_router.classify
+    llm = FakeChatModel(reply="Happy to help with that.", latency=llm_latency)
+    agent = agent_service.create_agent(llm=llm, cache=None, checkpointer=SessionStore(path=None))
+    rng = random.Random(3)
+    latencies = defaultdict(list)
+    for turn in range(turns):
+        label, text = rng.choice(MESSAGES)
+        config = {"configurable": {"thread_id": f"bench-{turn}"}}
+        llm.reply = f"Sure. {text}."
+        t0 = time.perf_counter()
+        await agent.ainvoke({"input": text, "output": "", "tool_name": None, "tool_args": None, "tool_result": None}, config)
+        latencies[label].append(time.perf_counter() - t0)
+    return latencies, llm.calls
+
+def main(turns, llm_latency):
+    calendar = FakeCalendar(latency=0.02)
+    from backend.services import intent_router
+    with calendar.running():
+        for name, router in (("LLM first", False), ("pre-router", True)):
+            intent_router._stats.clear()
+            latencies, calls = asyncio.run(run(turns, llm_latency, router))
+            per_intent = ", ".join(f"{label} {1000 * sum(v) / len(v):.0f} ms" for label, v in sorted(latencies.items()))
+            total = sum(sum(v) for v in latencies.values())
+            print(f"{name:10s}: {calls:3d} LLM calls, {1000 * total / turns:6.1f} ms/turn avg ({per_intent})")
+        stats = intent_router.intent_stats()
+        print(f"pre-router: {stats['skip_rate']:.0%} of turns skipped the first LLM call")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--turns", type=int, default=60)
+    parser.add_argument("--llm-latency", type=float, default=0.4)
+    args = parser.parse_args()
+    main(args.turns, args.llm_latency)
@@ -0,0 +1,55 @@
+"""Turn latency and LLM calls with and without the LLM response cache.
+
+Run from the repository root:
+    python -m benchmarks.bench_llm_cache [--turns 200] [--latency 0.4]
+
+Replays a mix of repeated small-talk questions (cacheable, phrased with
+varying case and punctuation) and time-relative requests (always bypassed)
+against a fake LLM that takes --latency seconds per call.
+"""
+import argparse
+import asyncio
+import random
+import time
+
+from benchmarks.fakes import FakeChatModel
+
+from backend.services.agent_service import create_agent
+from backend.utils.llm_cache import ResponseCache
+
+QUESTIONS = [
+    "What can you do?", "what can you do", "WHAT CAN YOU DO?!", "Hi there", "hi there!", "Thanks",
+    "Who are you?", "How do I book a meeting?", "how do i book a meeting",
+    "Can you help me with my calendar?", "What timezones do you support?",
+]
+TIME_RELATIVE = ["What's on tomorrow?", "Anything free next week?", "Am I busy on friday?"]
+
+def make_turns(count, seed=7):
+    rng = random.Random(seed)
+    return [rng.choice(TIME_RELATIVE) if rng.random() < 0.2 else rng.choice(QUESTIONS) for _ in range(count)]
+
+async def run(turns, latency, cache):
+    llm = FakeChatModel(reply="I can book meetings and check your availability.", latency=latency)
+    agent = create_agent(llm=llm, cache=cache)
+    t0 = time.perf_counter()
+    for text in turns:
+        await agent.ainvoke({"input": text, "output": "", "tool_name": None, "tool_args": None, "tool_result": None})
+    return time.perf_counter() - t0, llm.calls
+
+def main(count, latency):
+    turns = make_turns(count)
+    elapsed, calls = asyncio.run(run(turns, latency, None))
+    print(f"no cache:   {calls:4d} LLM calls, {elapsed:6.2f} s, {1000 * elapsed / count:7.1f} ms/turn")
+    cache = ResponseCache(maxsize=256, ttl=3600, path=None)
+    elapsed, calls = asyncio.run(run(turns, latency, cache))
+    stats = cache.stats()
+    print(f"with cache: {calls:4d} LLM calls, {elapsed:6.2f} s, {1000 * elapsed / count:7.1f} ms/turn "
+          f"(hit rate {stats['hit_rate']:.0%}, {stats['bypassed']} time-relative bypassed, "
+          f"{stats['saved_seconds']:.1f} s of LLM time saved)")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--turns", type=int, default=200)
+    parser.add_argument("--latency", type=float, default=0.4)
+    args = parser.parse_args()
+    main(args.turns, args.latency)
@@ -0,0 +1,109 @@
+"""Outbound scheduler behaviour against scripted 429/5xx responses.
+
+Run from the repository root:
+    python -m benchmarks.bench_outbound [--queries 60] [--rate 20]
+
+Uses the local Calendar stub (with scripted faults) and the fake LLM to
+show: bookings succeeding through 429 + Retry-After and 503s, Calendar's
+403 rateLimitExceeded being retried while other 403s are not, an insert
+whose response was lost not being booked twice, identical in-flight
+freebusy queries sharing one call, the per-calendar token bucket holding a
+burst to --rate requests per second, and an LLM turn riding out rate-limit
+errors.
+"""
+import argparse
+import asyncio
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+from benchmarks.fakes import FakeChatModel
+from benchmarks.fake_calendar import FakeCalendar
+
+class UpstreamError(Exception):
+    """Shaped like the OpenAI client's status errors."""
+
+    def __init__(self, status_code, retry_after=None):
+        super().__init__(f"HTTP {status_code}")
+        self.status_code = status_code
+        self.response = SimpleNamespace(headers={"retry-after": retry_after} if retry_after else {})
+
+def iso(dt):
+    return dt.isoformat()
+
+def main(queries, rate):
+    os.environ["CALENDAR_RATE"] = "0"  # only the per-calendar bucket applies here
+    os.environ["CALENDAR_PER_CALENDAR_RATE"] = str(rate)
+    os.environ["CALENDAR_PER_CALENDAR_BURST"] = "5"
+    calendar = FakeCalendar(latency=0.02)
+    from googleapiclient.errors import HttpError
+    from backend.services import google_calendar_service as gcal
+    from backend.services.agent_service import create_agent, llm_scheduler
+    from backend.services.session_store import SessionStore
+
+    store, calendar_id = calendar.store, calendar.calendar_id
+    start = datetime.now(timezone.utc).replace(minute=0, second=0, microsecond=0) + timedelta(days=2)
+    with calendar.running():
+        calendar.faults = [(429, {"Retry-After": "1"}), (503, {})]
+        t0 = time.perf_counter()
+        event = gcal.create_event(iso(start), iso(start + timedelta(minutes=30)), "Retry check")
+        print(f"booking through 429 (Retry-After: 1) + 503: {event['status']} after {time.perf_counter() - t0:.2f} s, "
+              f"{calendar.requests} HTTP requests")
+
+        slot = start + timedelta(hours=3)
+        calendar.faults = [(503, {}, True)]
+        gcal.create_event(iso(slot), iso(slot + timedelta(minutes=30)), "Lost response")
+        copies = sum(1 for e in store.events[calendar_id].values() if e.get("summary") == "Lost response")
+        print(f"insert applied but answered 503: {copies} event(s) in the calendar, "
+              f"{store.calls['events.get']} events.get to recover it")
+
+        for reason in ("rateLimitExceeded", "userRateLimitExceeded", "forbidden"):
+            calendar.faults = [(403, {}, False, reason)]
+            before = calendar.requests
+            try:
+                gcal.query_freebusy(iso(start), iso(start + timedelta(hours=1)), [calendar_id])
+                outcome = "answered"
+            except HttpError:
+                outcome = "failed"
+            print(f"freebusy through 403 {reason}: {outcome} after {calendar.requests - before} HTTP requests")
+            assert outcome == ("failed" if reason == "forbidden" else "answered")
+
+        calls = store.calls["freebusy.query"]
+        barrier = threading.Barrier(20)
+
+        def same_query(_):
+            barrier.wait()
+            return gcal.query_freebusy(iso(start), iso(start + timedelta(hours=8)), [calendar_id])
+
+        with ThreadPoolExecutor(20) as pool:
+            results = list(pool.map(same_query, range(20)))
+        print(f"20 concurrent identical freebusy queries: {store.calls['freebusy.query'] - calls} upstream call(s), "
+              f"{sum(r == results[0] for r in results)} identical answers")
+
+        calls = store.calls["freebusy.query"]
+        t0 = time.perf_counter()
+        with ThreadPoolExecutor(8) as pool:
+            list(pool.map(lambda i: gcal.query_freebusy(iso(start + timedelta(hours=i)), iso(start + timedelta(hours=i + 1)),
+                                                       [calendar_id]), range(queries)))
+        elapsed = time.perf_counter() - t0
+        print(f"{queries} distinct freebusy queries from 8 threads: {elapsed:.2f} s, "
+              f"{(store.calls['freebusy.query'] - calls) / elapsed:.1f} req/s (limit {rate}/s after a burst of 5)")
+
+        llm = FakeChatModel(reply="Happy to help.", errors=[UpstreamError(429, "0.5"), UpstreamError(502)])
+        agent = create_agent(llm=llm, cache=None, checkpointer=SessionStore(path=None))
+        t0 = time.perf_counter()
+        state = asyncio.run(agent.ainvoke({"input": "What can you do?", "output": "", "tool_name": None, "tool_args": None,
+                                           "tool_result": None}, {"configurable": {"thread_id": "outbound"}}))
+        print(f"LLM turn through 429 (Retry-After: 0.5) + 502: {state['output']!r} after {time.perf_counter() - t0:.2f} s, "
+              f"{llm.calls} LLM calls")
+        print(f"scheduler stats: calendar {gcal.calendar_scheduler.stats()}, openrouter {llm_scheduler.stats()}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--queries", type=int, default=60)
+    parser.add_argument("--rate", type=float, default=20)
+    args = parser.parse_args()
+    main(args.queries, args.rate)
@@ -0,0 +1,129 @@
+"""Parsing throughput: inline vs the thread and process worker pools.
+
+Run from the repository root:
+    python -m benchmarks.bench_parsing [--messages 500] [--workers N]
+
+Classifies a corpus of generated chat messages and routes as many LLM-style
+replies (many need the dateparser fallback, whose cache is turned off here
+so it does not hide the work): first inline on one thread as the agent used
+to, then through backend/services/parsing_service with the batch interface
+and with one call per message. Also reports how long the event loop stalls
+while a burst of messages is parsed inline on it vs on each pool.
+Process-pool throughput scales with the cores available (printed first).
+"""
+import argparse
+import asyncio
+import os
+import random
+import time
+
+os.environ["DATEPARSER_CACHE_SIZE"] = "0"
+
+from benchmarks import fakes  # noqa: F401  (environment defaults)
+from backend.services.intent_router import classify
+from backend.services.parsing_service import ParsingService
+from backend.services.reply_router import route_to_tools
+from backend.utils.datetime_parser import warm_up
+
+NAMES = ["Ana", "Ravi", "Chen", "Maya", "Omar", "Lena", "Tariq", "Sofia"]
+WHEN = ["tomorrow at {h}pm", "next monday at {h}:{m:02d}am", "on July {d} at {h}pm", "in {d} days at {h}:{m:02d}pm",
+        "{d} days from now at {h}pm", "the {d}th of next month at {h}:{m:02d}", "day after tomorrow at {h}pm"]
+ZONES = ["", " IST", " PST", " in London time", " CET"]
+TEMPLATES = [
+    ("Book a sync with {name} {when}{zone}", "Sure, I'll book a meeting with {name} at {when}{zone}."),
+    ("Am I free {when}{zone}?", "Let me check availability for {d} minutes on {when}{zone}."),
+    ("Check if I'm available {when} or {when2}", "I'll check availability on {when} or {when2}."),
+    ("When am I free after {when}?", "Here are your free slots after {when}."),
+    ("Could you move the review with {name} somewhere next week?", "Happy to help find another time with {name}."),
+]
+
+def corpus(n, seed):
+    rng = random.Random(seed)
+    messages, replies = [], []
+    for _ in range(n):
+        values = {"h": rng.randint(1, 11), "m": rng.randrange(0, 60, 5), "d": rng.randint(2, 28)}
+        message, reply = rng.choice(TEMPLATES)
+        fields = {"name": rng.choice(NAMES), "zone": rng.choice(ZONES), "d": values["d"] + 15,
+                  "when": rng.choice(WHEN).format(**values),
+                  "when2": rng.choice(WHEN).format(h=rng.randint(1, 11), m=rng.randrange(0, 60, 5), d=rng.randint(2, 28))}
+        messages.append(message.format(**fields))
+        replies.append(reply.format(**fields).lower())
+    return messages, replies
+
+def inline(messages, replies):
+    for message in messages:
+        classify(message)
+    for reply in replies:
+        route_to_tools({"output": reply})
+
+def batched(service, messages, replies):
+    service.map(classify, [(message,) for message in messages])
+    service.map(route_to_tools, [({"output": reply},) for reply in replies])
+
+async def per_call(service, messages, replies):
+    await asyncio.gather(*(service.run(classify, message) for message in messages),
+                         *(service.run(route_to_tools, {"output": reply}) for reply in replies))
+
+async def loop_stall(parse):
+    """Longest gap between 1 ms heartbeats while `parse()` runs."""
+    gaps, done = [], asyncio.Event()
+
+    async def heartbeat():
+        last = time.perf_counter()
+        while not done.is_set():
+            await asyncio.sleep(0.001)
+            now = time.perf_counter()
+            gaps.append(now - last)
+            last = now
+
+    beat = asyncio.create_task(heartbeat())
+    await asyncio.sleep(0.01)
+    await parse()
+    done.set()
+    await beat
+    return max(gaps)
+
+def main(n, workers):
+    print(f"{os.cpu_count()} CPU(s), {workers} workers, {n} messages + {n} replies per run")
+    warm_up()
+    seed = iter(range(100))
+    # One-time costs (dateparser loads locale data lazily) are paid before timing, in every pool worker too.
+    inline(*corpus(50, next(seed)))
+
+    def report(label, seconds):
+        print(f"{label:<36} {seconds:6.2f} s  {2 * n / seconds:8.0f} parses/s")
+
+    start = time.perf_counter()
+    inline(*corpus(n, next(seed)))
+    report("inline (one thread)", time.perf_counter() - start)
+    for mode in ("thread", "process"):
+        service = ParsingService(mode, workers)
+        service.start()
+        batched(service, *corpus(50 * workers, next(seed)))
+        start = time.perf_counter()
+        batched(service, *corpus(n, next(seed)))
+        report(f"{mode} pool, batch", time.perf_counter() - start)
+        start = time.perf_counter()
+        asyncio.run(per_call(service, *corpus(n, next(seed))))
+        report(f"{mode} pool, one call per parse", time.perf_counter() - start)
+        service.shutdown()
+
+    messages, replies = corpus(200, next(seed))
+
+    async def on_loop():
+        inline(messages, replies)
+
+    stalls = [f"inline {1000 * asyncio.run(loop_stall(on_loop)):.1f} ms"]
+    for mode in ("thread", "process"):
+        service = ParsingService(mode, workers)
+        service.start()
+        stalls.append(f"{mode} pool {1000 * asyncio.run(loop_stall(lambda: per_call(service, messages, replies))):.1f} ms")
+        service.shutdown()
+    print("longest event loop stall while 200 messages + 200 replies are parsed: " + ", ".join(stalls))
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--messages", type=int, default=500)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+    main(args.messages, args.workers)
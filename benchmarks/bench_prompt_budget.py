@@ -0,0 +1,57 @@
+"""Prompt tokens and turn latency against conversation length.
+
+Run from the repository root:
+    python -m benchmarks.bench_prompt_budget [--budget 1500] [--prompt-token-latency 0.0002]
+
+The fake LLM charges --prompt-token-latency seconds per prompt token (prefill)
+on top of a fixed latency, so latency follows prompt size. "unbounded"
+sends the whole history every turn, as llm_node used to; "budgeted" uses
+the token-budgeted prompt assembly.
+"""
+import argparse
+import asyncio
+import time
+
+from benchmarks.fakes import FakeChatModel
+
+from backend.services.agent_service import create_agent
+
+# An open question: requests the pre-router can act on never reach the LLM.
+USER = "What should I prepare before the quarterly planning review with the design team, and who should present?"
+AGENT = ("Sure! I checked your calendar and you're free at that time. Would you like me to book the planning "
+         "review for 30 minutes and send invites to the design team as well?")
+
+def conversation(turns):
+    history = []
+    for _ in range(turns):
+        history += [{"role": "user", "content": USER}, {"role": "agent", "content": AGENT}]
+    return history
+
+async def turn_latency(agent, history, repeats=3):
+    state = {"input": USER, "output": "", "tool_name": None, "tool_args": None, "tool_result": None, "history": history}
+    t0 = time.perf_counter()
+    for _ in range(repeats):
+        await agent.ainvoke(state)
+    return (time.perf_counter() - t0) / repeats
+
+def main(budget, prompt_token_latency):
+    llm = FakeChatModel(reply="Happy to help.", latency=0.05, prompt_token_latency=prompt_token_latency)
+    agents = [create_agent(llm=llm, cache=None, prompt_budget=10 ** 9), create_agent(llm=llm, cache=None, prompt_budget=budget)]
+    print(f"{'turns':>5} | {'unbounded tokens':>16} {'ms':>7} | {'budgeted tokens':>15} {'ms':>7}")
+    for turns in (0, 5, 10, 25, 50, 100, 200):
+        history = conversation(turns)
+        rows = []
+        for agent in agents:
+            llm.prompt_tokens.clear()
+            latency = asyncio.run(turn_latency(agent, history))
+            if not llm.prompt_tokens:
+                raise SystemExit("the benchmark turn never reached the LLM; pick a message the pre-router leaves to it")
+            rows.append((llm.prompt_tokens[-1], latency))
+        print(f"{turns:5d} | {rows[0][0]:16d} {1000 * rows[0][1]:7.1f} | {rows[1][0]:15d} {1000 * rows[1][1]:7.1f}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--budget", type=int, default=1500)
+    parser.add_argument("--prompt-token-latency", type=float, default=0.0002)
+    args = parser.parse_args()
+    main(args.budget, args.prompt_token_latency)
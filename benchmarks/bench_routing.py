@@ -0,0 +1,83 @@
+"""Routing work per turn: single-pass route node vs the old double evaluation.
+
+Run from the repository root:
+    python -m benchmarks.bench_routing
+
+Counts parse_datetime / extract_timezone calls for an availability turn,
+then times the turn against a graph with the same nodes wired the old way:
+a conditional edge after the LLM evaluates route_to_tools and the route node
+evaluates it again. tests/test_routing.py checks the call counts.
+"""
+import asyncio
+import time
+
+from benchmarks.fakes import FakeChatModel
+
+from langgraph.graph import StateGraph, END
+from backend.services import agent_service, reply_router
+from backend.services.agent_service import AgentState, create_agent, has_tool_call, route_to_tools
+
+REPLY = "Let me check availability for 45 minutes on friday, at 3pm IST."
+# Phrased so the intent pre-router leaves it to the LLM, whose reply is then routed.
+STATE = {"input": "Could you see if Friday afternoon works for me?", "output": "", "tool_name": None, "tool_args": None, "tool_result": None}
+
+class CallCounter:
+    def __init__(self, module, name):
+        self.module, self.name = module, name
+        self.original = getattr(module, name)
+        self.calls = 0
+
+    def __enter__(self):
+        def counted(*args, **kwargs):
+            self.calls += 1
+            return self.original(*args, **kwargs)
+        setattr(self.module, self.name, counted)
+        return self
+
+    def __exit__(self, *exc):
+        setattr(self.module, self.name, self.original)
+
+def create_legacy_agent(llm):
+    # The same nodes as create_agent(); only the routing differs: the edge out
+    # of the LLM evaluates route_to_tools, then the route node evaluates it again.
+    nodes = create_agent(llm, cache=None).builder.nodes
+    workflow = StateGraph(AgentState)
+    for name in ("intent", "llm", "route", "tools", "respond"):
+        workflow.add_node(name, nodes[name].runnable)
+    workflow.set_entry_point("intent")
+    workflow.add_conditional_edges("intent", has_tool_call, {True: "tools", False: "llm"})
+    workflow.add_conditional_edges(
+        "llm",
+        lambda state: state.get("tool_result") is None and bool(route_to_tools(state).get("tool_name")),
+        {True: "route", False: "route"}
+    )
+    workflow.add_conditional_edges("route", has_tool_call, {True: "tools", False: END})
+    workflow.add_edge("tools", "respond")
+    workflow.add_edge("respond", "route")
+    return workflow.compile()
+
+def fake_freebusy(start_time, end_time):
+    return []
+
+def time_turns(agent, turns):
+    start = time.perf_counter()
+    for _ in range(turns):
+        asyncio.run(agent.ainvoke(dict(STATE)))
+    return (time.perf_counter() - start) / turns * 1000
+
+def main(turns=30):
+    agent_service.gcal_check_availability = fake_freebusy
+    llm = FakeChatModel(reply=REPLY)
+    agent, legacy = create_agent(llm, cache=None), create_legacy_agent(llm)
+
+    for label, graph in (("single-pass", agent), ("legacy", legacy)):
+        llm.calls = 0
+        with CallCounter(reply_router, "parse_datetime") as parse, CallCounter(reply_router, "extract_timezone") as tz:
+            result = asyncio.run(graph.ainvoke(dict(STATE)))
+        print(f"{label:<12} llm passes={llm.calls} parse_datetime={parse.calls} "
+              f"extract_timezone={tz.calls} tool_result={result['tool_result']!r}")
+
+    print(f"\nper turn: single-pass {time_turns(agent, turns):.2f} ms, legacy {time_turns(legacy, turns):.2f} ms")
+
+if __name__ == "__main__":
+    main()
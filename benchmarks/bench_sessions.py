@@ -0,0 +1,51 @@
+"""Request size and turn latency over a long conversation with server-side sessions.
+
+Run from the repository root:
+    python -m benchmarks.bench_sessions [--turns 50] [--sqlite /tmp/sessions.db]
+
+Compares the bytes the frontend used to upload (the whole history every
+turn) with what it sends now (the new message and a session ID), and
+reports per-turn latency with the session checkpointed in memory or SQLite.
+"""
+import argparse
+import asyncio
+import json
+import os
+import tempfile
+import time
+
+from benchmarks.fakes import FakeChatModel
+
+from backend.services.agent_service import create_agent
+from backend.services.session_store import SessionStore
+
+MESSAGE = "Can you check whether I am free on the 12th at 3pm for a quick sync about the launch?"
+
+async def run(turns, store):
+    agent = create_agent(llm=FakeChatModel(reply="Sure, let me look into that for you."), cache=None, checkpointer=store)
+    config = {"configurable": {"thread_id": "bench-session"}}
+    history, full_bytes, delta_bytes, latencies = [], 0, 0, []
+    for _ in range(turns):
+        history.append({"role": "user", "content": MESSAGE})
+        full_bytes += len(json.dumps({"message": MESSAGE, "history": history}))
+        delta_bytes += len(json.dumps({"message": MESSAGE, "session_id": "bench-session"}))
+        t0 = time.perf_counter()
+        state = await agent.ainvoke({"input": MESSAGE, "output": "", "tool_name": None, "tool_args": None, "tool_result": None}, config)
+        latencies.append(time.perf_counter() - t0)
+        history.append({"role": "agent", "content": state["output"]})
+    return full_bytes, delta_bytes, latencies
+
+def main(turns, sqlite_path):
+    for label, store in (("memory", SessionStore(path=None)), ("sqlite", SessionStore(path=sqlite_path))):
+        full_bytes, delta_bytes, latencies = asyncio.run(run(turns, store))
+        stats = store.stats()
+        print(f"{label:6s}: upload {full_bytes / 1024:7.1f} KB full history -> {delta_bytes / 1024:5.1f} KB new messages only; "
+              f"turn {1000 * sum(latencies) / turns:5.1f} ms avg, last {1000 * latencies[-1]:5.1f} ms; "
+              f"session record {stats['bytes']} bytes")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--turns", type=int, default=50)
+    parser.add_argument("--sqlite", default=os.path.join(tempfile.mkdtemp(), "sessions.db"))
+    args = parser.parse_args()
+    main(args.turns, args.sqlite)
@@ -0,0 +1,63 @@
+"""Free-slot search over calendars with thousands of busy blocks.
+
+Run from the repository root:
+    python -m benchmarks.bench_slots
+
+Compares the numpy interval arithmetic in slot_service against a
+straightforward Python loop over the same busy list (and checks they agree).
+"""
+import random
+import time
+from datetime import datetime, timedelta
+
+from benchmarks.fakes import FakeChatModel  # noqa: F401  (sets offline env defaults)
+
+from backend.services.slot_service import find_slots_in_busy
+from backend.utils.time_utils import get_timezone
+
+TIMEZONE = "Asia/Kolkata"
+
+def synthetic_busy(blocks, start, days, seed=7):
+    rng = random.Random(seed)
+    busy = []
+    for _ in range(blocks):
+        begin = start + timedelta(minutes=rng.randrange(0, days * 24 * 60 // 15) * 15)
+        busy.append({"start": begin.isoformat(), "end": (begin + timedelta(minutes=rng.choice([15, 30, 45, 60, 90]))).isoformat()})
+    return busy
+
+def reference_slots(busy, window_start, window_end, duration_minutes, count, buffer_minutes, step_minutes=30):
+    # Minute-by-minute walk over working hours; slow but obviously correct.
+    tz = get_timezone(TIMEZONE)
+    blocks = sorted((datetime.fromisoformat(b["start"]) - timedelta(minutes=buffer_minutes),
+                     datetime.fromisoformat(b["end"]) + timedelta(minutes=buffer_minutes)) for b in busy)
+    step, duration = timedelta(minutes=step_minutes), timedelta(minutes=duration_minutes)
+    candidate = window_start
+    slots = []
+    while candidate + duration <= window_end and len(slots) < count:
+        local = candidate.astimezone(tz)
+        day_open = tz.localize(datetime(local.year, local.month, local.day, 9))
+        day_close = tz.localize(datetime(local.year, local.month, local.day, 18))
+        if local.weekday() < 5 and day_open <= candidate and candidate + duration <= day_close:
+            if not any(s < candidate + duration and candidate < e for s, e in blocks):
+                slots.append(candidate.astimezone(tz).isoformat())
+        candidate += step
+    return slots
+
+def main():
+    tz = get_timezone(TIMEZONE)
+    start = tz.localize(datetime(2026, 11, 2, 0, 0))
+    for blocks, days in ((1000, 60), (5000, 365), (10000, 730)):
+        busy = synthetic_busy(blocks, start, days)
+        end = start + timedelta(days=days)
+        t0 = time.perf_counter()
+        slots = find_slots_in_busy(busy, start, end, duration_minutes=30, count=10, timezone=TIMEZONE, buffer_minutes=10)
+        vectorized = (time.perf_counter() - t0) * 1000
+        t0 = time.perf_counter()
+        expected = reference_slots(busy, start, end, 30, 10, 10)
+        loop = (time.perf_counter() - t0) * 1000
+        assert [slot["start"] for slot in slots] == expected, (slots, expected)
+        print(f"{blocks:6d} busy blocks / {days:3d} days: numpy {vectorized:8.2f} ms, "
+              f"python loop {loop:9.2f} ms, {len(slots)} slots (first {slots[0]['start'] if slots else '-'})")
+
+if __name__ == "__main__":
+    main()
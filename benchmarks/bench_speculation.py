@@ -0,0 +1,77 @@
+"""Turn latency with and without speculative freebusy prefetch.
+
+Run from the repository root:
+    python -m benchmarks.bench_speculation [--turns 10] [--llm-latency 0.8] [--calendar-latency 0.3]
+
+Messages the pre-router leaves to the LLM but that name a time. The fake LLM
+answers each with an availability check on the same day (single and several
+options), on another day, or with no check at all; Calendar is the local
+stub. With speculation the named days' freebusy is fetched while the LLM
+runs, so checks on those days no longer wait for Calendar after it; replies
+are compared with the non-speculative run, and unused prefetches are counted.
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+from benchmarks.fakes import ScriptedChatModel
+from benchmarks.fake_calendar import DEFAULT_CALENDAR_ID, FakeCalendar
+
+SCENARIOS = [
+    ("same day", "Could friday at 3pm work for a call with Ana?", "Let me check availability on friday at 3pm."),
+    ("options", "Would friday at 3pm or monday at 10am work for a sync?",
+     "I'll check availability on friday at 3pm or monday at 10am."),
+    ("other day", "Could friday at 4pm work for a call with Omar?", "Let me check availability on saturday at 11am."),
+    ("no check", "Can we meet friday at 5pm to talk about the agenda?", "Sure, a short agenda helps: goals, owners, dates."),
+]
+
+async def run(llm, speculate, message, turns):
+    from backend.services.agent_service import create_agent
+    agent = create_agent(llm=llm, cache=None, speculate=speculate)
+    latencies, outputs = [], []
+    for _ in range(turns):
+        started = time.perf_counter()
+        state = await agent.ainvoke({"input": message, "output": "", "tool_name": None, "tool_args": None,
+                                     "tool_result": None})
+        latencies.append(time.perf_counter() - started)
+        outputs.append(state["output"])
+    return latencies, outputs
+
+def main(turns, llm_latency, calendar_latency):
+    calendar = FakeCalendar(latency=calendar_latency)
+    from backend.services.speculation import speculation_stats
+    from backend.utils.datetime_parser import find_datetime
+    from backend.utils.time_utils import DEFAULT_TIMEZONE
+    # A busy hour on friday afternoon, so checks find something.
+    friday = find_datetime("friday at 3pm", DEFAULT_TIMEZONE)
+    calendar.store.add_busy(DEFAULT_CALENDAR_ID, friday.isoformat(), friday.replace(hour=16).isoformat())
+    print(f"LLM {1000 * llm_latency:.0f} ms, Calendar {1000 * calendar_latency:.0f} ms per call, {turns} turns each")
+    with calendar.running():
+        for name, message, reply in SCENARIOS:
+            results = {}
+            for speculate in (False, True):
+                llm = ScriptedChatModel(reply=reply, latency=llm_latency)
+                before = calendar.store.calls["freebusy.query"]
+                stats = speculation_stats()
+                latencies, outputs = asyncio.run(run(llm, speculate, message, turns))
+                after = speculation_stats()
+                results[speculate] = outputs
+                calls = (calendar.store.calls["freebusy.query"] - before) / turns
+                label = "speculative" if speculate else "sequential"
+                extra = ""
+                if speculate:
+                    extra = (f", prefetch used {after['used'] - stats['used']}, "
+                             f"wasted {after['wasted'] - stats['wasted']}")
+                print(f"{name:9s} {label:11s}: median {1000 * statistics.median(latencies):7.1f} ms, "
+                      f"max {1000 * max(latencies):7.1f} ms, {calls:.1f} freebusy calls per turn{extra}")
+            assert results[True] == results[False], (results[True][0], results[False][0])
+    print("replies identical with and without speculation: True")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--turns", type=int, default=10)
+    parser.add_argument("--llm-latency", type=float, default=0.8)
+    parser.add_argument("--calendar-latency", type=float, default=0.3)
+    args = parser.parse_args()
+    main(args.turns, args.llm_latency, args.calendar_latency)
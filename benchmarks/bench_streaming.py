@@ -0,0 +1,59 @@
+"""Time to first token on /chat/stream vs full-completion time on /chat.
+
+Run from the repository root:
+    python -m benchmarks.bench_streaming [--latency 0.6] [--tokens-per-second 40]
+"""
+import argparse
+import asyncio
+import json
+import time
+
+from benchmarks.fakes import FakeChatModel
+from benchmarks.harness import serve
+
+import httpx
+from backend.main import app
+from backend.services.agent_registry import set_agent
+from backend.services.agent_service import create_agent
+
+REPLY = ("Sure! I can help you plan your week. Tell me the day, the time and who the meeting is with, "
+         "and I will look at your calendar and suggest a slot that works for everyone involved.")
+
+async def measure_stream(client):
+    start = time.perf_counter()
+    first_token = None
+    async with client.stream("POST", "/chat/stream", json={"message": "hello"}) as response:
+        event = None
+        async for line in response.aiter_lines():
+            if line.startswith("event: "):
+                event = line[len("event: "):]
+            elif line.startswith("data: ") and event == "token" and first_token is None:
+                first_token = time.perf_counter() - start
+            elif line.startswith("data: ") and event == "done":
+                json.loads(line[len("data: "):])
+    return first_token, time.perf_counter() - start
+
+async def main(latency, tokens_per_second, runs):
+    set_agent(create_agent(llm=FakeChatModel(reply=REPLY, latency=latency, tokens_per_second=tokens_per_second), cache=None))
+    with serve(app) as base_url:
+        async with httpx.AsyncClient(base_url=base_url, timeout=None) as client:
+            blocking, ttft, streamed = [], [], []
+            for _ in range(runs):
+                start = time.perf_counter()
+                (await client.post("/chat", json={"message": "hello"})).raise_for_status()
+                blocking.append(time.perf_counter() - start)
+                first, total = await measure_stream(client)
+                ttft.append(first)
+                streamed.append(total)
+    avg = lambda values: sum(values) / len(values) * 1000
+    print(f"/chat         full completion  {avg(blocking):8.1f} ms")
+    print(f"/chat/stream  first token      {avg(ttft):8.1f} ms")
+    print(f"/chat/stream  full completion  {avg(streamed):8.1f} ms")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--latency", type=float, default=0.6)
+    parser.add_argument("--tokens-per-second", type=float, default=40)
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+    asyncio.run(main(args.latency, args.tokens_per_second, args.runs))
@@ -0,0 +1,168 @@
+"""Many tenants: per-tenant Calendar credentials, cached vs built per request.
+
+Run from the repository root:
+    python -m benchmarks.bench_tenants [--tenants 300] [--requests 1000] [--threads 8]
+
+Every tenant gets its own service-account file (a real RSA key) whose
+token_uri is the local Calendar stub, so loading a key, signing the JWT and
+fetching a token all happen as in production, over HTTP. Requests are
+availability checks spread over the tenants with a few hot ones (Zipf-like).
+
+1. Credentials built for every request vs backend/services/calendar_clients.
+2. The cache bounded below the working set, by entries and by bytes.
+3. Short-lived tokens: how many refreshes land on the request path with
+   refresh-ahead on vs off.
+"""
+import argparse
+import json
+import os
+import random
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from benchmarks.fakes import FakeChatModel  # noqa: F401  (sets offline env defaults)
+from benchmarks.fake_calendar import FakeCalendar
+
+START, END = "2026-11-02T09:00:00+00:00", "2026-11-02T10:00:00+00:00"
+
+def rsa_pem() -> str:
+    from cryptography.hazmat.primitives import serialization
+    from cryptography.hazmat.primitives.asymmetric import rsa
+    key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    return key.private_bytes(serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8,
+                             serialization.NoEncryption()).decode()
+
+def make_tenants(count, directory, token_uri):
+    from backend.services.tenants import Tenant
+    pem = rsa_pem()
+    tenants = {}
+    for i in range(count):
+        path = os.path.join(directory, f"tenant-{i}.json")
+        with open(path, "w") as f:
+            json.dump({"type": "service_account", "project_id": "bench", "private_key_id": f"key-{i}",
+                       "private_key": pem, "client_email": f"tenant-{i}@bench.iam.gserviceaccount.com",
+                       "token_uri": token_uri}, f)
+        tenants[f"t{i}"] = Tenant(f"t{i}", f"tenant-{i}@fake.calendar", path)
+    return tenants
+
+def traffic(tenants, count, seed):
+    # Weight 1/rank: a few busy tenants and a long tail.
+    rng = random.Random(seed)
+    tenants = list(tenants.values())
+    return rng.choices(tenants, weights=[1 / (rank + 1) for rank in range(len(tenants))], k=count)
+
+class PerRequestClients:
+    """Load the key and fetch a token for every request."""
+
+    def get(self, tenant):
+        from google.auth.transport.requests import Request
+        from backend.services.calendar_clients import load_credentials
+        credentials = load_credentials(tenant.credentials_key)
+        credentials.refresh(Request())
+        return credentials
+
+def run(clients, requests, threads):
+    """Send every request through `clients`; returns sorted latencies and the wall time."""
+    from backend.services import google_calendar_service as gcal
+    from backend.services.tenants import reset_tenant, use_tenant
+    gcal.calendar_clients = clients
+
+    def one(tenant):
+        token = use_tenant(tenant)
+        try:
+            started = time.perf_counter()
+            gcal.check_availability(START, END)
+            return time.perf_counter() - started
+        finally:
+            reset_tenant(token)
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(threads) as pool:
+        latencies = sorted(pool.map(one, requests))
+    return latencies, time.perf_counter() - started
+
+def pct(latencies, p):
+    return 1000 * latencies[min(len(latencies) - 1, int(len(latencies) * p))]
+
+def report(label, latencies, seconds):
+    print(f"  {label:<32} {len(latencies) / seconds:7.0f} req/s  p50 {pct(latencies, 0.5):6.1f} ms  "
+          f"p99 {pct(latencies, 0.99):7.1f} ms")
+
+def rss() -> int:
+    with open("/proc/self/statm") as f:
+        return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+
+def main(tenant_count, request_count, threads, token_latency):
+    calendar = FakeCalendar(token_latency=token_latency)
+    from backend.services.calendar_clients import TOKEN_REFRESH_MARGIN, CalendarClientCache, load_credentials
+    from backend.services.tenants import set_tenants
+
+    with calendar.running(), tempfile.TemporaryDirectory() as directory:
+        tenants = make_tenants(tenant_count, directory, calendar.base_url + "token")
+        set_tenants(tenants)
+        print(f"{tenant_count} tenants, {request_count} requests on {threads} threads, "
+              f"token endpoint {1000 * token_latency:.0f} ms")
+
+        print("1. credentials per request vs cached")
+        before = calendar.token_requests
+        latencies, seconds = run(PerRequestClients(), traffic(tenants, request_count, 1), threads)
+        report("built per request", latencies, seconds)
+        print(f"  {'':<32} {calendar.token_requests - before} token fetches")
+        cache = CalendarClientCache(max_entries=tenant_count)
+        before = calendar.token_requests
+        latencies, seconds = run(cache, traffic(tenants, request_count, 1), threads)
+        report("cached (cold)", latencies, seconds)
+        latencies, seconds = run(cache, traffic(tenants, request_count, 2), threads)
+        report("cached (warm)", latencies, seconds)
+        stats = cache.stats()
+        print(f"  {'':<32} {calendar.token_requests - before} token fetches, "
+              f"hit rate {stats['hits'] / (stats['hits'] + stats['misses']):.1%}, {stats['entries']} entries, "
+              f"~{stats['bytes'] / 1024:.0f} KiB estimated")
+
+        print("2. bounded below the working set")
+        key = next(iter(tenants.values())).credentials_key
+        sample = [load_credentials(key) for _ in range(200)]
+        base = rss()
+        sample += [load_credentials(key) for _ in range(1000)]
+        per_entry = (rss() - base) / 1000
+        del sample
+        entry_size = stats["bytes"] / stats["entries"]
+        print(f"  one loaded credential: ~{per_entry / 1024:.1f} KiB RSS, ~{entry_size / 1024:.1f} KiB estimated")
+        for label, bounded in (("max_entries = tenants / 4", CalendarClientCache(max_entries=tenant_count // 4)),
+                               ("max_bytes = tenants / 4 entries",
+                                CalendarClientCache(max_bytes=int(tenant_count // 4 * entry_size)))):
+            latencies, seconds = run(bounded, traffic(tenants, request_count, 3), threads)
+            report(label, latencies, seconds)
+            stats = bounded.stats()
+            print(f"  {'':<32} {stats['entries']} entries, ~{stats['bytes'] / 1024:.0f} KiB, "
+                  f"{stats['evictions']} evictions, hit rate {stats['hits'] / (stats['hits'] + stats['misses']):.1%}")
+            assert stats["entries"] <= bounded.max_entries and stats["bytes"] <= bounded.max_bytes
+
+        print("3. short-lived tokens (fresh 3 s, then 5 s in the refresh-ahead window)")
+        margin = TOKEN_REFRESH_MARGIN.total_seconds()
+        calendar.token_lifetime = int(margin) + 8
+        hot = dict(list(tenants.items())[:20])
+        for label, ahead in (("refresh-ahead off", margin), ("refresh-ahead on", margin + 5)):
+            clients = CalendarClientCache(refresh_ahead=ahead, refresh_margin=timedelta(seconds=margin))
+            started = time.perf_counter()
+            requests = []
+            while time.perf_counter() < started + 20:
+                latencies, seconds = run(clients, traffic(hot, 200, len(requests)), threads)
+                requests += latencies
+                time.sleep(0.05)
+            stats = clients.stats()
+            print(f"  {label:<32} {len(requests)} requests  p50 {pct(sorted(requests), 0.5):6.1f} ms  "
+                  f"p99 {pct(sorted(requests), 0.99):7.1f} ms  max {1000 * max(requests):7.1f} ms")
+            print(f"  {'':<32} {stats['refreshes'] - stats['misses']} refreshes on the request path after the first token, "
+                  f"{stats['refreshes_ahead']} in the background")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--tenants", type=int, default=300)
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--token-latency", type=float, default=0.1)
+    args = parser.parse_args()
+    main(args.tenants, args.requests, args.threads, args.token_latency)
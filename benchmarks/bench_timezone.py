@@ -0,0 +1,90 @@
+"""Indexed extract_timezone vs the original per-call pytz scan.
+
+Run from the repository root:
+    python -m benchmarks.bench_timezone
+"""
+import re
+import timeit
+
+import pytz
+
+from backend.utils.time_utils import DEFAULT_TIMEZONE, extract_timezone, is_valid_timezone
+
+CORPUS = [
+    "book a meeting tomorrow at 3pm ist",
+    "sure! i'll book a meeting with priya on july 10th at 15:30 for you.",
+    "check availability on friday at 10am pst",
+    "can we meet at 9 am new york time?",
+    "schedule a sync with the london team at 4pm bst",
+    "what does my calendar look like next monday at 11?",
+    "book a call with tokyo at 8am jst on the 12th",
+    "is 2pm in my local time free?",
+    "please check availability on july 14 at 2pm for 45 minutes",
+    "let's do 6pm europe/berlin on thursday",
+    "hello, what can you do?",
+    "i'd like to meet with the sydney office at 9am aedt",
+    "can we meet at 3pm sydney time?",
+    "call the denver office at 10am",
+]
+
+# Names that are also zones but aren't about a timezone here: these must stay
+# on the default zone.
+NOT_ZONES = [
+    "Book a meeting with Sofia tomorrow at 3pm",
+    "Lunch with Victoria on friday",
+    "Sync with Darwin at 10am",
+    "Phoenix project review",
+    "turkey dinner at 6pm",
+    "Coffee with Dawson on monday",
+    "Reunion planning call at 5pm",
+    "walk if it isn't wet at 4pm",
+    "zulu team standup at 9am",
+]
+
+def legacy_extract_timezone(text: str):
+    # Verbatim copy of the pre-index implementation in agent_service.
+    ignore_words = set([
+        "the", "my", "your", "another", "local", "what", "which", "a", "an", "at", "in", "on", "for", "to", "by"
+    ])
+    if re.search(r'\b(local|my) time\b', text, re.IGNORECASE):
+        return "Asia/Kolkata"
+    tz_abbrs = set(['IST', 'UTC', 'PST', 'EST', 'CST', 'MST', 'EDT', 'PDT', 'BST', 'CET', 'EET', 'JST', 'AEST', 'AEDT', 'GMT'])
+    abbr_map = {
+        'IST': 'Asia/Kolkata', 'PST': 'US/Pacific', 'EST': 'US/Eastern', 'CST': 'US/Central',
+        'MST': 'US/Mountain', 'EDT': 'US/Eastern', 'PDT': 'US/Pacific', 'BST': 'Europe/London',
+        'CET': 'Europe/Paris', 'EET': 'Europe/Athens', 'JST': 'Asia/Tokyo', 'AEST': 'Australia/Sydney',
+        'AEDT': 'Australia/Sydney', 'GMT': 'Etc/GMT', 'UTC': 'UTC'
+    }
+    for abbr in tz_abbrs:
+        if re.search(rf'\\b{abbr}\\b', text, re.IGNORECASE):
+            return abbr_map.get(abbr.upper(), abbr.upper())
+    for zone in pytz.all_timezones:
+        if zone.replace('_', ' ').lower() in text.lower():
+            return zone
+    match = re.search(r"(\b\w+\b) (?:time|timezone)", text.lower())
+    if match:
+        candidate = match.group(1).strip()
+        if candidate not in ignore_words and candidate in pytz.all_timezones:
+            return candidate
+    return "Asia/Kolkata"
+
+def bench(fn, number):
+    total = timeit.timeit(lambda: [fn(text) for text in CORPUS], number=number)
+    return total / (number * len(CORPUS)) * 1e6
+
+def main(number=200):
+    print(f"{'utterance':<70} {'legacy':<20} indexed")
+    for text in CORPUS:
+        print(f"{text[:68]:<70} {legacy_extract_timezone(text):<20} {extract_timezone(text)}")
+    for text in NOT_ZONES:
+        print(f"{text[:68]:<70} {legacy_extract_timezone(text):<20} {extract_timezone(text)}")
+        assert extract_timezone(text) == DEFAULT_TIMEZONE, (text, extract_timezone(text))
+    legacy = bench(legacy_extract_timezone, number)
+    indexed = bench(extract_timezone, number)
+    print(f"\nextract_timezone: legacy {legacy:8.1f} us/call, indexed {indexed:6.1f} us/call ({legacy / indexed:.0f}x)")
+    legacy_valid = timeit.timeit(lambda: "Pacific/Kiritimati" in pytz.all_timezones, number=20000) / 20000 * 1e6
+    indexed_valid = timeit.timeit(lambda: is_valid_timezone("Pacific/Kiritimati"), number=20000) / 20000 * 1e6
+    print(f"validity check:   legacy {legacy_valid:8.2f} us/call, indexed {indexed_valid:6.2f} us/call")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+"""End-to-end latency of booking turns: template replies vs an LLM paraphrase.
+
+Run from the repository root:
+    python -m benchmarks.bench_tool_replies [--turns 20] [--llm-latency 0.4] [--tokens-per-second 40]
+
+Booking requests go through the intent pre-router to the local Calendar
+stub; the fake LLM only runs when tool results are paraphrased.
+"""
+import argparse
+import asyncio
+import statistics
+import time
+from datetime import datetime, timedelta
+
+from benchmarks.fakes import FakeChatModel
+from benchmarks.fake_calendar import FakeCalendar
+
+REPLY = "All set! Your meeting is on the calendar and everyone invited will get a notification shortly."
+
+async def run(turns, llm, paraphrase):
+    from backend.services.agent_service import create_agent
+    agent = create_agent(llm=llm, cache=None, paraphrase_results=paraphrase)
+    day = datetime.now() + timedelta(days=2)
+    latencies = []
+    for turn in range(turns):
+        text = f"Book a meeting with Team{turn} on {day:%B} {day.day} at {9 + turn % 8}:{turn // 8 % 2 * 30:02d}"
+        t0 = time.perf_counter()
+        state = await agent.ainvoke({"input": text, "output": "", "tool_name": None, "tool_args": None, "tool_result": None})
+        latencies.append(time.perf_counter() - t0)
+        assert state["output"].startswith(("Booked:", REPLY[:8])), state["output"]
+    return latencies
+
+def main(turns, llm_latency, tokens_per_second):
+    calendar = FakeCalendar(latency=0.03)
+    with calendar.running():
+        for name, paraphrase in (("LLM paraphrase", True), ("templates", False)):
+            llm = FakeChatModel(reply=REPLY, latency=llm_latency, tokens_per_second=tokens_per_second)
+            latencies = asyncio.run(run(turns, llm, paraphrase))
+            print(f"{name:14s}: {llm.calls:3d} LLM calls, median {1000 * statistics.median(latencies):7.1f} ms, "
+                  f"max {1000 * max(latencies):7.1f} ms per booking turn")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--turns", type=int, default=20)
+    parser.add_argument("--llm-latency", type=float, default=0.4)
+    parser.add_argument("--tokens-per-second", type=float, default=40)
+    args = parser.parse_args()
+    main(args.turns, args.llm_latency, args.tokens_per_second)
@@ -0,0 +1,335 @@
+"""In-memory Google Calendar API stub served over local HTTP.
+
+Implements the surface google_calendar_service uses: events.insert,
+events.list (including incremental syncToken polls), events.delete,
+freebusy.query, calendarList.list, calendars.get and the Calendar batch
+endpoint, plus an OAuth token endpoint at /token for service accounts whose
+token_uri points here. Point the backend at it before importing it:
+
+    calendar = FakeCalendar(latency=0.05)   # exports GOOGLE_API_ROOT_URL
+    from backend.services import google_calendar_service
+    with calendar.running():
+        ...
+"""
+import contextlib
+import email.parser
+import email.policy
+import json
+import os
+import socket
+import threading
+import time
+import urllib.parse
+import uuid
+from collections import defaultdict
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytz
+
+from benchmarks.harness import free_port
+
+DEFAULT_CALENDAR_ID = "primary@fake.calendar"
+
+def _parse_time(value: str) -> datetime:
+    return datetime.fromisoformat(value)
+
+def _event_time(value: dict, time_zone: str) -> datetime:
+    if "dateTime" in value:
+        return _parse_time(value["dateTime"])
+    return pytz.timezone(time_zone).localize(datetime.fromisoformat(value["date"]))
+
+def _declined(event: dict) -> bool:
+    return any(attendee.get("self") and attendee.get("responseStatus") == "declined"
+               for attendee in event.get("attendees", []))
+
+class CalendarStore:
+    """Events per calendar, plus counters of API calls by method.
+
+    Every change bumps `version` and is logged, so a sync token is simply
+    the version it was issued at. All calendars are in `time_zone`, which
+    places all-day events.
+    """
+
+    def __init__(self, time_zone: str = "Asia/Kolkata"):
+        self.time_zone = time_zone
+        self.events = defaultdict(dict)
+        self.deleted = defaultdict(dict)
+        self.calls = defaultdict(int)
+        self.lock = threading.Lock()
+        self.version = 0
+        self.changes = []
+
+    def _changed(self, calendar_id: str, event_id: str):
+        self.version += 1
+        self.changes.append((self.version, calendar_id, event_id))
+
+    def add_busy(self, calendar_id: str, start: str, end: str, summary: str = "Busy", declined: bool = False):
+        """A timed event; `declined` adds the calendar's owner as an attendee who declined it."""
+        return self._add(calendar_id, {"summary": summary, "start": {"dateTime": start}, "end": {"dateTime": end}},
+                         declined)
+
+    def add_all_day(self, calendar_id: str, start_date: str, end_date: str, summary: str = "Out of office",
+                    declined: bool = False):
+        """An all-day event from `start_date` up to the exclusive `end_date` (YYYY-MM-DD)."""
+        return self._add(calendar_id, {"summary": summary, "start": {"date": start_date}, "end": {"date": end_date}},
+                         declined)
+
+    def _add(self, calendar_id: str, event: dict, declined: bool):
+        with self.lock:
+            event_id = uuid.uuid4().hex
+            event = dict(event, id=event_id, status="confirmed")
+            if declined:
+                event["attendees"] = [{"email": calendar_id, "self": True, "responseStatus": "declined"}]
+            self.events[calendar_id][event_id] = event
+            self._changed(calendar_id, event_id)
+            return event_id
+
+    def bounds(self, event: dict):
+        return _event_time(event["start"], self.time_zone), _event_time(event["end"], self.time_zone)
+
+    def get_event(self, calendar_id: str, event_id: str):
+        with self.lock:
+            self.calls["events.get"] += 1
+            event = self.events[calendar_id].get(event_id) or self.deleted[calendar_id].get(event_id)
+            if event is None:
+                return 404, {"error": {"code": 404, "message": "Not Found"}}
+            return 200, event
+
+    def delete(self, calendar_id: str, event_id: str):
+        with self.lock:
+            self.calls["events.delete"] += 1
+            event = self.events[calendar_id].pop(event_id, None)
+            if event is None:
+                return 404, {"error": {"code": 404, "message": "Not Found"}}
+            self.deleted[calendar_id][event_id] = {"id": event_id, "status": "cancelled"}
+            self._changed(calendar_id, event_id)
+            return 204, None
+
+    def list_events(self, calendar_id: str, params: dict):
+        with self.lock:
+            self.calls["events.list"] += 1
+            sync_token = params.get("syncToken")
+            if sync_token:
+                since = int(sync_token) if sync_token.isdigit() else -1
+                if not 0 <= since <= self.version:
+                    return 410, {"error": {"code": 410, "message": "Sync token is no longer valid, a full sync is required."}}
+                changed = dict.fromkeys(event_id for version, calendar, event_id in self.changes
+                                        if version > since and calendar == calendar_id)
+                items = [self.events[calendar_id].get(event_id) or self.deleted[calendar_id][event_id]
+                         for event_id in changed]
+            else:
+                time_min = _parse_time(params["timeMin"]) if params.get("timeMin") else None
+                items = sorted((event for event in self.events[calendar_id].values()
+                                if time_min is None or self.bounds(event)[1] > time_min),
+                               key=lambda event: self.bounds(event)[0])
+            offset, size = int(params.get("pageToken") or 0), int(params.get("maxResults") or 250)
+            body = {"kind": "calendar#events", "timeZone": self.time_zone, "items": items[offset:offset + size]}
+            if offset + size < len(items):
+                body["nextPageToken"] = str(offset + size)
+            else:
+                body["nextSyncToken"] = str(self.version)
+            return 200, body
+
+    def insert(self, calendar_id: str, body: dict):
+        with self.lock:
+            self.calls["events.insert"] += 1
+            event_id = body.get("id") or uuid.uuid4().hex
+            # Deleted events keep their IDs reserved, as in the API.
+            if event_id in self.events[calendar_id] or event_id in self.deleted[calendar_id]:
+                return 409, {"error": {"code": 409, "message": "The requested identifier already exists."}}
+            event = dict(body, id=event_id, status="confirmed",
+                         htmlLink=f"https://calendar.fake/event?eid={event_id}")
+            self.events[calendar_id][event_id] = event
+            self._changed(calendar_id, event_id)
+            return 200, event
+
+    def freebusy(self, body: dict):
+        with self.lock:
+            self.calls["freebusy.query"] += 1
+            time_min, time_max = _parse_time(body["timeMin"]), _parse_time(body["timeMax"])
+            calendars = {}
+            for item in body.get("items", []):
+                busy = []
+                for event in self.events.get(item["id"], {}).values():
+                    if event.get("transparency") == "transparent" or _declined(event):
+                        continue
+                    start, end = self.bounds(event)
+                    if start < time_max and end > time_min:
+                        busy.append({"start": start.astimezone(timezone.utc).isoformat().replace("+00:00", "Z"),
+                                     "end": end.astimezone(timezone.utc).isoformat().replace("+00:00", "Z")})
+                calendars[item["id"]] = {"busy": sorted(busy, key=lambda block: block["start"])}
+            return 200, {"kind": "calendar#freeBusy", "timeMin": body["timeMin"], "timeMax": body["timeMax"], "calendars": calendars}
+
+    def calendar_list(self):
+        with self.lock:
+            self.calls["calendarList.list"] += 1
+            ids = set(self.events) | {DEFAULT_CALENDAR_ID}
+            return 200, {"items": [{"id": calendar_id, "summary": calendar_id} for calendar_id in sorted(ids)]}
+
+    def get_calendar(self, calendar_id: str):
+        with self.lock:
+            self.calls["calendars.get"] += 1
+            return 200, {"id": calendar_id, "summary": calendar_id, "timeZone": self.time_zone}
+
+    def dispatch(self, method: str, target: str, body: bytes):
+        url = urllib.parse.urlparse(target)
+        path = url.path
+        params = {key: values[-1] for key, values in urllib.parse.parse_qs(url.query).items()}
+        parts = [urllib.parse.unquote(part) for part in path.strip("/").split("/")]
+        payload = json.loads(body) if body else {}
+        if parts[:2] != ["calendar", "v3"]:
+            return 404, {"error": {"code": 404, "message": f"unknown path {path}"}}
+        parts = parts[2:]
+        if method == "POST" and parts == ["freeBusy"]:
+            return self.freebusy(payload)
+        if method == "GET" and parts == ["users", "me", "calendarList"]:
+            return self.calendar_list()
+        if len(parts) == 2 and parts[0] == "calendars" and method == "GET":
+            return self.get_calendar(parts[1])
+        if len(parts) == 3 and parts[0] == "calendars" and parts[2] == "events" and method == "POST":
+            return self.insert(parts[1], payload)
+        if len(parts) == 3 and parts[0] == "calendars" and parts[2] == "events" and method == "GET":
+            return self.list_events(parts[1], params)
+        if len(parts) == 4 and parts[0] == "calendars" and parts[2] == "events" and method == "GET":
+            return self.get_event(parts[1], parts[3])
+        if len(parts) == 4 and parts[0] == "calendars" and parts[2] == "events" and method == "DELETE":
+            return self.delete(parts[1], parts[3])
+        return 404, {"error": {"code": 404, "message": f"unknown route {method} {path}"}}
+
+def _http_reason(status: int) -> str:
+    return {200: "OK", 204: "No Content", 403: "Forbidden", 404: "Not Found", 409: "Conflict", 410: "Gone", 429: "Too Many Requests", 500: "Internal Server Error",
+            503: "Service Unavailable"}.get(status, "Error")
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, status: int, content_type: str, payload: bytes, headers=None):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(payload)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def _handle(self, method: str):
+        fake = self.server.fake
+        body = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+        if fake.latency:
+            time.sleep(fake.latency)
+        fake.requests += 1
+        if self.path == "/token":
+            time.sleep(fake.token_latency)
+            fake.token_requests += 1
+            token = {"access_token": uuid.uuid4().hex, "expires_in": fake.token_lifetime, "token_type": "Bearer"}
+            self._send(200, "application/json", json.dumps(token).encode())
+            return
+        fake.tokens[self.headers.get("Authorization")] += 1
+        fault = fake.next_fault()
+        if fault:
+            status, headers, applied, reason = tuple(fault) + (False, None)[len(fault) - 2:]
+            if status == 0:
+                # The connection drops without a response.
+                self.close_connection = True
+                self.connection.shutdown(socket.SHUT_RDWR)
+                return
+            if applied and not self.path.startswith("/batch/"):
+                # The request takes effect but its response is lost.
+                fake.store.dispatch(method, self.path, body)
+            error = {"code": status, "message": _http_reason(status)}
+            if reason:
+                error["errors"] = [{"domain": "usageLimits" if "Limit" in reason else "global", "reason": reason,
+                                    "message": _http_reason(status)}]
+            self._send(status, "application/json", json.dumps({"error": error}).encode(), headers)
+            return
+        if self.path.startswith("/batch/"):
+            self._handle_batch(body)
+            return
+        status, payload = fake.store.dispatch(method, self.path, body)
+        self._send(status, "application/json", json.dumps(payload).encode() if payload is not None else b"")
+
+    def _handle_batch(self, body: bytes):
+        fake = self.server.fake
+        fake.store.calls["batch"] += 1
+        message = email.parser.BytesParser(policy=email.policy.compat32).parsebytes(
+            b"Content-Type: " + self.headers["Content-Type"].encode() + b"\r\n\r\n" + body)
+        boundary = "batch_" + uuid.uuid4().hex
+        chunks = []
+        for part in message.get_payload():
+            inner = part.get_payload()
+            head, _, inner_body = inner.partition("\n\n") if "\r\n\r\n" not in inner else inner.partition("\r\n\r\n")
+            request_line = head.splitlines()[0]
+            method, target, _ = request_line.split(" ", 2)
+            status, payload = fake.store.dispatch(method, target, inner_body.strip().encode())
+            content_id = part["Content-ID"].strip("<>")
+            text = json.dumps(payload) if payload is not None else ""
+            chunks.append(
+                f"--{boundary}\r\nContent-Type: application/http\r\nContent-ID: <response-{content_id}>\r\n\r\n"
+                f"HTTP/1.1 {status} {_http_reason(status)}\r\nContent-Type: application/json\r\n"
+                f"Content-Length: {len(text)}\r\n\r\n{text}\r\n"
+            )
+        chunks.append(f"--{boundary}--\r\n")
+        self._send(200, f"multipart/mixed; boundary={boundary}", "".join(chunks).encode())
+
+    def do_GET(self):
+        self._handle("GET")
+
+    def do_POST(self):
+        self._handle("POST")
+
+    def do_DELETE(self):
+        self._handle("DELETE")
+
+class FakeCalendar:
+    """A CalendarStore behind a ThreadingHTTPServer on a free local port.
+
+    `latency` is added to every HTTP request (a batch counts as one).
+    `faults` is a list of (status, headers) responses returned, in order,
+    before normal service resumes, e.g. [(429, {"Retry-After": "1"}), (503, {})];
+    status 0 drops the connection instead of responding.
+    A third element True applies the request before failing it, like a
+    timeout after the server has acted, and a fourth is the error reason
+    in the body, e.g. (403, {}, False, "rateLimitExceeded").
+    `tokens` counts API requests by Authorization header; /token issues
+    tokens valid for `token_lifetime` seconds after `token_latency` more.
+    """
+
+    def __init__(self, latency: float = 0.0, faults=None, port: int = 0, calendar_id: str = DEFAULT_CALENDAR_ID,
+                 token_lifetime: int = 3600, token_latency: float = 0.0):
+        self.latency = latency
+        self.faults = list(faults or [])
+        self.port = port or free_port()
+        self.store = CalendarStore()
+        self.requests = 0
+        self.token_lifetime = token_lifetime
+        self.token_latency = token_latency
+        self.token_requests = 0
+        self.tokens = defaultdict(int)
+        self.calendar_id = calendar_id
+        self._fault_lock = threading.Lock()
+        self.base_url = f"http://127.0.0.1:{self.port}/"
+        # The backend reads these at import time.
+        os.environ["GOOGLE_API_ROOT_URL"] = self.base_url
+        os.environ["GOOGLE_CALENDAR_ID"] = calendar_id
+        os.environ.pop("GOOGLE_CREDENTIALS_FILE", None)
+
+    def next_fault(self):
+        with self._fault_lock:
+            return self.faults.pop(0) if self.faults else None
+
+    @contextlib.contextmanager
+    def running(self):
+        server = ThreadingHTTPServer(("127.0.0.1", self.port), _Handler)
+        server.daemon_threads = True
+        server.fake = self
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        try:
+            yield self
+        finally:
+            server.shutdown()
+            server.server_close()
@@ -0,0 +1,111 @@
+"""Offline stand-ins for the upstream services used by the benchmarks."""
+import asyncio
+import os
+import time
+from typing import Any, AsyncIterator, List, Optional
+
+os.environ.setdefault("OPENROUTER_API_KEY", "bench-key")
+os.environ.setdefault("LOG_LEVEL", "WARNING")
+# Servers started by the benchmarks finish warming up before they accept
+# requests, so warm-up never overlaps a measurement.
+os.environ.setdefault("STARTUP_WARMUP", "blocking")
+# Upstream rate limits would dominate most measurements; benchmarks of the
+# scheduler set their own.
+os.environ.setdefault("OPENROUTER_RATE", "0")
+os.environ.setdefault("CALENDAR_RATE", "0")
+os.environ.setdefault("CALENDAR_PER_CALENDAR_RATE", "0")
+
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+
+class FakeChatModel(BaseChatModel):
+    """Scripted chat model.
+
+    Waits `latency` seconds plus `prompt_token_latency` per prompt token
+    (time to first token), then produces `reply` one whitespace-separated
+    token at a time at `tokens_per_second` (0 = instant).
+    """
+
+    reply: str = "Happy to help with your calendar."
+    latency: float = 0.0
+    prompt_token_latency: float = 0.0
+    tokens_per_second: float = 0.0
+    calls: int = 0
+    prompt_tokens: List[int] = []
+    errors: List[Any] = []
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake-chat"
+
+    def reply_for(self, messages: List[BaseMessage]) -> str:
+        return self.reply
+
+    def _maybe_fail(self):
+        # Scripted failures (e.g. rate-limit errors) raised, in order, before replies resume.
+        if self.errors:
+            self.calls += 1
+            raise self.errors.pop(0)
+
+    def _result(self, reply: str) -> ChatResult:
+        self.calls += 1
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content=reply))])
+
+    @staticmethod
+    def _tokens(reply: str) -> List[str]:
+        words = reply.split(" ")
+        return [word if i == 0 else " " + word for i, word in enumerate(words)]
+
+    def _prefill_time(self, messages: List[BaseMessage]) -> float:
+        # Imported here: benchmarks set backend env vars after importing this module.
+        from backend.services.prompt_builder import count_tokens
+        tokens = sum(count_tokens(str(message.content)) for message in messages)
+        self.prompt_tokens.append(tokens)
+        return tokens * self.prompt_token_latency
+
+    def _generation_time(self, reply: str) -> float:
+        return len(self._tokens(reply)) / self.tokens_per_second if self.tokens_per_second else 0.0
+
+    def _generate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None, run_manager: Any = None, **kwargs: Any) -> ChatResult:
+        self._maybe_fail()
+        reply = self.reply_for(messages)
+        time.sleep(self.latency + self._prefill_time(messages) + self._generation_time(reply))
+        return self._result(reply)
+
+    async def _agenerate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None, run_manager: Any = None, **kwargs: Any) -> ChatResult:
+        self._maybe_fail()
+        reply = self.reply_for(messages)
+        await asyncio.sleep(self.latency + self._prefill_time(messages) + self._generation_time(reply))
+        return self._result(reply)
+
+    async def _astream(self, messages: List[BaseMessage], stop: Optional[List[str]] = None, run_manager: Any = None, **kwargs: Any) -> AsyncIterator[ChatGenerationChunk]:
+        self._maybe_fail()
+        self.calls += 1
+        reply = self.reply_for(messages)
+        await asyncio.sleep(self.latency + self._prefill_time(messages))
+        for token in self._tokens(reply):
+            if self.tokens_per_second:
+                await asyncio.sleep(1 / self.tokens_per_second)
+            chunk = ChatGenerationChunk(message=AIMessageChunk(content=token))
+            if run_manager:
+                await run_manager.on_llm_new_token(token, chunk=chunk)
+            yield chunk
+
+class ScriptedChatModel(FakeChatModel):
+    """FakeChatModel whose reply depends on the latest user message.
+
+    `script` is a list of (substring, reply) pairs checked in order against
+    the lowercased message; `reply` is the fallback. "{message}" in a reply
+    is replaced by the user's message.
+    """
+
+    script: List[Any] = []
+
+    def reply_for(self, messages: List[BaseMessage]) -> str:
+        text = next((str(m.content) for m in reversed(messages) if m.type == "human"), "")
+        lowered = text.lower()
+        for needle, reply in self.script:
+            if needle in lowered:
+                return reply.replace("{message}", text)
+        return self.reply.replace("{message}", text)
@@ -0,0 +1,31 @@
+"""Helpers for driving the FastAPI app over a real local socket."""
+import contextlib
+import socket
+import threading
+import time
+
+import uvicorn
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+@contextlib.contextmanager
+def serve(app, port: int = 0):
+    """Run `app` with uvicorn in a background thread and yield its base URL.
+
+    httpx.ASGITransport buffers whole responses, so anything that measures
+    streaming or connection behaviour needs a real server.
+    """
+    port = port or free_port()
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning", lifespan="on"))
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    while not server.started:
+        time.sleep(0.01)
+    try:
+        yield f"http://127.0.0.1:{port}"
+    finally:
+        server.should_exit = True
+        thread.join()
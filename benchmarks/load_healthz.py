@@ -0,0 +1,63 @@
+"""/healthz responsiveness while many /chat requests are in flight.
+
+Run from the repository root:
+    python -m benchmarks.load_healthz [--chats 64] [--llm-latency 2.0]
+
+/chat is served by a fake LLM that takes --llm-latency seconds per reply, so
+the run is offline. With a blocking pipeline every /healthz probe would wait
+behind the in-flight LLM calls; with the async pipeline probes stay in the
+low milliseconds while the chats are queued and served.
+"""
+import argparse
+import asyncio
+import time
+
+from benchmarks.fakes import FakeChatModel
+
+import httpx
+from backend.main import app
+from backend.services.agent_registry import set_agent
+from backend.services.agent_service import create_agent
+from backend.utils.concurrency import chat_limiter
+
+async def probe_healthz(client, stop, samples):
+    while not stop.is_set():
+        start = time.perf_counter()
+        response = await client.get("/healthz")
+        response.raise_for_status()
+        samples.append((time.perf_counter() - start) * 1000)
+        await asyncio.sleep(0.02)
+
+async def send_chat(client, results):
+    start = time.perf_counter()
+    response = await client.post("/chat", json={"message": "hello there"})
+    results.append((response.status_code, time.perf_counter() - start))
+
+def percentile(values, pct):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * pct))]
+
+async def main(chats, llm_latency):
+    set_agent(create_agent(llm=FakeChatModel(latency=llm_latency)))
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+        stop = asyncio.Event()
+        samples, results = [], []
+        prober = asyncio.create_task(probe_healthz(client, stop, samples))
+        start = time.perf_counter()
+        await asyncio.gather(*(send_chat(client, results) for _ in range(chats)))
+        elapsed = time.perf_counter() - start
+        stop.set()
+        await prober
+    ok = sum(1 for status, _ in results if status == 200)
+    print(f"/chat: {ok}/{chats} ok in {elapsed:.2f}s "
+          f"(limit={chat_limiter.limit}, llm latency={llm_latency:.2f}s)")
+    print(f"/healthz during load: n={len(samples)} p50={percentile(samples, 0.5):.2f} ms "
+          f"p99={percentile(samples, 0.99):.2f} ms max={max(samples):.2f} ms")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--chats", type=int, default=64)
+    parser.add_argument("--llm-latency", type=float, default=2.0)
+    args = parser.parse_args()
+    asyncio.run(main(args.chats, args.llm_latency))
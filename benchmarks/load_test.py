@@ -0,0 +1,205 @@
+"""Offline end-to-end load test of the backend.
+
+Run from the repository root:
+    python -m benchmarks.load_test [--concurrency 1 8 32] [--requests 200]
+        [--llm-latency 0.5] [--tokens-per-second 40] [--calendar-latency 0.05]
+        [--output load_test.json]
+
+Drives the FastAPI app in-process with a mix of chat, booking, availability
+and free-slot turns (plus the direct /book and /availability endpoints) at
+each concurrency level. The LLM is a scripted fake with the given latency
+and token rate and Google Calendar is the local in-memory stub, so the run
+needs no network or credentials. Reports p50/p95/p99 latency per workload,
+throughput, errors and time spent in each graph node, and writes everything
+as JSON to --output.
+"""
+import argparse
+import asyncio
+import json
+import random
+import threading
+import time
+from collections import defaultdict
+from datetime import date, timedelta
+
+from benchmarks.fakes import ScriptedChatModel
+from benchmarks.fake_calendar import FakeCalendar
+
+from langchain_core.callbacks import BaseCallbackHandler
+
+SCRIPT = [
+    ("what can you do", "I can book meetings, check your availability and find free slots in your calendar."),
+    ("move", "Which meeting would you like to move, and to when?"),
+]
+
+class NodeTimer(BaseCallbackHandler):
+    """Wall time per LangGraph node, from the chain callbacks of each node run."""
+
+    run_inline = True
+
+    def __init__(self):
+        self.seconds = defaultdict(list)
+        self._started = {}
+        self._lock = threading.Lock()
+
+    def on_chain_start(self, serialized, inputs, *, run_id, metadata=None, **kwargs):
+        node = (metadata or {}).get("langgraph_node")
+        if node and kwargs.get("name") == node:
+            with self._lock:
+                self._started[run_id] = (node, time.perf_counter())
+
+    def _finish(self, run_id):
+        with self._lock:
+            started = self._started.pop(run_id, None)
+            if started:
+                self.seconds[started[0]].append(time.perf_counter() - started[1])
+
+    def on_chain_end(self, outputs, *, run_id, **kwargs):
+        self._finish(run_id)
+
+    def on_chain_error(self, error, *, run_id, **kwargs):
+        self._finish(run_id)
+
+def _day(offset: int) -> str:
+    day = date.today() + timedelta(days=offset)
+    return f"{day:%B} {day.day}"
+
+def make_workloads(rng: random.Random):
+    """Weighted request factories; each returns a list of (method, path, kwargs) steps run in one session."""
+    names = ["Bob", "Ana", "Priya", "Chen", "Omar"]
+
+    def chat():
+        return [("POST", "/chat", {"json": {"message": rng.choice(["What can you do?", "Can you move my 1:1?"])}})]
+
+    def book():
+        text = f"Book a sync with {rng.choice(names)} on {_day(rng.randint(2, 60))} at {rng.randint(1, 5)}pm"
+        return [("POST", "/chat", {"json": {"message": text}})]
+
+    def check():
+        if rng.random() < 0.5:
+            text = f"Am I free on {_day(rng.randint(2, 30))} at {rng.randint(9, 11)}am?"
+        else:
+            text = (f"Check availability on {_day(rng.randint(2, 30))} at 10am "
+                    f"or {_day(rng.randint(2, 30))} at 4pm")
+        return [("POST", "/chat", {"json": {"message": text}})]
+
+    def slots():
+        return [("POST", "/chat", {"json": {"message": "When am I free next week?"}})]
+
+    def conversation():
+        return [("POST", "/chat", {"json": {"message": f"Am I free on {_day(rng.randint(2, 30))} at 3pm?"}}),
+                ("POST", "/chat", {"json": {"message": "What can you do?"}})]
+
+    def direct_book():
+        start = date.today() + timedelta(days=rng.randint(61, 365))
+        hour = rng.randint(8, 17)
+        return [("POST", "/book", {"params": {"start_time": f"{start}T{hour:02d}:00:00+00:00",
+                                             "end_time": f"{start}T{hour:02d}:30:00+00:00", "summary": "Load test"}})]
+
+    def direct_availability():
+        start = date.today() + timedelta(days=rng.randint(2, 30))
+        return [("GET", "/availability", {"params": {"start_time": f"{start}T09:00:00+00:00",
+                                                   "end_time": f"{start}T17:00:00+00:00"}})]
+
+    return [(chat, 3), (book, 2), (check, 2), (slots, 1), (conversation, 1), (direct_book, 1), (direct_availability, 1)]
+
+def percentile(values, pct):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * pct))] if values else 0.0
+
+def summarize(values):
+    return {"count": len(values), "mean_ms": 1000 * sum(values) / len(values) if values else 0.0,
+            "p50_ms": 1000 * percentile(values, 0.50), "p95_ms": 1000 * percentile(values, 0.95),
+            "p99_ms": 1000 * percentile(values, 0.99)}
+
+async def run_level(client, concurrency, requests, seed):
+    rng = random.Random(seed)
+    factories, weights = zip(*make_workloads(rng))
+    jobs = [rng.choices(factories, weights)[0] for _ in range(requests)]
+    latencies, errors = defaultdict(list), defaultdict(int)
+    queue = asyncio.Queue()
+    for job in jobs:
+        queue.put_nowait(job)
+
+    async def worker():
+        while not queue.empty():
+            job = queue.get_nowait()
+            session_id = None
+            for method, path, kwargs in job():
+                if session_id and "json" in kwargs:
+                    kwargs["json"]["session_id"] = session_id
+                start = time.perf_counter()
+                try:
+                    response = await client.request(method, path, **kwargs)
+                    ok = response.status_code == 200
+                    if ok and path == "/chat":
+                        session_id = response.json()["session_id"]
+                except Exception:
+                    ok = False
+                latencies[job.__name__].append(time.perf_counter() - start)
+                if not ok:
+                    errors[job.__name__] += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    total = [value for values in latencies.values() for value in values]
+    return {"concurrency": concurrency, "requests": len(total), "seconds": elapsed,
+            "throughput_rps": len(total) / elapsed, "errors": sum(errors.values()),
+            "overall": summarize(total),
+            "workloads": {name: dict(summarize(values), errors=errors[name]) for name, values in sorted(latencies.items())}}
+
+def main(concurrency_levels, requests, llm_latency, tokens_per_second, calendar_latency, output):
+    calendar = FakeCalendar(latency=calendar_latency)
+    import httpx
+    from backend.main import app
+    from backend.services.agent_registry import set_agent
+    from backend.services.agent_service import create_agent
+    from backend.services.session_store import SessionStore
+
+    llm = ScriptedChatModel(script=SCRIPT, reply="Happy to help with your calendar.", latency=llm_latency,
+                            tokens_per_second=tokens_per_second)
+    results = {"config": {"requests": requests, "llm_latency": llm_latency, "tokens_per_second": tokens_per_second,
+                          "calendar_latency": calendar_latency}, "levels": []}
+
+    async def run_all():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://load", timeout=None) as client:
+            for concurrency in concurrency_levels:
+                timer = NodeTimer()
+                set_agent(create_agent(llm=llm, cache=None, checkpointer=SessionStore(path=None))
+                          .with_config(callbacks=[timer]))
+                calls_before, calendar_before = llm.calls, calendar.requests
+                level = await run_level(client, concurrency, requests, seed=concurrency)
+                level["llm_calls"] = llm.calls - calls_before
+                level["calendar_requests"] = calendar.requests - calendar_before
+                level["nodes"] = {node: dict(summarize(values), total_s=sum(values))
+                                  for node, values in sorted(timer.seconds.items())}
+                results["levels"].append(level)
+                overall = level["overall"]
+                print(f"concurrency {concurrency:3d}: {level['throughput_rps']:6.1f} req/s, p50 {overall['p50_ms']:6.0f} ms, "
+                      f"p95 {overall['p95_ms']:6.0f} ms, p99 {overall['p99_ms']:6.0f} ms, {level['errors']} errors, "
+                      f"{level['llm_calls']} LLM calls, {level['calendar_requests']} Calendar requests")
+                for name, stats in level["workloads"].items():
+                    print(f"    {name:20s} n={stats['count']:4d}  p50 {stats['p50_ms']:6.0f}  p95 {stats['p95_ms']:6.0f}  "
+                          f"p99 {stats['p99_ms']:6.0f} ms")
+                nodes = ", ".join(f"{node} {stats['total_s']:.1f}s" for node, stats in level["nodes"].items())
+                print(f"    time in nodes: {nodes}")
+
+    with calendar.running():
+        asyncio.run(run_all())
+    if output:
+        with open(output, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"results written to {output}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8, 32])
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--llm-latency", type=float, default=0.5)
+    parser.add_argument("--tokens-per-second", type=float, default=40.0)
+    parser.add_argument("--calendar-latency", type=float, default=0.05)
+    parser.add_argument("--output", default="load_test.json")
+    args = parser.parse_args()
+    main(args.concurrency, args.requests, args.llm_latency, args.tokens_per_second, args.calendar_latency, args.output)
@@ -1,33 +1,15 @@
 import streamlit as st
-import requests
 import dateparser
 from datetime import datetime, timedelta
-import os
+from backend_client import backend_status, iter_sse_events, stream_chat
+from chat_render import CHAT_WINDOW, add_message, chat_html
 
 st.set_page_config(page_title="AI-Agent: Google Calendar Assistant", page_icon="📅")
 st.title("🤖 AI-Agent: Google Calendar Assistant")
 
-# Backend status check
-BACKEND_URL = os.environ.get("BACKEND_URL", "https://backend-s6il.onrender.com")
-backend_status = "Unknown"
-backend_color = "gray"
-try:
-    health_check = requests.post(
-        f"{BACKEND_URL}/chat",
-        json={"message": "ping"},
-        timeout=5
-    )
-    if health_check.status_code == 200:
-        backend_status = "Backend: Connected"
-        backend_color = "green"
-    else:
-        backend_status = f"Backend: Error ({health_check.status_code})"
-        backend_color = "red"
-except Exception:
-    backend_status = "Backend: Unreachable. Please check that the backend server is running and accessible."
-    backend_color = "red"
-
-st.markdown(f'<div style="color:{backend_color};font-weight:bold;">{backend_status}</div>', unsafe_allow_html=True)
+# Backend status check (cached; refreshed in the background)
+status_text, status_color = backend_status()
+st.markdown(f'<div style="color:{status_color};font-weight:bold;">{status_text}</div>', unsafe_allow_html=True)
 
 # Sidebar configuration/settings
 st.sidebar.header("Settings")
@@ -141,32 +123,19 @@ st.markdown('''
 ''', unsafe_allow_html=True)
 
 # --- Chat UI ---
+# Only the most recent messages are sent to the browser; older ones are
+# loaded on demand.
+if "chat_window" not in st.session_state:
+    st.session_state["chat_window"] = CHAT_WINDOW
+messages = st.session_state["messages"]
+hidden = len(messages) - st.session_state["chat_window"]
+if hidden > 0 and st.button(f"Load older messages ({hidden} hidden)"):
+    st.session_state["chat_window"] += CHAT_WINDOW
+    st.rerun()
 st.markdown("<div class='chat-container'>", unsafe_allow_html=True)
 chat_container = st.container()
 with chat_container:
-    chat_html = ""
-    for msg in st.session_state["messages"]:
-        if msg["role"] == "user":
-            chat_html += f"<div class='chat-bubble user'><span class='avatar user'>🧑</span><span>{msg['content']}</span></div>"
-        else:
-            # Neon highlights for Google Calendar responses
-            if "Booked:" in msg["content"]:
-                # Extract Google Calendar link if present
-                import re
-                link_match = re.search(r"\[View in Google Calendar\]\(([^)]+)\)", msg["content"])
-                if link_match:
-                    link = link_match.group(1)
-                    chat_html += f"<div class='chat-bubble agent success'><span class='avatar agent'>🤖</span><span>{msg['content'].split('[View in Google Calendar')[0]}</span></div>"
-                    chat_html += f"<div style='text-align:center; margin: 12px 0;'><a href='{link}' target='_blank' style='display:inline-block; background:linear-gradient(90deg,#39ff14 0%,#00e0ff 100%); color:#18181b; font-weight:bold; border-radius:8px; font-size:1.1rem; padding:14px 32px; text-decoration:none; box-shadow:0 2px 8px 0 #39ff1444;'>Open in Google Calendar</a></div>"
-                else:
-                    chat_html += f"<div class='chat-bubble agent success'><span class='avatar agent'>🤖</span><span>{msg['content']}</span></div>"
-            elif "Error" in msg["content"]:
-                chat_html += f"<div class='chat-bubble agent error'><span class='avatar agent'>🤖</span><span>{msg['content']}</span></div>"
-            elif "Available from" in msg["content"] or "Busy during" in msg["content"]:
-                chat_html += f"<div class='chat-bubble agent info'><span class='avatar agent'>🤖</span><span>{msg['content']}</span></div>"
-            else:
-                chat_html += f"<div class='chat-bubble agent'><span class='avatar agent'>🤖</span><span>{msg['content']}</span></div>"
-    st.markdown(chat_html, unsafe_allow_html=True)
+    st.markdown(chat_html(messages, st.session_state["chat_window"]), unsafe_allow_html=True)
 st.markdown("</div>", unsafe_allow_html=True)
 
 # Input box at the bottom
@@ -174,24 +143,44 @@ with st.form(key="chat_form", clear_on_submit=True):
     user_input = st.text_input("Type your message:", key="user_input", placeholder="Type here and press Enter...")
     submitted = st.form_submit_button("Send")
     if submitted and user_input:
-        st.session_state["messages"].append({"role": "user", "content": user_input})
+        add_message(st.session_state["messages"], "user", user_input)
+        # Render the reply as it streams in; the final "done" event carries
+        # the complete text that is stored in the history.
+        reply_placeholder = st.empty()
+        agent_reply = "(No response)"
         try:
-            # Prepare chat history for context
-            history = [msg for msg in st.session_state["messages"]]
-            response = requests.post(
-                f"{BACKEND_URL}/chat",
-                json={"message": user_input, "history": history},
-                timeout=30
-            )
-            if response.status_code == 401:
-                agent_reply = "Authentication failed. Please check your API key."
-            elif response.status_code != 200:
-                agent_reply = f"Error: Backend returned status code {response.status_code}"
-            else:
-                agent_reply = response.json().get("response", "(No response)")
+            # The backend keeps the conversation; send only the new message.
+            with stream_chat(user_input, st.session_state.get("session_id")) as response:
+                if response.status_code == 401:
+                    agent_reply = "Authentication failed. Please check your API key."
+                elif response.status_code != 200:
+                    agent_reply = f"Error: Backend returned status code {response.status_code}"
+                else:
+                    partial, step, progress = "", None, ""
+                    for event, data in iter_sse_events(response):
+                        if event == "token":
+                            if data.get("step") != step:
+                                partial, step = "", data.get("step")
+                            partial += data.get("text", "")
+                        elif event == "reset":
+                            partial = ""
+                        elif event == "progress":
+                            progress = data.get("message", "")
+                        elif event == "done":
+                            agent_reply = data.get("response") or "(No response)"
+                            st.session_state["session_id"] = data.get("session_id")
+                            break
+                        elif event == "error":
+                            agent_reply = data.get("message", "Error: streaming failed")
+                            break
+                        status_html = f"<div><em>{progress}</em></div>" if progress else ""
+                        reply_placeholder.markdown(
+                            f"<div class='chat-bubble agent'><span class='avatar agent'>🤖</span><span>{partial}▌{status_html}</span></div>",
+                            unsafe_allow_html=True
+                        )
         except Exception as e:
             agent_reply = f"Error: Could not reach backend. {e}"
-        st.session_state["messages"].append({"role": "agent", "content": agent_reply})
+        add_message(st.session_state["messages"], "agent", agent_reply)
         st.rerun()
 
 def route_to_tools(state: dict):
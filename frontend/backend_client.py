@@ -0,0 +1,99 @@
+import json
+import os
+import threading
+import time
+import requests
+import streamlit as st
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# One pooled HTTP session per Streamlit server process, shared by every
+# rerun and browser session, with a single timeout and retry policy.
+
+BACKEND_URL = os.environ.get("BACKEND_URL", "https://backend-s6il.onrender.com")
+HEALTH_TTL = float(os.environ.get("BACKEND_HEALTH_TTL", "30"))
+# Sent as X-Tenant-ID on every request when set (see TENANTS_FILE on the backend).
+BACKEND_TENANT_ID = os.environ.get("BACKEND_TENANT_ID")
+
+# (connect, read) seconds
+TIMEOUT = (3.05, 10)
+STREAM_TIMEOUT = (5, 60)
+HEALTH_TIMEOUT = (2, 2)
+
+# Connection errors are retried for any method (nothing reached the server);
+# status retries only for idempotent requests, so a chat turn is never sent twice.
+RETRY = Retry(total=2, connect=2, read=0, backoff_factor=0.3, status_forcelist=(502, 503, 504),
+              allowed_methods=frozenset({"GET", "HEAD"}), respect_retry_after_header=True, raise_on_status=False)
+
+@st.cache_resource
+def get_session() -> requests.Session:
+    session = requests.Session()
+    if BACKEND_TENANT_ID:
+        session.headers["X-Tenant-ID"] = BACKEND_TENANT_ID
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=16, max_retries=RETRY)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+class HealthProbe:
+    """Backend status from GET /healthz, refreshed in the background once older than `ttl`.
+
+    Only the very first check blocks; after that reruns read the last known
+    status and never wait on the backend.
+    """
+
+    def __init__(self, ttl: float = HEALTH_TTL):
+        self.ttl = ttl
+        self._status = None
+        self._checked = 0.0
+        self._refreshing = False
+        self._lock = threading.Lock()
+
+    def _check(self):
+        try:
+            response = get_session().get(f"{BACKEND_URL}/healthz", timeout=HEALTH_TIMEOUT)
+            if response.status_code == 200:
+                status = ("Backend: Connected", "green")
+            else:
+                status = (f"Backend: Error ({response.status_code})", "red")
+        except requests.RequestException:
+            status = ("Backend: Unreachable. Please check that the backend server is running and accessible.", "red")
+        with self._lock:
+            self._status, self._checked, self._refreshing = status, time.monotonic(), False
+        return status
+
+    def status(self):
+        with self._lock:
+            status, age = self._status, time.monotonic() - self._checked
+            refresh = status is not None and age > self.ttl and not self._refreshing
+            if refresh:
+                self._refreshing = True
+        if status is None:
+            return self._check()
+        if refresh:
+            threading.Thread(target=self._check, daemon=True).start()
+        return status
+
+@st.cache_resource
+def get_health_probe() -> HealthProbe:
+    return HealthProbe()
+
+def backend_status():
+    """(text, color) for the status line."""
+    return get_health_probe().status()
+
+def stream_chat(message: str, session_id=None):
+    """POST /chat/stream; use as a context manager and read it with iter_sse_events()."""
+    return get_session().post(f"{BACKEND_URL}/chat/stream", json={"message": message, "session_id": session_id},
+                              stream=True, timeout=STREAM_TIMEOUT)
+
+def iter_sse_events(response):
+    """Yield (event, data) pairs from a text/event-stream response."""
+    event = "message"
+    for line in response.iter_lines(decode_unicode=True):
+        if not line:
+            event = "message"
+        elif line.startswith("event:"):
+            event = line[len("event:"):].strip()
+        elif line.startswith("data:"):
+            yield event, json.loads(line[len("data:"):].strip())
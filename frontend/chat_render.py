@@ -0,0 +1,53 @@
+import re
+
+# Chat bubbles are formatted once, when a message is added, and the HTML is
+# kept on the message; reruns only join the bubbles of the visible window.
+
+CHAT_WINDOW = 30
+
+_CALENDAR_LINK = re.compile(r"\[View in Google Calendar\]\(([^)]+)\)")
+
+_LINK_BUTTON = (
+    "<div style='text-align:center; margin: 12px 0;'><a href='{link}' target='_blank' style='display:inline-block; "
+    "background:linear-gradient(90deg,#39ff14 0%,#00e0ff 100%); color:#18181b; font-weight:bold; border-radius:8px; "
+    "font-size:1.1rem; padding:14px 32px; text-decoration:none; box-shadow:0 2px 8px 0 #39ff1444;'>"
+    "Open in Google Calendar</a></div>"
+)
+
+def _bubble(kind: str, avatar: str, content: str) -> str:
+    return f"<div class='chat-bubble {kind}'><span class='avatar {kind.split()[0]}'>{avatar}</span><span>{content}</span></div>"
+
+def format_message(msg: dict) -> str:
+    content = msg["content"]
+    if msg["role"] == "user":
+        return _bubble("user", "🧑", content)
+    # Neon highlights for Google Calendar responses
+    if "Booked:" in content:
+        link_match = _CALENDAR_LINK.search(content)
+        if link_match:
+            return _bubble("agent success", "🤖", content.split("[View in Google Calendar")[0]) + \
+                _LINK_BUTTON.format(link=link_match.group(1))
+        return _bubble("agent success", "🤖", content)
+    if "Error" in content:
+        return _bubble("agent error", "🤖", content)
+    if "Available from" in content or "Busy during" in content:
+        return _bubble("agent info", "🤖", content)
+    return _bubble("agent", "🤖", content)
+
+def add_message(messages: list, role: str, content: str) -> dict:
+    msg = {"role": role, "content": content}
+    msg["html"] = format_message(msg)
+    messages.append(msg)
+    return msg
+
+def message_html(msg: dict) -> str:
+    # Messages stored before bubbles were cached are formatted on first view.
+    if "html" not in msg:
+        msg["html"] = format_message(msg)
+    return msg["html"]
+
+def chat_html(messages: list, window: int = CHAT_WINDOW) -> str:
+    """HTML for the last `window` messages."""
+    if window <= 0:
+        return ""
+    return "".join(message_html(msg) for msg in messages[-window:])
@@ -4,7 +4,9 @@ print("GOOGLE_CALENDAR_ID (env):", os.getenv("GOOGLE_CALENDAR_ID"))
 import backend.config
 print("Loaded config file:", backend.config.GOOGLE_CREDENTIALS_FILE)
 print("Loaded calendar ID:", backend.config.GOOGLE_CALENDAR_ID)
-from backend.services.google_calendar_service import create_event
+from backend.services.google_calendar_service import create_event, get_calendar_metadata
+
+print("Calendar:", get_calendar_metadata().get("summary"))
 
 # Example values (adjust as needed)
 start_time = "2025-07-14T11:30:00+05:30"  # ISO 8601 format, with timezone offset
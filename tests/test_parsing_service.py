@@ -0,0 +1,38 @@
+"""Parser counters and span timings recorded in worker processes reach the API process's stats."""
+import asyncio
+
+import pytest
+
+import benchmarks.fakes  # noqa: F401  (sets offline env defaults)
+from backend.services.parsing_service import ParsingService
+from backend.services.reply_router import route_to_tools
+from backend.utils.datetime_parser import parser_stats
+from backend.utils.tracing import SPAN_SECONDS
+
+# Phrases the fast path leaves to the dateparser fallback, repeated so its cache is hit.
+REPLIES = [{"output": "Let me check availability on the day after tomorrow evening at 3pm."},
+           {"output": "Let me check availability on 5 days from now at 10am."}] * 3
+
+def dateparser_spans():
+    return sum(entry[2] for key, entry in SPAN_SECONDS.snapshot().items() if key[0] == "dateparser")
+
+def parse_with(mode):
+    """Counter and dateparser span changes from parsing REPLIES in `mode`."""
+    service = ParsingService(mode=mode, workers=1)
+    try:
+        before, spans = parser_stats(), dateparser_spans()
+        service.map(route_to_tools, [(reply,) for reply in REPLIES])
+        asyncio.run(service.run(route_to_tools, REPLIES[0]))
+        after = parser_stats()
+    finally:
+        service.shutdown()
+    counts = {key: after[key] - before[key] for key in ("fast_path", "fallback", "unparsed")}
+    return counts, after["cache"]["hits"] - before["cache"]["hits"], dateparser_spans() - spans
+
+@pytest.mark.parametrize("mode", ["thread", "process"])
+def test_worker_stats_are_merged(mode):
+    counts, cache_hits, spans = parse_with(mode)
+    assert counts["fallback"] > 0 and cache_hits > 0
+    assert spans == counts["fallback"]
+    # Inline shares the process's cache, now warm, so only the counts compare.
+    assert parse_with("inline")[0] == counts
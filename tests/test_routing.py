@@ -0,0 +1,52 @@
+"""Routing runs once per LLM pass: the route node parses the reply, nothing else does."""
+import asyncio
+
+import pytest
+
+from benchmarks.fakes import FakeChatModel
+from backend.services import agent_service, reply_router
+from backend.services.agent_service import create_agent
+
+# Phrased so the intent pre-router leaves it to the LLM, whose reply is then routed.
+MESSAGE = "Could you see if Friday afternoon works for me?"
+
+class Counter:
+    def __init__(self, fn):
+        self.fn = fn
+        self.calls = 0
+
+    def __call__(self, *args, **kwargs):
+        self.calls += 1
+        return self.fn(*args, **kwargs)
+
+@pytest.fixture
+def counters(monkeypatch):
+    monkeypatch.setattr(agent_service, "gcal_check_availability", lambda start_time, end_time: [])
+    counters = {}
+    for module, name in ((reply_router, "parse_datetime"), (reply_router, "extract_timezone"),
+                         (agent_service, "route_to_tools")):
+        counters[name] = Counter(getattr(module, name))
+        monkeypatch.setattr(module, name, counters[name])
+    return counters
+
+def run_turn(reply):
+    llm = FakeChatModel(reply=reply)
+    agent = create_agent(llm, cache=None)
+    state = asyncio.run(agent.ainvoke({"input": MESSAGE, "output": "", "tool_name": None, "tool_args": None,
+                                       "tool_result": None}))
+    return llm, state
+
+def test_tool_reply_is_parsed_once(counters):
+    llm, state = run_turn("Let me check availability for 45 minutes on friday, at 3pm IST.")
+    assert state["tool_outcome"]["kind"] == "free"
+    assert llm.calls == 1
+    # The pass after the tool ends the turn without routing again.
+    assert counters["route_to_tools"].calls == 1
+    assert counters["parse_datetime"].calls == 1
+    assert counters["extract_timezone"].calls == 1
+
+def test_chat_reply_is_routed_once(counters):
+    llm, state = run_turn("Happy to help. Which day works best for you?")
+    assert state["output"] == "Happy to help. Which day works best for you?"
+    assert counters["route_to_tools"].calls == 1
+    assert counters["parse_datetime"].calls == 0
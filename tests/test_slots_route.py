@@ -0,0 +1,14 @@
+"""Bad /availability/slots parameters are a 400, not a 500 from deep in the slot search."""
+import pytest
+from fastapi.testclient import TestClient
+
+import benchmarks.fakes  # noqa: F401  (sets offline env defaults)
+from backend.main import app
+
+client = TestClient(app)
+
+@pytest.mark.parametrize("query", ["timezone=Nowhere/X", "work_start=9am", "work_end=25:00", "work_start=09:60",
+                                   "start_time=tomorrow", "end_time=2026-13-01"])
+def test_invalid_parameters_are_rejected(query):
+    response = client.get(f"/availability/slots?{query}")
+    assert response.status_code == 400, response.text
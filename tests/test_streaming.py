@@ -0,0 +1,49 @@
+"""A retried LLM call tells /chat/stream clients to drop the text already streamed."""
+import asyncio
+from typing import Any, AsyncIterator, List, Optional
+
+from langchain_core.messages import AIMessageChunk, BaseMessage
+from langchain_core.outputs import ChatGenerationChunk
+
+from benchmarks.fakes import FakeChatModel
+from backend.services.agent_service import create_agent
+
+REPLY = "Happy to help. Which day works best for you?"
+
+class RateLimited(Exception):
+    status_code = 429
+
+class FailsMidStream(FakeChatModel):
+    """Streams the first two tokens of the reply, then fails once with a 429."""
+
+    failed: bool = False
+
+    async def _astream(self, messages: List[BaseMessage], stop: Optional[List[str]] = None, run_manager: Any = None,
+                       **kwargs: Any) -> AsyncIterator[ChatGenerationChunk]:
+        for i, token in enumerate(self._tokens(self.reply_for(messages))):
+            if i == 2 and not self.failed:
+                self.failed = True
+                raise RateLimited()
+            chunk = ChatGenerationChunk(message=AIMessageChunk(content=token))
+            if run_manager:
+                await run_manager.on_llm_new_token(token, chunk=chunk)
+            yield chunk
+
+async def stream_events(agent):
+    events = []
+    async for mode, chunk in agent.astream({"input": "Hi there", "output": "", "tool_name": None, "tool_args": None,
+                                            "tool_result": None}, stream_mode=["messages", "custom"]):
+        if mode == "messages":
+            message, metadata = chunk
+            if metadata.get("langgraph_node") == "llm" and message.content:
+                events.append(("token", message.content))
+        else:
+            events.append((chunk.get("event"), None))
+    return events
+
+def test_retry_after_partial_stream_sends_reset():
+    events = asyncio.run(stream_events(create_agent(FailsMidStream(reply=REPLY), cache=None)))
+    reset = events.index(("reset", None))
+    assert "".join(text for event, text in events[:reset] if event == "token") == "Happy to"
+    # What the frontend shows: the text after the reset, once.
+    assert "".join(text for event, text in events[reset + 1:] if event == "token") == REPLY
@@ -0,0 +1,49 @@
+"""A request can only select calendars its tenant is configured with."""
+import pytest
+
+import benchmarks.fakes  # noqa: F401  (sets offline env defaults)
+from backend.services import availability_service, tenants
+from backend.services.tenants import (DEFAULT_TENANT, Tenant, UnknownCalendar, UnknownTenant, reset_tenant,
+                                      resolve_tenant, use_tenant)
+
+@pytest.fixture(autouse=True)
+def registry(monkeypatch):
+    monkeypatch.setattr(tenants, "_tenants", {"acme": Tenant("acme", "acme@calendar", "acme.json",
+                                                             calendar_ids=("shared@calendar",))})
+
+def test_configured_calendars_resolve():
+    assert resolve_tenant() == DEFAULT_TENANT
+    assert resolve_tenant("acme").calendar_id == "acme@calendar"
+    tenant = resolve_tenant("acme", "shared@calendar")
+    assert (tenant.id, tenant.calendar_id, tenant.credentials_file) == ("acme", "shared@calendar", "acme.json")
+
+@pytest.mark.parametrize("tenant_id, calendar_id", [(None, "someone-else@calendar"), ("acme", "someone-else@calendar"),
+                                                    (None, "acme@calendar")])
+def test_unknown_calendar_is_rejected(tenant_id, calendar_id):
+    with pytest.raises(UnknownCalendar):
+        resolve_tenant(tenant_id, calendar_id)
+
+def test_unknown_tenant_is_rejected():
+    with pytest.raises(UnknownTenant):
+        resolve_tenant("globex", "acme@calendar")
+
+def test_selected_calendar_keeps_the_others():
+    assert resolve_tenant("acme", "shared@calendar").allows("acme@calendar")
+
+@pytest.mark.parametrize("calendar_ids, allowed", [(["acme@calendar", "shared@calendar"], True),
+                                                   (["acme@calendar", "someone-else@calendar"], False)])
+def test_batch_availability_checks_calendars(monkeypatch, calendar_ids, allowed):
+    queried = []
+    monkeypatch.setattr(availability_service, "query_freebusy",
+                        lambda start, end, ids: queried.extend(ids) or {calendar_id: {"busy": []} for calendar_id in ids})
+    windows = [{"start_time": "2026-11-02T09:00:00+00:00", "end_time": "2026-11-02T09:30:00+00:00"}]
+    token = use_tenant(resolve_tenant("acme"))
+    try:
+        if allowed:
+            assert availability_service.check_availability_batch(windows, calendar_ids)["busy"] == [[0, 0]]
+        else:
+            with pytest.raises(UnknownCalendar):
+                availability_service.check_availability_batch(windows, calendar_ids)
+            assert queried == []
+    finally:
+        reset_tenant(token)